@@ -48,18 +48,26 @@ CREATE TABLE IF NOT EXISTS users (
 );
 
 -- Create indexes
-CREATE INDEX IF NOT EXISTS idx_users_username ON users(username);
 CREATE INDEX IF NOT EXISTS idx_users_role_id ON users(role_id);
 
 -- =============================================================================
 -- Jobs Table
 -- =============================================================================
+DO $$ BEGIN
+    CREATE TYPE job_type_enum AS ENUM ('text', 'file');
+EXCEPTION WHEN duplicate_object THEN NULL;
+END $$;
+
+DO $$ BEGIN
+    CREATE TYPE job_status_enum AS ENUM ('pending', 'processing', 'completed', 'failed', 'expired');
+EXCEPTION WHEN duplicate_object THEN NULL;
+END $$;
+
 CREATE TABLE IF NOT EXISTS jobs (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
     user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
-    job_type VARCHAR(20) NOT NULL CHECK (job_type IN ('text', 'file')),
-    status VARCHAR(20) NOT NULL DEFAULT 'pending'
-        CHECK (status IN ('pending', 'processing', 'completed', 'failed', 'expired')),
+    job_type job_type_enum NOT NULL,
+    status job_status_enum NOT NULL DEFAULT 'pending',
     source_language VARCHAR(10) NOT NULL,
     target_language VARCHAR(10) NOT NULL,
     style_preset VARCHAR(50),
@@ -81,9 +89,13 @@ CREATE TABLE IF NOT EXISTS jobs (
 
 -- Create indexes
 CREATE INDEX IF NOT EXISTS idx_jobs_user_id ON jobs(user_id);
-CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status);
-CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON jobs(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs(status, created_at) INCLUDE (user_id, id);
 CREATE INDEX IF NOT EXISTS idx_jobs_expires_at ON jobs(expires_at);
+-- Partial index for the per-user active (processing) job count
+CREATE INDEX IF NOT EXISTS idx_jobs_user_processing ON jobs(user_id) WHERE status = 'processing';
+
+-- Jobs churn through the retention cleanup; vacuum dead tuples sooner
+ALTER TABLE jobs SET (autovacuum_vacuum_scale_factor = 0.02);
 
 -- =============================================================================
 -- Glossaries Table
@@ -120,7 +132,6 @@ CREATE TABLE IF NOT EXISTS glossary_entries (
 
 -- Create indexes
 CREATE INDEX IF NOT EXISTS idx_glossary_entries_glossary_id ON glossary_entries(glossary_id);
-CREATE INDEX IF NOT EXISTS idx_glossary_entries_source_term ON glossary_entries(source_term);
 
 -- =============================================================================
 -- Audit Logs Table
@@ -139,9 +150,8 @@ CREATE TABLE IF NOT EXISTS audit_logs (
 );
 
 -- Create indexes
-CREATE INDEX IF NOT EXISTS idx_audit_logs_user_id ON audit_logs(user_id);
+CREATE INDEX IF NOT EXISTS idx_audit_logs_user_created ON audit_logs(user_id, created_at);
 CREATE INDEX IF NOT EXISTS idx_audit_logs_action ON audit_logs(action);
-CREATE INDEX IF NOT EXISTS idx_audit_logs_created_at ON audit_logs(created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_audit_logs_correlation_id ON audit_logs(correlation_id);
 
 -- =============================================================================
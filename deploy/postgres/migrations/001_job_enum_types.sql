@@ -0,0 +1,35 @@
+-- =============================================================================
+-- TRJM Migration 001 - Native enum types for jobs.job_type / jobs.status
+-- =============================================================================
+-- Converts the VARCHAR + CHECK columns created by earlier versions of
+-- init.sql. Fresh databases already get the enum types from init.sql.
+
+BEGIN;
+
+DO $$ BEGIN
+    CREATE TYPE job_type_enum AS ENUM ('text', 'file');
+EXCEPTION WHEN duplicate_object THEN NULL;
+END $$;
+
+DO $$ BEGIN
+    CREATE TYPE job_status_enum AS ENUM ('pending', 'processing', 'completed', 'failed', 'expired');
+EXCEPTION WHEN duplicate_object THEN NULL;
+END $$;
+
+ALTER TABLE jobs DROP CONSTRAINT IF EXISTS jobs_job_type_check;
+ALTER TABLE jobs DROP CONSTRAINT IF EXISTS jobs_status_check;
+ALTER TABLE jobs DROP CONSTRAINT IF EXISTS ck_job_type;
+ALTER TABLE jobs DROP CONSTRAINT IF EXISTS ck_job_status;
+
+-- The partial index predicate references status; rebuild it after the change
+DROP INDEX IF EXISTS idx_jobs_user_processing;
+
+ALTER TABLE jobs ALTER COLUMN status DROP DEFAULT;
+ALTER TABLE jobs
+    ALTER COLUMN job_type TYPE job_type_enum USING job_type::job_type_enum,
+    ALTER COLUMN status TYPE job_status_enum USING status::job_status_enum;
+ALTER TABLE jobs ALTER COLUMN status SET DEFAULT 'pending';
+
+CREATE INDEX IF NOT EXISTS idx_jobs_user_processing ON jobs(user_id) WHERE status = 'processing';
+
+COMMIT;
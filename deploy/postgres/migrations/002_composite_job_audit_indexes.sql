@@ -0,0 +1,16 @@
+-- =============================================================================
+-- TRJM Migration 002 - Composite indexes for jobs and audit_logs
+-- =============================================================================
+-- Replaces the single-column status/created_at indexes with composites.
+
+BEGIN;
+
+DROP INDEX IF EXISTS idx_jobs_status;
+DROP INDEX IF EXISTS idx_jobs_created_at;
+CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs(status, created_at) INCLUDE (user_id, id);
+
+DROP INDEX IF EXISTS idx_audit_logs_user_id;
+DROP INDEX IF EXISTS idx_audit_logs_created_at;
+CREATE INDEX IF NOT EXISTS idx_audit_logs_user_created ON audit_logs(user_id, created_at);
+
+COMMIT;
@@ -0,0 +1,5 @@
+-- =============================================================================
+-- TRJM Migration 003 - Autovacuum tuning for jobs
+-- =============================================================================
+
+ALTER TABLE jobs SET (autovacuum_vacuum_scale_factor = 0.02);
@@ -0,0 +1,5 @@
+-- =============================================================================
+-- TRJM Migration 004 - Drop index duplicated by users.username UNIQUE
+-- =============================================================================
+
+DROP INDEX IF EXISTS idx_users_username;
@@ -0,0 +1,5 @@
+-- =============================================================================
+-- TRJM Migration 005 - Drop unused glossary_entries.source_term index
+-- =============================================================================
+
+DROP INDEX IF EXISTS idx_glossary_entries_source_term;
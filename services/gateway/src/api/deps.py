@@ -14,7 +14,7 @@ from ..core.logging import logger
 from ..core.security import TokenData, verify_token
 from ..db.models import Feature, User
 from ..db.session import get_db
-from ..services.auth.jwt import TokenService, UserService
+from ..services.auth.jwt import get_cached_user
 
 
 # =============================================================================
@@ -97,8 +97,7 @@ async def get_current_user(
     Raises:
         HTTPException: If user not found or inactive
     """
-    user_service = UserService(db)
-    user = await user_service.get_user_by_id(token_data.sub)
+    user = await get_cached_user(db, token_data.sub)
 
     if not user:
         raise HTTPException(
@@ -129,8 +128,7 @@ async def get_optional_user(
     if not token_data:
         return None
 
-    user_service = UserService(db)
-    user = await user_service.get_user_by_id(token_data.sub)
+    user = await get_cached_user(db, token_data.sub)
 
     if user and user.is_active:
         return user
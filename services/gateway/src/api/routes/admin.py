@@ -5,6 +5,7 @@ Role management and user administration endpoints
 """
 
 from datetime import datetime
+from functools import partial
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
@@ -14,7 +15,13 @@ from sqlalchemy.orm import selectinload
 
 from ...core.logging import logger
 from ...db.models import AuditAction, Feature, Role, RoleFeature, User
-from ...services.auth.jwt import AuditService, UserService
+from ...services.auth.jwt import (
+    AuditService,
+    UserService,
+    invalidate_after_commit,
+    invalidate_role_cache,
+    invalidate_user_cache,
+)
 from ..deps import (
     CurrentUser,
     DBSession,
@@ -203,6 +210,7 @@ async def create_role(
     )
 
     logger.info("Role created", role_id=role.id, name=role.name, by_user=user.username)
+    invalidate_after_commit(db, invalidate_role_cache)
 
     # Reload with relationships
     await db.refresh(role, ["features", "users"])
@@ -339,6 +347,7 @@ async def update_role(
 
     await db.flush()
     await db.refresh(role, ["features", "users"])
+    invalidate_after_commit(db, invalidate_user_cache, invalidate_role_cache)
 
     return RoleResponse(
         id=role.id,
@@ -403,6 +412,7 @@ async def delete_role(
     logger.info("Role deleted", role_id=role.id, name=role.name, by_user=user.username)
 
     await db.delete(role)
+    invalidate_after_commit(db, invalidate_user_cache, invalidate_role_cache)
 
 
 # =============================================================================
@@ -415,9 +425,7 @@ async def list_users(db: DBSession, skip: int = 0, limit: int = 100):
     """
     List all users.
     """
-    result = await db.execute(
-        select(User).options(selectinload(User.role)).offset(skip).limit(limit)
-    )
+    result = await db.execute(select(User).offset(skip).limit(limit))
     users = result.scalars().all()
 
     return [
@@ -468,6 +476,7 @@ async def update_user_role(
 
     old_role_name = target_user.role.name
     target_user.role_id = data.role_id
+    invalidate_after_commit(db, partial(invalidate_user_cache, user_id))
 
     # Audit log
     audit_service = AuditService(db)
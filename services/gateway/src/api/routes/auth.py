@@ -7,12 +7,12 @@ Login, logout, and session management endpoints
 from datetime import datetime, timezone
 from typing import Optional
 
-from fastapi import APIRouter, HTTPException, Request, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from pydantic import BaseModel, Field
 
 from ...core.config import settings
 from ...core.logging import logger
-from ...core.security import generate_csrf_token
+from ...core.security import generate_csrf_token, invalidate_token
 from ...db.models import AuditAction
 from ...services.auth.jwt import AuditService, TokenService, UserService
 from ...services.auth.ldap import get_ldap_service
@@ -21,6 +21,7 @@ from ..deps import (
     DBSession,
     get_client_ip,
     get_correlation_id,
+    get_token_from_request,
     get_user_agent,
 )
 
@@ -131,6 +132,7 @@ async def login(
             ip_address=client_ip,
             user_agent=user_agent,
             correlation_id=correlation_id,
+            synchronous=True,
         )
         await db.commit()
 
@@ -209,6 +211,7 @@ async def logout(
     response: Response,
     db: DBSession,
     user: CurrentUser,
+    token: Optional[str] = Depends(get_token_from_request),
 ):
     """
     Log out current user and invalidate session.
@@ -217,6 +220,10 @@ async def logout(
     user_agent = get_user_agent(request)
     correlation_id = get_correlation_id(request)
 
+    # Drop the cached verification for this token
+    if token:
+        invalidate_token(token)
+
     # Clear the cookie
     response.delete_cookie(
         key="access_token",
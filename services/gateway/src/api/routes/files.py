@@ -18,6 +18,7 @@ from ...core.config import settings
 from ...core.logging import logger
 from ...db.models import Feature, Job, JobStatus, JobType
 from ...services.files.parser import (
+    MAGIC_HEADER_SIZE,
     ParsedDocument,
     ParserRegistry,
     compute_file_hash,
@@ -41,9 +42,6 @@ from ..deps import (
     require_any_feature,
 )
 
-# Import parsers to register them
-from ...services.files import txt, docx, pdf, msg
-
 router = APIRouter(prefix="/files", tags=["File Translation"])
 
 
@@ -101,6 +99,7 @@ async def translate_file(
     and download the translated file.
     """
     correlation_id = get_correlation_id(request)
+    now = datetime.now(timezone.utc)
 
     # Validate file extension
     is_valid, extension = validate_file_extension(file.filename)
@@ -124,23 +123,31 @@ async def translate_file(
             detail=f"Feature {required_feature.value} not available",
         )
 
-    # Read file content
-    content = await file.read()
-
-    # Validate file size
-    if not validate_file_size(content):
+    # Check size and magic bytes against the spooled upload before reading it
+    # into memory, so rejected files cost only a header read
+    if file.size is not None and file.size > settings.max_upload_size_bytes:
         raise HTTPException(
             status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
             detail=f"File too large. Maximum size: {settings.max_upload_size_mb}MB",
         )
 
-    # Validate magic bytes
-    if not validate_magic_bytes(file.filename, content):
+    if not validate_magic_bytes(file.filename, await file.read(MAGIC_HEADER_SIZE)):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="File content does not match expected format",
         )
 
+    # Read file content
+    await file.seek(0)
+    content = await file.read()
+
+    # Validate file size (the upload size may be unknown up front)
+    if not validate_file_size(content):
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File too large. Maximum size: {settings.max_upload_size_mb}MB",
+        )
+
     # Get parser
     parser = ParserRegistry.get_parser(file.filename)
     if not parser:
@@ -159,7 +166,8 @@ async def translate_file(
         style_preset=style_preset,
         file_name=file.filename,
         glossary_id=glossary_id,
-        expires_at=datetime.now(timezone.utc) + timedelta(hours=settings.retention_hours),
+        created_at=now,
+        expires_at=now + timedelta(hours=settings.retention_hours),
     )
     db.add(job)
     await db.flush()
@@ -188,30 +196,34 @@ async def translate_file(
         if not parsed_doc.paragraphs:
             raise ValueError("No text content found in file")
 
-        # Translate each paragraph
+        # Translate paragraphs concurrently (bounded to respect provider rate limits)
         pipeline = get_pipeline()
-        translated_paragraphs = []
-
-        for para in parsed_doc.paragraphs:
-            # Create translation request for this paragraph
-            trans_request = TranslationRequest(
+        target = LanguageCode(target_language)
+        style = StylePreset(style_preset)
+        trans_requests = [
+            TranslationRequest(
                 text=para.text,
                 source_language=LanguageCode.AUTO,
-                target_language=LanguageCode(target_language),
-                style_preset=StylePreset(style_preset),
+                target_language=target,
+                style_preset=style,
             )
+            for para in parsed_doc.paragraphs
+        ]
+        results = await pipeline.translate_batch(
+            trans_requests, concurrency=settings.file_translate_concurrency, same_document=True
+        )
 
-            result = await pipeline.translate(trans_request, [])
+        # Create translated paragraphs
+        from ...services.files.parser import Paragraph
 
-            # Create translated paragraph
-            from ...services.files.parser import Paragraph
-            translated_paragraphs.append(
-                Paragraph(
-                    text=result.translation,
-                    index=para.index,
-                    metadata=para.metadata,
-                )
+        translated_paragraphs = [
+            Paragraph(
+                text=result.translation,
+                index=para.index,
+                metadata=para.metadata,
             )
+            for para, result in zip(parsed_doc.paragraphs, results, strict=True)
+        ]
 
         # Generate output file
         output_content = await parser.generate(parsed_doc, translated_paragraphs)
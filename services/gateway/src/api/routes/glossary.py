@@ -22,6 +22,7 @@ from ...db.models import (
     Glossary,
     GlossaryEntry as GlossaryEntryModel,
 )
+from ...db.session import bulk_insert
 from ...services.auth.jwt import AuditService
 from ..deps import (
     CurrentUser,
@@ -173,15 +174,20 @@ async def create_glossary(
     await db.flush()
 
     # Add entries
-    for entry_data in data.entries:
-        entry = GlossaryEntryModel(
-            glossary_id=glossary.id,
-            source_term=entry_data.source_term,
-            target_term=entry_data.target_term,
-            case_sensitive=entry_data.case_sensitive,
-            context=entry_data.context,
-        )
-        db.add(entry)
+    await bulk_insert(
+        db,
+        GlossaryEntryModel,
+        [
+            {
+                "glossary_id": glossary.id,
+                "source_term": entry_data.source_term,
+                "target_term": entry_data.target_term,
+                "case_sensitive": entry_data.case_sensitive,
+                "context": entry_data.context,
+            }
+            for entry_data in data.entries
+        ],
+    )
 
     # Audit log
     audit_service = AuditService(db)
@@ -518,7 +524,7 @@ async def import_glossary_csv(
         text = content.decode("utf-8-sig")  # Try with BOM
 
     reader = csv.DictReader(io.StringIO(text))
-    imported_count = 0
+    rows = []
 
     for row in reader:
         source = row.get("source", "").strip()
@@ -530,15 +536,17 @@ async def import_glossary_csv(
         case_sensitive = row.get("case_sensitive", "false").lower() == "true"
         context = row.get("context", "").strip() or None
 
-        entry = GlossaryEntryModel(
-            glossary_id=glossary_id,
-            source_term=source,
-            target_term=target,
-            case_sensitive=case_sensitive,
-            context=context,
+        rows.append(
+            {
+                "glossary_id": glossary_id,
+                "source_term": source,
+                "target_term": target,
+                "case_sensitive": case_sensitive,
+                "context": context,
+            }
         )
-        db.add(entry)
-        imported_count += 1
+
+    imported_count = await bulk_insert(db, GlossaryEntryModel, rows)
 
     glossary.version += 1
     await db.flush()
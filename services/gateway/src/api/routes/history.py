@@ -10,7 +10,7 @@ from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel, Field
 from sqlalchemy import select, func, desc
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import raiseload
 
 from ...core.config import settings
 from ...core.logging import logger
@@ -89,8 +89,8 @@ async def list_history(
     user: CurrentUser,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    status_filter: Optional[str] = Query(None, description="Filter by status"),
-    job_type: Optional[str] = Query(None, description="Filter by job type"),
+    status_filter: Optional[JobStatus] = Query(None, description="Filter by status"),
+    job_type: Optional[JobType] = Query(None, description="Filter by job type"),
     search: Optional[str] = Query(None, description="Search in input/output text"),
 ):
     """
@@ -101,10 +101,10 @@ async def list_history(
 
     # Apply filters
     if status_filter:
-        query = query.where(Job.status == status_filter)
+        query = query.where(Job.status == status_filter.value)
 
     if job_type:
-        query = query.where(Job.job_type == job_type)
+        query = query.where(Job.job_type == job_type.value)
 
     if search:
         search_pattern = f"%{search}%"
@@ -123,7 +123,10 @@ async def list_history(
     offset = (page - 1) * page_size
 
     # Get paginated results
-    query = query.order_by(desc(Job.created_at)).offset(offset).limit(page_size)
+    # Jobs are serialized from columns only; fail loudly on any lazy load
+    query = (
+        query.options(raiseload("*")).order_by(desc(Job.created_at)).offset(offset).limit(page_size)
+    )
     result = await db.execute(query)
     jobs = result.scalars().all()
 
@@ -230,7 +233,7 @@ async def get_job_detail(db: DBSession, user: CurrentUser, job_id: str):
     Get detailed information about a specific job.
     """
     result = await db.execute(
-        select(Job).where(Job.id == job_id, Job.user_id == user.id)
+        select(Job).options(raiseload("*")).where(Job.id == job_id, Job.user_id == user.id)
     )
     job = result.scalar_one_or_none()
 
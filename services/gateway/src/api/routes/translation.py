@@ -16,7 +16,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from ...core.config import settings
 from ...core.logging import logger
 from ...db.models import Feature, Glossary, GlossaryEntry as GlossaryEntryModel, Job, JobStatus, JobType
-from ...services.translation.pipeline import TranslationPipeline
+from ...services.translation.batcher import get_batcher
 from ...services.translation.schemas import (
     GlossaryEntry,
     LanguageCode,
@@ -67,18 +67,18 @@ class TranslateTextResponse(BaseModel):
 
 
 # =============================================================================
-# Pipeline Instance (singleton for efficiency)
+# Helpers
 # =============================================================================
 
-_pipeline: Optional[TranslationPipeline] = None
+# Max characters stored per job text field when PII redaction is enabled
+REDACTED_TEXT_LIMIT = 10000
 
 
-def get_pipeline() -> TranslationPipeline:
-    """Get or create the translation pipeline."""
-    global _pipeline
-    if _pipeline is None:
-        _pipeline = TranslationPipeline()
-    return _pipeline
+def _text_for_storage(text: str) -> str:
+    """Return text as stored on the job, truncated only when redaction requires it."""
+    if not settings.enable_pii_redaction or len(text) <= REDACTED_TEXT_LIMIT:
+        return text
+    return text[:REDACTED_TEXT_LIMIT]
 
 
 # =============================================================================
@@ -110,6 +110,7 @@ async def translate_text(
     Returns the translation with a detailed QA report.
     """
     correlation_id = get_correlation_id(request)
+    now = datetime.now(timezone.utc)
     client_ip = get_client_ip(request)
 
     logger.info(
@@ -172,16 +173,17 @@ async def translate_text(
         source_language=data.source_language.value,
         target_language=data.target_language.value,
         style_preset=data.style_preset.value,
-        input_text=data.text[:10000] if settings.enable_pii_redaction else data.text,
+        input_text=_text_for_storage(data.text),
         glossary_id=data.glossary_id,
-        expires_at=datetime.now(timezone.utc) + timedelta(hours=settings.retention_hours),
+        created_at=now,
+        expires_at=now + timedelta(hours=settings.retention_hours),
     )
     db.add(job)
     await db.flush()
 
     try:
-        # Execute translation pipeline
-        pipeline = get_pipeline()
+        # Execute translation pipeline (coalesced with concurrent requests)
+        batcher = get_batcher()
         translation_request = TranslationRequest(
             text=data.text,
             source_language=data.source_language,
@@ -191,42 +193,15 @@ async def translate_text(
             protected_patterns=data.protected_patterns,
         )
 
-        result = await pipeline.translate(translation_request, glossary_entries)
-
-        # Update job with results
-        job.status = JobStatus.COMPLETED.value
-        job.output_text = result.translation[:10000] if settings.enable_pii_redaction else result.translation
-        job.confidence = result.confidence
-        job.qa_report = result.qa_report.model_dump()
-        job.retries = result.retries
-        job.processing_time_ms = result.metadata.processing_time_ms
-        job.completed_at = datetime.now(timezone.utc)
-
-        logger.info(
-            "Translation completed",
-            job_id=job.id,
-            confidence=result.confidence,
-            processing_time_ms=result.metadata.processing_time_ms,
-            correlation_id=correlation_id,
-        )
-
-        return TranslateTextResponse(
-            job_id=job.id,
-            translation=result.translation,
-            source_language=result.source_language,
-            target_language=result.target_language,
-            confidence=result.confidence,
-            qa_report=result.qa_report,
-            processing_time_ms=result.metadata.processing_time_ms,
-            retries=result.retries,
-            dev_mode=settings.dev_mode,
-        )
+        result = await batcher.submit(translation_request, glossary_entries)
 
     except Exception as e:
-        # Update job with error
+        # Update job with error; commit explicitly so the failure status is not
+        # rolled back when the HTTPException propagates through get_db
         job.status = JobStatus.FAILED.value
         job.error_message = str(e)[:500]
         job.completed_at = datetime.now(timezone.utc)
+        await db.commit()
 
         logger.exception(
             "Translation failed",
@@ -240,6 +215,37 @@ async def translate_text(
             detail=f"Translation failed: {str(e)}",
         )
 
+    # Update job with results in a single UPDATE; the session does not expire
+    # attributes on commit, so the job is not reloaded below
+    job.status = JobStatus.COMPLETED.value
+    job.output_text = _text_for_storage(result.translation)
+    job.confidence = result.confidence
+    job.qa_report = result.qa_report.model_dump()
+    job.retries = result.retries
+    job.processing_time_ms = result.metadata.processing_time_ms
+    job.completed_at = datetime.now(timezone.utc)
+    await db.commit()
+
+    logger.info(
+        "Translation completed",
+        job_id=job.id,
+        confidence=result.confidence,
+        processing_time_ms=result.metadata.processing_time_ms,
+        correlation_id=correlation_id,
+    )
+
+    return TranslateTextResponse(
+        job_id=job.id,
+        translation=result.translation,
+        source_language=result.source_language,
+        target_language=result.target_language,
+        confidence=result.confidence,
+        qa_report=result.qa_report,
+        processing_time_ms=result.metadata.processing_time_ms,
+        retries=result.retries,
+        dev_mode=settings.dev_mode,
+    )
+
 
 @router.get("/languages")
 async def get_supported_languages():
@@ -0,0 +1,37 @@
+"""
+TRJM Gateway - Identifier Generation
+=====================================
+Fast, time-ordered identifiers for database rows and token IDs
+"""
+
+import os
+import random
+import time
+
+# Seeded once from os.urandom; re-seeded in forked workers
+_random = random.Random()
+os.register_at_fork(after_in_child=_random.seed)
+
+
+def generate_id() -> str:
+    """
+    Generate a UUIDv7 (RFC 9562) identifier string.
+
+    The 48-bit millisecond timestamp prefix makes IDs sort by creation
+    time, which keeps B-tree inserts local, and the standard version and
+    variant bits keep it a valid UUID for the native UUID columns.
+    Not for security-sensitive values.
+
+    Returns:
+        UUID-formatted identifier string
+    """
+    rand = _random.getrandbits(74)
+    value = (
+        ((time.time_ns() // 1_000_000) << 80)
+        | (0x7 << 76)
+        | ((rand >> 62) << 64)
+        | (0b10 << 62)
+        | (rand & 0x3FFF_FFFF_FFFF_FFFF)
+    )
+    h = f"{value:032x}"
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
@@ -7,10 +7,10 @@ Structured logging with optional PII redaction
 import logging
 import re
 import sys
-from typing import Any, Dict, Optional
+from typing import Any, Optional
 
 import structlog
-from structlog.types import Processor
+from structlog.types import EventDict, Processor, WrappedLogger
 
 from .config import settings
 
@@ -33,7 +33,7 @@ PII_PATTERNS = [
 ]
 
 
-def redact_pii(value: Any) -> Any:
+def _redact_pii(value: Any) -> Any:
     """
     Redact PII from a value.
 
@@ -43,38 +43,59 @@ def redact_pii(value: Any) -> Any:
     Returns:
         Redacted value
     """
-    if not settings.enable_pii_redaction:
-        return value
-
     if isinstance(value, str):
         result = value
         for pattern, replacement in PII_PATTERNS:
             result = pattern.sub(replacement, result)
         return result
     elif isinstance(value, dict):
-        return {k: redact_pii(v) for k, v in value.items()}
+        return {k: _redact_pii(v) for k, v in value.items()}
     elif isinstance(value, list):
-        return [redact_pii(item) for item in value]
+        return [_redact_pii(item) for item in value]
     return value
 
 
+def _identity(value: Any) -> Any:
+    """Return the value unchanged (redaction disabled)."""
+    return value
+
+
+# Resolved once at load so disabled redaction costs nothing per call
+redact_pii = _redact_pii if settings.enable_pii_redaction else _identity
+
+
 # =============================================================================
 # Custom Processors
 # =============================================================================
 
 
-def pii_redactor(
-    logger: logging.Logger, method_name: str, event_dict: Dict[str, Any]
-) -> Dict[str, Any]:
-    """Structlog processor to redact PII."""
-    if settings.enable_pii_redaction:
-        return {k: redact_pii(v) for k, v in event_dict.items()}
+def pii_redactor(logger: WrappedLogger, method_name: str, event_dict: EventDict) -> EventDict:
+    """Structlog processor to redact PII (only installed when enabled)."""
+    return {k: _redact_pii(v) for k, v in event_dict.items()}
+
+
+_stack_info_renderer = structlog.processors.StackInfoRenderer()
+
+
+def maybe_render_stack_info(
+    logger: WrappedLogger, method_name: str, event_dict: EventDict
+) -> EventDict:
+    """Run StackInfoRenderer only for events that request a stack."""
+    if "stack_info" in event_dict:
+        return _stack_info_renderer(logger, method_name, event_dict)
+    return event_dict
+
+
+def maybe_format_exc_info(
+    logger: WrappedLogger, method_name: str, event_dict: EventDict
+) -> EventDict:
+    """Run format_exc_info only for events that carry exception info."""
+    if "exc_info" in event_dict:
+        return structlog.processors.format_exc_info(logger, method_name, event_dict)
     return event_dict
 
 
-def add_app_context(
-    logger: logging.Logger, method_name: str, event_dict: Dict[str, Any]
-) -> Dict[str, Any]:
+def add_app_context(logger: WrappedLogger, method_name: str, event_dict: EventDict) -> EventDict:
     """Add application context to log events."""
     event_dict["app"] = settings.app_name
     event_dict["version"] = settings.app_version
@@ -111,9 +132,15 @@ def configure_logging() -> None:
         structlog.stdlib.add_logger_name,
         structlog.processors.TimeStamper(fmt="iso"),
         add_app_context,
-        pii_redactor,
-        structlog.processors.StackInfoRenderer(),
-        structlog.processors.format_exc_info,
+    ]
+
+    # Only pay for the event dict walk when redaction is enabled
+    if settings.enable_pii_redaction:
+        processors.append(pii_redactor)
+
+    processors += [
+        maybe_render_stack_info,
+        maybe_format_exc_info,
         structlog.processors.UnicodeDecoder(),
     ]
 
@@ -125,14 +152,15 @@ def configure_logging() -> None:
 
     structlog.configure(
         processors=processors,
-        wrapper_class=structlog.stdlib.BoundLogger,
+        # Drops sub-threshold calls before any processor runs
+        wrapper_class=structlog.make_filtering_bound_logger(log_level),
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
         cache_logger_on_first_use=True,
     )
 
 
-def get_logger(name: Optional[str] = None) -> structlog.stdlib.BoundLogger:
+def get_logger(name: Optional[str] = None) -> structlog.typing.FilteringBoundLogger:
     """
     Get a configured logger instance.
 
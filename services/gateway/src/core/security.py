@@ -4,17 +4,25 @@ TRJM Gateway - Security Utilities
 JWT handling, password hashing, CSRF tokens, and security helpers
 """
 
+import base64
 import hashlib
 import hmac
 import secrets
+import struct
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, Optional
-from uuid import uuid4
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID, uuid4
 
-from jose import JWTError, jwt
+import orjson
+from jose import JWTError, jwk, jwt
+from jose.backends.base import Key
 from pydantic import BaseModel
 
 from .config import settings
+from .ids import generate_id
 
 
 # =============================================================================
@@ -47,6 +55,25 @@ class TokenResponse(BaseModel):
 # =============================================================================
 
 
+@lru_cache(maxsize=1)
+def _jwt_keys() -> Tuple[Key, Key]:
+    """
+    Signing and verification keys, constructed once per process.
+
+    python-jose otherwise rebuilds the key from its raw material (parsing
+    PEM for asymmetric algorithms) on every encode and decode. For RS*/ES*
+    algorithms jwt_secret holds the PEM private key and tokens are verified
+    with its public half.
+
+    Returns:
+        (signing key, verification key)
+    """
+    signing_key = jwk.construct(settings.jwt_secret, settings.jwt_algorithm)
+    if settings.jwt_algorithm.startswith("HS"):
+        return signing_key, signing_key
+    return signing_key, signing_key.public_key()
+
+
 def create_access_token(
     user_id: str,
     username: str,
@@ -81,7 +108,7 @@ def create_access_token(
         features=features,
         exp=expire,
         iat=now,
-        jti=str(uuid4()),
+        jti=generate_id(),
     )
 
     # JWT requires exp/iat as Unix timestamps, not ISO strings
@@ -91,7 +118,7 @@ def create_access_token(
 
     encoded_jwt = jwt.encode(
         payload,
-        settings.jwt_secret,
+        _jwt_keys()[0],
         algorithm=settings.jwt_algorithm,
     )
 
@@ -114,7 +141,7 @@ def decode_access_token(token: str) -> Optional[TokenData]:
     try:
         payload = jwt.decode(
             token,
-            settings.jwt_secret,
+            _jwt_keys()[1],
             algorithms=[settings.jwt_algorithm],
         )
         # Convert Unix timestamps back to datetime
@@ -127,6 +154,48 @@ def decode_access_token(token: str) -> Optional[TokenData]:
         return None
 
 
+# Verified tokens are cached so chatty clients pay for one signature check
+# per TTL rather than one per request. Entries are keyed by the token's
+# SHA-256 digest (the raw token is never held) and never outlive its `exp`.
+# The TTL is kept short because invalidation only reaches the local worker.
+_VERIFY_CACHE_TTL_SECONDS = 10
+_VERIFY_CACHE_MAX_SIZE = 4096
+
+# sha256(token) -> (expires_at unix time, verified TokenData), in LRU order
+_verify_cache: "OrderedDict[bytes, Tuple[float, TokenData]]" = OrderedDict()
+
+
+def _token_cache_key(token: str) -> bytes:
+    """Cache key for a token."""
+    return hashlib.sha256(token.encode()).digest()
+
+
+def invalidate_token(token: str) -> None:
+    """
+    Drop a token's cached verification (e.g. on logout).
+
+    The next use of the token is verified again from scratch.
+    """
+    _verify_cache.pop(_token_cache_key(token), None)
+
+
+def _peek_expiry(token: str) -> Optional[int]:
+    """
+    Read the unverified `exp` claim from a token payload.
+
+    Only used to reject expired tokens before doing signature work;
+    returns None when the payload cannot be read.
+    """
+    try:
+        payload_b64 = token.split(".", 2)[1]
+        padding = "=" * (-len(payload_b64) % 4)
+        payload = orjson.loads(base64.urlsafe_b64decode(payload_b64 + padding))
+        exp = payload.get("exp")
+        return int(exp) if isinstance(exp, (int, float)) else None
+    except (IndexError, ValueError, TypeError, AttributeError):
+        return None
+
+
 def verify_token(token: str) -> Optional[TokenData]:
     """
     Verify token and check expiration.
@@ -137,14 +206,35 @@ def verify_token(token: str) -> Optional[TokenData]:
     Returns:
         TokenData if valid and not expired, None otherwise
     """
+    now = time.time()
+
+    # Fast reject: expired tokens never reach signature verification
+    exp = _peek_expiry(token)
+    if exp is not None and exp < now:
+        return None
+
+    key = _token_cache_key(token)
+    cached = _verify_cache.get(key)
+    if cached is not None:
+        if cached[0] > now:
+            _verify_cache.move_to_end(key)
+            return cached[1]
+        del _verify_cache[key]
+
+    # Failed verifications are never cached
     token_data = decode_access_token(token)
     if token_data is None:
         return None
 
     # Check expiration
-    if token_data.exp < datetime.now(timezone.utc):
+    expires_at = token_data.exp.timestamp()
+    if expires_at < now:
         return None
 
+    _verify_cache[key] = (min(now + _VERIFY_CACHE_TTL_SECONDS, expires_at), token_data)
+    if len(_verify_cache) > _VERIFY_CACHE_MAX_SIZE:
+        _verify_cache.popitem(last=False)
+
     return token_data
 
 
@@ -153,25 +243,37 @@ def verify_token(token: str) -> Optional[TokenData]:
 # =============================================================================
 
 
+# Keyed HMAC state built once; copying it skips re-deriving the key pads per call
+_CSRF_HMAC = hmac.new(settings.csrf_secret.encode(), None, hashlib.sha256)
+
+# Token layout: timestamp (8) | random (16) | session UUID (16) | HMAC-SHA256 (32)
+_CSRF_PAYLOAD = struct.Struct("!Q16s16s")
+_CSRF_TOKEN_SIZE = _CSRF_PAYLOAD.size + hashlib.sha256().digest_size
+
+
+def _csrf_signature(payload: bytes) -> bytes:
+    """Compute the raw HMAC-SHA256 signature for a CSRF payload."""
+    h = _CSRF_HMAC.copy()
+    h.update(payload)
+    return h.digest()
+
+
 def generate_csrf_token(session_id: str) -> str:
     """
     Generate a CSRF token tied to a session.
 
     Args:
-        session_id: The session identifier
+        session_id: The session identifier (UUID string)
 
     Returns:
-        CSRF token string
+        CSRF token string (base64url)
     """
-    timestamp = str(int(datetime.now(timezone.utc).timestamp()))
-    random_bytes = secrets.token_hex(16)
-    message = f"{session_id}:{timestamp}:{random_bytes}"
-    signature = hmac.new(
-        settings.csrf_secret.encode(),
-        message.encode(),
-        hashlib.sha256,
-    ).hexdigest()
-    return f"{message}:{signature}"
+    payload = _CSRF_PAYLOAD.pack(
+        int(time.time()),
+        secrets.token_bytes(16),
+        UUID(session_id).bytes,
+    )
+    return base64.urlsafe_b64encode(payload + _csrf_signature(payload)).decode("ascii")
 
 
 def verify_csrf_token(token: str, session_id: str, max_age_seconds: int = 3600) -> bool:
@@ -187,35 +289,22 @@ def verify_csrf_token(token: str, session_id: str, max_age_seconds: int = 3600)
         True if valid, False otherwise
     """
     try:
-        parts = token.rsplit(":", 1)
-        if len(parts) != 2:
-            return False
-
-        message, signature = parts
-        expected_signature = hmac.new(
-            settings.csrf_secret.encode(),
-            message.encode(),
-            hashlib.sha256,
-        ).hexdigest()
-
-        if not hmac.compare_digest(signature, expected_signature):
+        raw = base64.urlsafe_b64decode(token)
+        if len(raw) != _CSRF_TOKEN_SIZE:
             return False
 
-        # Parse message parts
-        msg_parts = message.split(":")
-        if len(msg_parts) != 3:
+        payload, signature = raw[: _CSRF_PAYLOAD.size], raw[_CSRF_PAYLOAD.size :]
+        if not hmac.compare_digest(signature, _csrf_signature(payload)):
             return False
 
-        token_session_id, timestamp, _ = msg_parts
+        token_time, _, token_session = _CSRF_PAYLOAD.unpack(payload)
 
         # Verify session ID
-        if token_session_id != session_id:
+        if token_session != UUID(session_id).bytes:
             return False
 
         # Verify age
-        token_time = int(timestamp)
-        current_time = int(datetime.now(timezone.utc).timestamp())
-        if current_time - token_time > max_age_seconds:
+        if int(time.time()) - token_time > max_age_seconds:
             return False
 
         return True
@@ -4,16 +4,14 @@ TRJM Gateway - Database Models
 SQLAlchemy models for all database tables
 """
 
-from datetime import datetime, timezone
+from datetime import datetime
 from enum import Enum
-from typing import List, Optional
-from uuid import uuid4
+from typing import FrozenSet, List, Optional, Tuple
 
 from sqlalchemy import (
-    JSON,
     Boolean,
-    CheckConstraint,
     DateTime,
+    FetchedValue,
     ForeignKey,
     Index,
     Integer,
@@ -21,10 +19,14 @@ from sqlalchemy import (
     String,
     Text,
     UniqueConstraint,
+    func,
+    text,
 )
-from sqlalchemy.dialects.postgresql import INET, UUID
+from sqlalchemy.dialects.postgresql import ENUM, INET, JSONB, UUID
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
+from ..core.ids import generate_id
+
 
 # =============================================================================
 # Base Model
@@ -32,9 +34,17 @@ from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
 class Base(DeclarativeBase):
-    """Base class for all models."""
+    """
+    Base class for all models.
+
+    UUID columns are native Postgres `uuid` (16 bytes) mapped with
+    as_uuid=False: ids cross the API as strings (JWT `sub`, path params,
+    response schemas), so they are kept as `str` end to end.
+    """
 
-    pass
+    # Timestamps are filled by the database (NOW() defaults and the
+    # updated_at triggers in init.sql); fetch them back via RETURNING
+    __mapper_args__ = {"eager_defaults": True}
 
 
 # =============================================================================
@@ -93,6 +103,11 @@ class AuditAction(str, Enum):
     USER_ROLE_CHANGED = "user_role_changed"
 
 
+# Native Postgres enum types backing the job columns
+JOB_TYPE_ENUM = ENUM(*[t.value for t in JobType], name="job_type_enum")
+JOB_STATUS_ENUM = ENUM(*[s.value for s in JobStatus], name="job_status_enum")
+
+
 # =============================================================================
 # Role Models
 # =============================================================================
@@ -102,23 +117,25 @@ class Role(Base):
     """Role model for RBAC."""
 
     __tablename__ = "roles"
+    # Lets the plain attributes below sit next to the mapped columns
+    __allow_unmapped__ = True
 
     id: Mapped[str] = mapped_column(
         UUID(as_uuid=False),
         primary_key=True,
-        default=lambda: str(uuid4()),
+        default=generate_id,
     )
     name: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text)
     is_default: Mapped[bool] = mapped_column(Boolean, default=False)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
-        onupdate=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+        server_onupdate=FetchedValue(),
     )
 
     # Relationships
@@ -126,11 +143,20 @@ class Role(Base):
         "RoleFeature",
         back_populates="role",
         cascade="all, delete-orphan",
+        passive_deletes=True,
     )
     users: Mapped[List["User"]] = relationship("User", back_populates="role")
 
+    # Not mapped: enabled feature names set by the auth caches instead of
+    # loading `features`, and the set memoized by User.has_feature
+    _enabled_feature_names: Optional[Tuple[str, ...]] = None
+    _enabled_features_cache: Optional[FrozenSet[str]] = None
+
     def get_enabled_features(self) -> List[str]:
         """Get list of enabled feature names."""
+        preloaded = self._enabled_feature_names
+        if preloaded is not None and "features" not in self.__dict__:
+            return list(preloaded)
         return [f.feature_name for f in self.features if f.enabled]
 
 
@@ -142,7 +168,7 @@ class RoleFeature(Base):
     id: Mapped[str] = mapped_column(
         UUID(as_uuid=False),
         primary_key=True,
-        default=lambda: str(uuid4()),
+        default=generate_id,
     )
     role_id: Mapped[str] = mapped_column(
         UUID(as_uuid=False),
@@ -153,7 +179,7 @@ class RoleFeature(Base):
     enabled: Mapped[bool] = mapped_column(Boolean, default=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
     )
 
     # Relationships
@@ -178,7 +204,7 @@ class User(Base):
     id: Mapped[str] = mapped_column(
         UUID(as_uuid=False),
         primary_key=True,
-        default=lambda: str(uuid4()),
+        default=generate_id,
     )
     username: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
     email: Mapped[Optional[str]] = mapped_column(String(255))
@@ -191,29 +217,40 @@ class User(Base):
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
-        onupdate=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+        server_onupdate=FetchedValue(),
     )
     last_login: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
 
     # Relationships
-    role: Mapped["Role"] = relationship("Role", back_populates="users")
-    jobs: Mapped[List["Job"]] = relationship("Job", back_populates="user")
-    glossaries: Mapped[List["Glossary"]] = relationship("Glossary", back_populates="user")
-    audit_logs: Mapped[List["AuditLog"]] = relationship("AuditLog", back_populates="user")
-
-    __table_args__ = (
-        Index("idx_users_username", "username"),
-        Index("idx_users_role_id", "role_id"),
+    # Many-to-one and needed for every RBAC check, so load it with the user
+    role: Mapped["Role"] = relationship(
+        "Role", back_populates="users", lazy="joined", innerjoin=True
+    )
+    # ON DELETE CASCADE / SET NULL in the schema handles children; don't load them
+    jobs: Mapped[List["Job"]] = relationship("Job", back_populates="user", passive_deletes=True)
+    glossaries: Mapped[List["Glossary"]] = relationship(
+        "Glossary", back_populates="user", passive_deletes=True
+    )
+    audit_logs: Mapped[List["AuditLog"]] = relationship(
+        "AuditLog", back_populates="user", passive_deletes=True
     )
 
+    # username lookups use the index behind its UNIQUE constraint
+    __table_args__ = (Index("idx_users_role_id", "role_id"),)
+
     def has_feature(self, feature: Feature) -> bool:
         """Check if user has a specific feature enabled."""
-        return feature.value in self.role.get_enabled_features()
+        # Memoized on the loaded role so repeated checks are a set lookup
+        features = self.role._enabled_features_cache
+        if features is None:
+            features = frozenset(self.role.get_enabled_features())
+            self.role._enabled_features_cache = features
+        return feature.value in features
 
 
 # =============================================================================
@@ -229,15 +266,17 @@ class Job(Base):
     id: Mapped[str] = mapped_column(
         UUID(as_uuid=False),
         primary_key=True,
-        default=lambda: str(uuid4()),
+        default=generate_id,
     )
     user_id: Mapped[str] = mapped_column(
         UUID(as_uuid=False),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
     )
-    job_type: Mapped[str] = mapped_column(String(20), nullable=False)
-    status: Mapped[str] = mapped_column(String(20), nullable=False, default=JobStatus.PENDING.value)
+    job_type: Mapped[str] = mapped_column(JOB_TYPE_ENUM, nullable=False)
+    status: Mapped[str] = mapped_column(
+        JOB_STATUS_ENUM, nullable=False, default=JobStatus.PENDING.value
+    )
     source_language: Mapped[str] = mapped_column(String(10), nullable=False)
     target_language: Mapped[str] = mapped_column(String(10), nullable=False)
     style_preset: Mapped[Optional[str]] = mapped_column(String(50))
@@ -247,14 +286,14 @@ class Job(Base):
     file_path: Mapped[Optional[str]] = mapped_column(String(500))
     output_file_path: Mapped[Optional[str]] = mapped_column(String(500))
     glossary_id: Mapped[Optional[str]] = mapped_column(UUID(as_uuid=False))
-    qa_report: Mapped[Optional[dict]] = mapped_column(JSON)
+    qa_report: Mapped[Optional[dict]] = mapped_column(JSONB)
     confidence: Mapped[Optional[float]] = mapped_column(Numeric(3, 2))
     error_message: Mapped[Optional[str]] = mapped_column(Text)
     retries: Mapped[int] = mapped_column(Integer, default=0)
     processing_time_ms: Mapped[Optional[int]] = mapped_column(Integer)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
     )
     completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
     expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -263,18 +302,21 @@ class Job(Base):
     user: Mapped["User"] = relationship("User", back_populates="jobs")
 
     __table_args__ = (
-        CheckConstraint(
-            "job_type IN ('text', 'file')",
-            name="ck_job_type",
-        ),
-        CheckConstraint(
-            "status IN ('pending', 'processing', 'completed', 'failed', 'expired')",
-            name="ck_job_status",
-        ),
         Index("idx_jobs_user_id", "user_id"),
-        Index("idx_jobs_status", "status"),
-        Index("idx_jobs_created_at", "created_at"),
+        # Status scans come back ordered by creation time as index-only scans
+        Index(
+            "idx_jobs_status_created",
+            "status",
+            "created_at",
+            postgresql_include=["user_id", "id"],
+        ),
         Index("idx_jobs_expires_at", "expires_at"),
+        # Active-job gate check only touches currently running rows
+        Index(
+            "idx_jobs_user_processing",
+            "user_id",
+            postgresql_where=text("status = 'processing'"),
+        ),
     )
 
 
@@ -291,7 +333,7 @@ class Glossary(Base):
     id: Mapped[str] = mapped_column(
         UUID(as_uuid=False),
         primary_key=True,
-        default=lambda: str(uuid4()),
+        default=generate_id,
     )
     user_id: Mapped[Optional[str]] = mapped_column(
         UUID(as_uuid=False),
@@ -305,12 +347,12 @@ class Glossary(Base):
     version: Mapped[int] = mapped_column(Integer, default=1)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
-        onupdate=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+        server_onupdate=FetchedValue(),
     )
 
     # Relationships
@@ -319,6 +361,7 @@ class Glossary(Base):
         "GlossaryEntry",
         back_populates="glossary",
         cascade="all, delete-orphan",
+        passive_deletes=True,
     )
 
     __table_args__ = (Index("idx_glossaries_user_id", "user_id"),)
@@ -332,7 +375,7 @@ class GlossaryEntry(Base):
     id: Mapped[str] = mapped_column(
         UUID(as_uuid=False),
         primary_key=True,
-        default=lambda: str(uuid4()),
+        default=generate_id,
     )
     glossary_id: Mapped[str] = mapped_column(
         UUID(as_uuid=False),
@@ -345,21 +388,19 @@ class GlossaryEntry(Base):
     context: Mapped[Optional[str]] = mapped_column(Text)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
-        onupdate=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+        server_onupdate=FetchedValue(),
     )
 
     # Relationships
     glossary: Mapped["Glossary"] = relationship("Glossary", back_populates="entries")
 
-    __table_args__ = (
-        Index("idx_glossary_entries_glossary_id", "glossary_id"),
-        Index("idx_glossary_entries_source_term", "source_term"),
-    )
+    # Entries are always fetched by glossary and matched in Python
+    __table_args__ = (Index("idx_glossary_entries_glossary_id", "glossary_id"),)
 
 
 # =============================================================================
@@ -375,7 +416,7 @@ class AuditLog(Base):
     id: Mapped[str] = mapped_column(
         UUID(as_uuid=False),
         primary_key=True,
-        default=lambda: str(uuid4()),
+        default=generate_id,
     )
     user_id: Mapped[Optional[str]] = mapped_column(
         UUID(as_uuid=False),
@@ -384,21 +425,20 @@ class AuditLog(Base):
     action: Mapped[str] = mapped_column(String(100), nullable=False)
     resource: Mapped[Optional[str]] = mapped_column(String(255))
     resource_id: Mapped[Optional[str]] = mapped_column(UUID(as_uuid=False))
-    details: Mapped[Optional[dict]] = mapped_column(JSON)
+    details: Mapped[Optional[dict]] = mapped_column(JSONB)
     ip_address: Mapped[Optional[str]] = mapped_column(INET)
     user_agent: Mapped[Optional[str]] = mapped_column(Text)
     correlation_id: Mapped[Optional[str]] = mapped_column(UUID(as_uuid=False))
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
     )
 
     # Relationships
     user: Mapped[Optional["User"]] = relationship("User", back_populates="audit_logs")
 
     __table_args__ = (
-        Index("idx_audit_logs_user_id", "user_id"),
+        Index("idx_audit_logs_user_created", "user_id", "created_at"),
         Index("idx_audit_logs_action", "action"),
-        Index("idx_audit_logs_created_at", "created_at"),
         Index("idx_audit_logs_correlation_id", "correlation_id"),
     )
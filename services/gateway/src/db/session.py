@@ -4,12 +4,12 @@ TRJM Gateway - Database Session Management
 Async SQLAlchemy session and connection handling
 """
 
+import asyncio
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Dict, Sequence, Type
 
-from sqlalchemy import text
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.pool import NullPool
 
 from ..core.config import settings
 from ..core.logging import logger
@@ -18,15 +18,22 @@ from ..core.logging import logger
 # Engine Configuration
 # =============================================================================
 
+# PgBouncer transaction pooling cannot keep server-side prepared statements
+_connect_args = (
+    {"statement_cache_size": 0, "prepared_statement_cache_size": 0} if settings.db_pgbouncer else {}
+)
+
 # Create async engine with connection pooling
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
     pool_pre_ping=True,  # Enable connection health checks
-    pool_size=10,
-    max_overflow=20,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
     pool_timeout=30,
-    pool_recycle=1800,  # Recycle connections after 30 minutes
+    pool_recycle=settings.db_pool_recycle,  # Stay under server-side idle timeouts
+    pool_use_lifo=True,  # Reuse the most recently used (warm) connections
+    connect_args=_connect_args,
 )
 
 # Create session factory
@@ -56,6 +63,9 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         async def get_items(db: AsyncSession = Depends(get_db)):
             ...
     """
+    # Not session.begin(): handlers may commit early (e.g. a failure status
+    # before raising) and keep using the session in a new transaction.
+    # The context manager closes the session.
     async with async_session_factory() as session:
         try:
             yield session
@@ -63,8 +73,6 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         except Exception:
             await session.rollback()
             raise
-        finally:
-            await session.close()
 
 
 @asynccontextmanager
@@ -76,6 +84,7 @@ async def get_db_context() -> AsyncGenerator[AsyncSession, None]:
         async with get_db_context() as db:
             result = await db.execute(query)
     """
+    # Commits on success, rolls back on error; the context manager closes it
     async with async_session_factory() as session:
         try:
             yield session
@@ -83,8 +92,45 @@ async def get_db_context() -> AsyncGenerator[AsyncSession, None]:
         except Exception:
             await session.rollback()
             raise
-        finally:
-            await session.close()
+
+
+# =============================================================================
+# Bulk Writes
+# =============================================================================
+
+BULK_INSERT_CHUNK_SIZE = 1000
+
+
+async def bulk_insert(
+    session: AsyncSession,
+    model: Type[Any],
+    rows: Sequence[Dict[str, Any]],
+    chunk_size: int = BULK_INSERT_CHUNK_SIZE,
+) -> int:
+    """
+    Insert many rows with one executemany per chunk.
+
+    Uses an ORM bulk INSERT, which SQLAlchemy batches into multi-row
+    INSERT ... VALUES statements instead of one round-trip per object.
+    Inserted rows are not added to the session; refresh any relationship
+    that should include them.
+
+    For best-effort writes such as audit bursts, callers may run
+    `SET LOCAL synchronous_commit = off` first to trade durability of
+    the last few transactions for commit latency.
+
+    Args:
+        session: Database session
+        model: Mapped model class
+        rows: Column-value dicts, one per row
+        chunk_size: Max rows per statement
+
+    Returns:
+        Number of rows inserted
+    """
+    for start in range(0, len(rows), chunk_size):
+        await session.execute(insert(model), rows[start : start + chunk_size])
+    return len(rows)
 
 
 # =============================================================================
@@ -92,14 +138,19 @@ async def get_db_context() -> AsyncGenerator[AsyncSession, None]:
 # =============================================================================
 
 
+async def _ping() -> None:
+    """Run a no-op query in autocommit mode (no BEGIN/COMMIT round-trips)."""
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.exec_driver_sql("SELECT 1")
+
+
 async def init_db() -> None:
     """
     Initialize database connection and verify connectivity.
     """
     try:
-        async with engine.begin() as conn:
-            # Test connection
-            await conn.execute(text("SELECT 1"))
+        await _ping()
         logger.info("Database connection established")
     except Exception as e:
         logger.error("Failed to connect to database", error=str(e))
@@ -118,6 +169,8 @@ async def close_db() -> None:
 # Health Check
 # =============================================================================
 
+HEALTH_CHECK_TIMEOUT_SECONDS = 1.0
+
 
 async def check_db_health() -> bool:
     """
@@ -127,8 +180,7 @@ async def check_db_health() -> bool:
         bool: True if database is healthy, False otherwise
     """
     try:
-        async with engine.begin() as conn:
-            await conn.execute(text("SELECT 1"))
+        await asyncio.wait_for(_ping(), timeout=HEALTH_CHECK_TIMEOUT_SECONDS)
         return True
     except Exception as e:
         logger.warning("Database health check failed", error=str(e))
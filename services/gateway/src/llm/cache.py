@@ -0,0 +1,249 @@
+"""
+TRJM Gateway - LLM Response Cache
+==================================
+Exact-match response cache and in-flight request coalescing in front of
+any LLM provider
+"""
+
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import orjson
+
+from ..core.config import settings
+from ..core.logging import logger
+from .provider import (
+    CompletionChunk,
+    CompletionResponse,
+    LLMProvider,
+    Message,
+    ResponseFormat,
+)
+
+
+class LLMResponseCache:
+    """
+    In-process LRU cache with per-entry TTL.
+
+    Keys are SHA-256 digests of the full request (model, messages,
+    sampling parameters, response format and extra provider kwargs).
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[int] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Max cached responses (defaults to settings)
+            ttl_seconds: Entry lifetime in seconds (defaults to settings)
+        """
+        self.max_entries = max_entries or settings.llm_cache_max_entries
+        self.ttl = ttl_seconds or settings.llm_cache_ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, CompletionResponse]]" = OrderedDict()
+
+    @staticmethod
+    def make_key(
+        model: str,
+        messages: List[Message],
+        temperature: float,
+        max_tokens: int,
+        response_format: Optional[ResponseFormat],
+        kwargs: dict,
+    ) -> str:
+        """Build the cache key for a request."""
+        payload = {
+            "model": model,
+            "messages": [msg.to_dict() for msg in messages],
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "response_format": response_format.to_dict() if response_format else None,
+            "kwargs": kwargs,
+        }
+        return hashlib.sha256(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+    def get(self, key: str) -> Optional[CompletionResponse]:
+        """Get a live entry and mark it recently used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, response = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return response
+
+    def set(self, key: str, response: CompletionResponse) -> None:
+        """Store a response, evicting the least recently used entry if full."""
+        self._entries[key] = (time.monotonic() + self.ttl, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+
+
+class CachingLLMProvider(LLMProvider):
+    """
+    Provider wrapper for repeated requests.
+
+    Identical requests already in flight share one upstream call, up to
+    `coalesce_max_temperature`. By default that is `max_temperature`, so only
+    deterministic requests are shared; raising it is an opt-in for callers
+    that accept identical samples for concurrent identical requests.
+    Completed responses are served from cache when one is configured, but
+    only up to `max_temperature`, since replaying a stored sample later would
+    make sampled requests deterministic.
+    """
+
+    def __init__(
+        self,
+        provider: LLMProvider,
+        cache: Optional[LLMResponseCache] = None,
+        max_temperature: Optional[float] = None,
+        coalesce_max_temperature: Optional[float] = None,
+    ):
+        """
+        Initialize the caching wrapper.
+
+        Args:
+            provider: Provider to wrap
+            cache: Response cache (only coalesces in-flight requests if None)
+            max_temperature: Highest temperature to cache (defaults to settings)
+            coalesce_max_temperature: Highest temperature to share in-flight
+                requests at (defaults to settings, then to max_temperature;
+                never below max_temperature)
+        """
+        self.provider = provider
+        self.cache = cache
+        self.max_temperature = (
+            settings.llm_cache_max_temperature if max_temperature is None else max_temperature
+        )
+        if coalesce_max_temperature is None:
+            coalesce_max_temperature = (
+                settings.llm_coalesce_max_temperature
+                if settings.llm_coalesce_requests
+                and settings.llm_coalesce_max_temperature is not None
+                else self.max_temperature
+            )
+        self.coalesce_max_temperature = max(self.max_temperature, coalesce_max_temperature)
+        self._inflight: Dict[str, "asyncio.Future[CompletionResponse]"] = {}
+
+        logger.info(
+            "LLM cache layer enabled",
+            provider=provider.provider_name,
+            response_cache=cache is not None,
+            max_temperature=self.max_temperature,
+            coalesce_max_temperature=self.coalesce_max_temperature,
+        )
+
+    @property
+    def provider_name(self) -> str:
+        return self.provider.provider_name
+
+    @property
+    def default_model(self) -> str:
+        return self.provider.default_model
+
+    async def chat_completion(
+        self,
+        messages: List[Message],
+        model: Optional[str] = None,
+        temperature: float = 0.3,
+        max_tokens: int = 4096,
+        response_format: Optional[ResponseFormat] = None,
+        **kwargs: Any,
+    ) -> CompletionResponse:
+        """Return a cached or in-flight completion when available, else call the provider."""
+        if temperature > self.coalesce_max_temperature:
+            return await self.provider.chat_completion(
+                messages, model, temperature, max_tokens, response_format, **kwargs
+            )
+
+        key = LLMResponseCache.make_key(
+            model or self.provider.default_model,
+            messages,
+            temperature,
+            max_tokens,
+            response_format,
+            kwargs,
+        )
+        cache = self.cache if temperature <= self.max_temperature else None
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                logger.debug("LLM cache hit", provider=self.provider_name)
+                return cached
+
+        # Join an identical request that is already in flight
+        while (inflight := self._inflight.get(key)) is not None:
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # The leading caller was cancelled; issue the request ourselves
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            response = await self.provider.chat_completion(
+                messages, model, temperature, max_tokens, response_format, **kwargs
+            )
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved when nobody joined
+            raise
+        else:
+            future.set_result(response)
+            if cache is not None:
+                cache.set(key, response)
+            return response
+        finally:
+            del self._inflight[key]
+
+    async def stream_chat_completion(
+        self,
+        messages: List[Message],
+        model: Optional[str] = None,
+        temperature: float = 0.3,
+        max_tokens: int = 4096,
+        response_format: Optional[ResponseFormat] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[CompletionChunk]:
+        """Stream straight from the provider; streams are neither cached nor shared."""
+        async for chunk in self.provider.stream_chat_completion(
+            messages, model, temperature, max_tokens, response_format, **kwargs
+        ):
+            yield chunk
+
+    async def health_check(self) -> bool:
+        return await self.provider.health_check()
+
+    def uncached(self) -> LLMProvider:
+        """Get the wrapped provider, skipping cached and in-flight responses."""
+        return self.provider
+
+    async def close(self) -> None:
+        """Close the wrapped provider and drop cached responses."""
+        if self.cache is not None:
+            self.cache.clear()
+        await self.provider.close()
+
+    def __getattr__(self, name: str) -> Any:
+        # Expose provider-specific attributes (e.g. mock call history)
+        if name == "provider":
+            raise AttributeError(name)
+        return getattr(self.provider, name)
@@ -4,14 +4,11 @@ TRJM Gateway - LLM Provider Factory
 Factory for creating LLM provider instances based on configuration
 """
 
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 from ..core.config import settings
 from ..core.logging import logger
-from .mock import MockLLMProvider
-from .openai import OpenAIProvider
 from .provider import LLMProvider
-from .vllm import VLLMProvider
 
 
 class LLMProviderFactory:
@@ -21,8 +18,6 @@ class LLMProviderFactory:
     Provider selection is based on the LLM_PROVIDER environment variable.
     """
 
-    _instance: Optional[LLMProvider] = None
-
     @classmethod
     def create(
         cls,
@@ -47,13 +42,20 @@ class LLMProviderFactory:
 
         logger.info("Creating LLM provider", provider_type=provider_type)
 
+        # Import only the selected backend module
         if provider_type == "openai":
+            from .openai import OpenAIProvider
+
             return OpenAIProvider(**kwargs)
 
         elif provider_type == "vllm":
+            from .vllm import VLLMProvider
+
             return VLLMProvider(**kwargs)
 
         elif provider_type == "mock":
+            from .mock import MockLLMProvider
+
             return MockLLMProvider(**kwargs)
 
         else:
@@ -69,21 +71,57 @@ class LLMProviderFactory:
         Returns:
             LLMProvider singleton instance
         """
-        if cls._instance is None:
-            cls._instance = cls.create()
-        return cls._instance
+        return _cached_provider(settings.llm_provider.lower())
+
+    @classmethod
+    def get_classification_provider(cls) -> LLMProvider:
+        """
+        Get the provider for classification calls (the Router agent).
+
+        Uses settings.llm_classification_model when configured, otherwise the
+        main provider singleton.
+
+        Returns:
+            LLMProvider singleton instance
+        """
+        model = settings.llm_classification_model
+        if not model or model == settings.llm_model:
+            return cls.get_provider()
+        return _cached_provider(settings.llm_provider.lower(), model)
 
     @classmethod
     def reset(cls) -> None:
-        """Reset the singleton instance (for testing)."""
-        cls._instance = None
+        """Reset the singleton instances (for testing)."""
+        _providers.clear()
 
     @classmethod
     async def close(cls) -> None:
-        """Close the provider and reset singleton."""
-        if cls._instance is not None:
-            await cls._instance.close()
-            cls._instance = None
+        """Close the providers and reset singletons."""
+        providers = list(_providers.values())
+        _providers.clear()
+        for provider in providers:
+            await provider.close()
+
+
+# Providers created so far, keyed by (provider type, model override)
+_providers: Dict[Tuple[str, Optional[str]], LLMProvider] = {}
+
+
+def _cached_provider(provider_type: str, model: Optional[str] = None) -> LLMProvider:
+    """Create the provider for a type and model once; later calls are a dict hit."""
+    key = (provider_type, model)
+    provider = _providers.get(key)
+    if provider is not None:
+        return provider
+
+    provider = LLMProviderFactory.create(provider_type, **({"model": model} if model else {}))
+    if settings.llm_cache_enabled or settings.llm_coalesce_requests:
+        from .cache import CachingLLMProvider, LLMResponseCache
+
+        cache = LLMResponseCache() if settings.llm_cache_enabled else None
+        provider = CachingLLMProvider(provider, cache=cache)
+    _providers[key] = provider
+    return provider
 
 
 def get_llm_provider() -> LLMProvider:
@@ -96,3 +134,8 @@ def get_llm_provider() -> LLMProvider:
             ...
     """
     return LLMProviderFactory.get_provider()
+
+
+def get_classification_llm_provider() -> LLMProvider:
+    """Dependency function to get the LLM provider for classification calls."""
+    return LLMProviderFactory.get_classification_provider()
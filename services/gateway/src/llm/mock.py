@@ -4,9 +4,10 @@ TRJM Gateway - Mock LLM Provider
 Mock provider for testing without real API calls
 """
 
+import asyncio
 import json
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from ..core.logging import logger
 from .provider import (
@@ -20,6 +21,62 @@ from .provider import (
     ResponseFormatType,
 )
 
+# =============================================================================
+# Canned JSON Responses (encoded once at import)
+# =============================================================================
+
+_MOCK_TRANSLATION = "هذا نص مترجم للاختبار"
+
+# Router agent response
+_ROUTER_RESPONSE = json.dumps(
+    {
+        "source_language": "en",
+        "source_language_confidence": 0.98,
+        "content_type": "general",
+        "formality_level": "neutral",
+        "special_elements": [],
+        "recommended_style": "neutral",
+        "complexity_score": 0.3,
+        "notes": "Mock analysis",
+    }
+)
+
+# Translator agent response
+_TRANSLATOR_RESPONSE = json.dumps(
+    {
+        "translation": _MOCK_TRANSLATION,
+        "protected_tokens_preserved": [],
+        "glossary_terms_applied": [],
+        "translator_notes": "Mock translation",
+    }
+)
+
+# Reviewer agent response
+_REVIEWER_RESPONSE = json.dumps(
+    {
+        "confidence_score": 0.92,
+        "issues": [],
+        "corrected_translation": _MOCK_TRANSLATION,
+        "glossary_compliance": True,
+        "protected_tokens_intact": True,
+        "risky_spans": [],
+        "reviewer_notes": "Mock review - no issues found",
+    }
+)
+
+# Post-processor response
+_POST_PROCESSOR_RESPONSE = json.dumps(
+    {
+        "processed_text": _MOCK_TRANSLATION,
+        "changes_made": [],
+        "rtl_markers_added": 0,
+        "formatting_preserved": True,
+    }
+)
+
+# Generic JSON response
+_GENERIC_RESPONSE = json.dumps({"result": "mock_response", "success": True})
+
 
 class MockLLMProvider(LLMProvider):
     """
@@ -49,7 +106,9 @@ class MockLLMProvider(LLMProvider):
         self.responses = responses or {}
         self.default_response = default_response or self._get_default_response()
         self.latency_ms = latency_ms
+        self._latency_s = latency_ms / 1000.0
         self.call_history: List[Dict[str, Any]] = []
+        self._partial_keys: Optional[List[Tuple[str, str]]] = None
 
         logger.info("Mock LLM provider initialized", model=model)
 
@@ -85,9 +144,8 @@ class MockLLMProvider(LLMProvider):
             Mock CompletionResponse
         """
         # Simulate latency
-        import asyncio
-
-        await asyncio.sleep(self.latency_ms / 1000)
+        if self._latency_s:
+            await asyncio.sleep(self._latency_s)
 
         # Record the call
         self.call_history.append(
@@ -149,73 +207,42 @@ class MockLLMProvider(LLMProvider):
 
         # Check for partial match
         prompt_lower = prompt.lower()
-        for key, value in self.responses.items():
-            if key.lower() in prompt_lower:
+        for key_lower, value in self._get_partial_keys():
+            if key_lower in prompt_lower:
                 return value
 
         # Return format-appropriate default
-        if response_format and response_format.type == ResponseFormatType.JSON_OBJECT:
+        if response_format and response_format.type in (
+            ResponseFormatType.JSON_OBJECT,
+            ResponseFormatType.JSON_SCHEMA,
+        ):
             return self._get_json_response(prompt)
 
         return self.default_response
 
+    def _get_partial_keys(self) -> List[Tuple[str, str]]:
+        """Get (lowercased key, response) pairs, rebuilt only when responses change."""
+        if self._partial_keys is None or len(self._partial_keys) != len(self.responses):
+            self._partial_keys = [(key.lower(), value) for key, value in self.responses.items()]
+        return self._partial_keys
+
     def _get_json_response(self, prompt: str) -> str:
         """Generate a JSON response based on context."""
         prompt_lower = prompt.lower()
 
-        # Router agent response
         if "analyze" in prompt_lower and "language" in prompt_lower:
-            return json.dumps(
-                {
-                    "source_language": "en",
-                    "source_language_confidence": 0.98,
-                    "content_type": "general",
-                    "formality_level": "neutral",
-                    "special_elements": [],
-                    "recommended_style": "neutral",
-                    "complexity_score": 0.3,
-                    "notes": "Mock analysis",
-                }
-            )
-
-        # Translator agent response
+            return _ROUTER_RESPONSE
+
         if "translate" in prompt_lower:
-            return json.dumps(
-                {
-                    "translation": "هذا نص مترجم للاختبار",
-                    "protected_tokens_preserved": [],
-                    "glossary_terms_applied": [],
-                    "translator_notes": "Mock translation",
-                }
-            )
-
-        # Reviewer agent response
+            return _TRANSLATOR_RESPONSE
+
         if "review" in prompt_lower:
-            return json.dumps(
-                {
-                    "confidence_score": 0.92,
-                    "issues": [],
-                    "corrected_translation": "هذا نص مترجم للاختبار",
-                    "glossary_compliance": True,
-                    "protected_tokens_intact": True,
-                    "risky_spans": [],
-                    "reviewer_notes": "Mock review - no issues found",
-                }
-            )
-
-        # Post-processor response
+            return _REVIEWER_RESPONSE
+
         if "post-process" in prompt_lower or "typography" in prompt_lower:
-            return json.dumps(
-                {
-                    "processed_text": "هذا نص مترجم للاختبار",
-                    "changes_made": [],
-                    "rtl_markers_added": 0,
-                    "formatting_preserved": True,
-                }
-            )
-
-        # Generic JSON response
-        return json.dumps({"result": "mock_response", "success": True})
+            return _POST_PROCESSOR_RESPONSE
+
+        return _GENERIC_RESPONSE
 
     def _get_default_response(self) -> str:
         """Get default non-JSON response."""
@@ -236,3 +263,4 @@ class MockLLMProvider(LLMProvider):
     def add_response(self, prompt: str, response: str) -> None:
         """Add a response mapping."""
         self.responses[prompt] = response
+        self._partial_keys = None
@@ -5,20 +5,17 @@ OpenAI API implementation for GPT-4.1
 """
 
 import time
-from typing import Any, List, Optional
+from typing import Any, AsyncIterator, List, Optional
 
 import httpx
-from tenacity import (
-    retry,
-    retry_if_exception_type,
-    stop_after_attempt,
-    wait_exponential,
-)
+import orjson
 
 from ..core.config import settings
 from ..core.logging import logger
 from .provider import (
+    UNAVAILABLE_STATUS_CODES,
     CompletionChoice,
+    CompletionChunk,
     CompletionResponse,
     CompletionUsage,
     LLMAuthenticationError,
@@ -28,11 +25,19 @@ from .provider import (
     LLMProviderError,
     LLMRateLimitError,
     LLMTimeoutError,
+    LLMUnavailableError,
     Message,
     MessageRole,
     ResponseFormat,
+    build_chat_payload,
+    iter_sse_data,
+    parse_stream_chunk,
+    retry_with_backoff,
 )
 
+# Plain dict lookup instead of MessageRole(...) for each parsed choice
+_ROLE_CACHE = {role.value: role for role in MessageRole}
+
 
 class OpenAIProvider(LLMProvider):
     """
@@ -69,10 +74,16 @@ class OpenAIProvider(LLMProvider):
         if not self.api_key:
             raise ValueError("OpenAI API key is required")
 
-        # Create HTTP client
+        # Create HTTP client (static headers live here; requests never pass per-call headers)
         self.client = httpx.AsyncClient(
             base_url=self.base_url,
-            timeout=httpx.Timeout(self.timeout),
+            timeout=httpx.Timeout(self.timeout, connect=settings.llm_connect_timeout),
+            http2=settings.llm_http2,
+            limits=httpx.Limits(
+                max_connections=settings.llm_max_connections,
+                max_keepalive_connections=settings.llm_max_keepalive_connections,
+                keepalive_expiry=settings.llm_keepalive_expiry,
+            ),
             headers={
                 "Authorization": f"Bearer {self.api_key}",
                 "Content-Type": "application/json",
@@ -93,11 +104,6 @@ class OpenAIProvider(LLMProvider):
     def default_model(self) -> str:
         return self._default_model
 
-    @retry(
-        retry=retry_if_exception_type((LLMRateLimitError, LLMTimeoutError)),
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=30),
-    )
     async def chat_completion(
         self,
         messages: List[Message],
@@ -121,22 +127,28 @@ class OpenAIProvider(LLMProvider):
         Returns:
             CompletionResponse with generated content
         """
-        model = model or self._default_model
-
-        # Build request payload
-        payload = {
-            "model": model,
-            "messages": [msg.to_dict() for msg in messages],
-            "temperature": temperature,
-            "max_tokens": max_tokens,
-        }
-
-        # Add response format if specified
-        if response_format:
-            payload["response_format"] = response_format.to_dict()
+        return await retry_with_backoff(
+            lambda: self._chat_completion_once(
+                messages, model, temperature, max_tokens, response_format, **kwargs
+            ),
+            retry_on=(LLMRateLimitError, LLMTimeoutError, LLMUnavailableError),
+            max_attempts=self.max_retries,
+        )
 
-        # Add any additional parameters
-        payload.update(kwargs)
+    async def _chat_completion_once(
+        self,
+        messages: List[Message],
+        model: Optional[str],
+        temperature: float,
+        max_tokens: int,
+        response_format: Optional[ResponseFormat],
+        **kwargs: Any,
+    ) -> CompletionResponse:
+        """Send one chat completion request (no retries)."""
+        model = model or self._default_model
+        payload = build_chat_payload(
+            messages, model, temperature, max_tokens, response_format, kwargs
+        )
 
         logger.debug(
             "OpenAI request",
@@ -145,44 +157,18 @@ class OpenAIProvider(LLMProvider):
             temperature=temperature,
         )
 
-        try:
-            start_time = time.time()
+        body = orjson.dumps(payload)
 
-            response = await self.client.post(
-                "/chat/completions",
-                json=payload,
-            )
+        try:
+            start_ns = time.monotonic_ns()
 
-            duration_ms = (time.time() - start_time) * 1000
+            response = await self.client.post("/chat/completions", content=body)
 
             # Handle errors
-            if response.status_code == 401:
-                raise LLMAuthenticationError(
-                    "Invalid API key",
-                    provider=self.provider_name,
-                    status_code=401,
-                )
-
-            if response.status_code == 429:
-                retry_after = response.headers.get("Retry-After", "60")
-                raise LLMRateLimitError(
-                    "Rate limit exceeded",
-                    provider=self.provider_name,
-                    status_code=429,
-                    retry_after=int(retry_after),
-                )
-
-            if response.status_code >= 500:
-                raise LLMProviderError(
-                    f"Server error: {response.status_code}",
-                    provider=self.provider_name,
-                    status_code=response.status_code,
-                )
-
-            response.raise_for_status()
+            self._check_status(response)
 
             # Parse response
-            data = response.json()
+            data = orjson.loads(response.content)
 
             # Check for content filter
             if data.get("choices", [{}])[0].get("finish_reason") == "content_filter":
@@ -198,7 +184,7 @@ class OpenAIProvider(LLMProvider):
                 "OpenAI response",
                 model=model,
                 tokens=result.usage.total_tokens,
-                duration_ms=round(duration_ms, 2),
+                duration_ms=round((time.monotonic_ns() - start_ns) / 1_000_000, 2),
             )
 
             return result
@@ -210,16 +196,18 @@ class OpenAIProvider(LLMProvider):
                 provider=self.provider_name,
             ) from e
 
-        except httpx.HTTPStatusError as e:
-            logger.error(
-                "OpenAI HTTP error",
-                status_code=e.response.status_code,
-                detail=e.response.text,
-            )
-            raise LLMProviderError(
-                f"HTTP error: {e.response.status_code}",
+        except httpx.TransportError as e:
+            logger.warning("OpenAI connection error", model=model, error=str(e))
+            raise LLMUnavailableError(
+                f"Connection error: {str(e)}",
+                provider=self.provider_name,
+            ) from e
+
+        except (LookupError, TypeError, ValueError, AttributeError) as e:
+            # Malformed JSON body or unexpected response shape
+            raise LLMInvalidResponseError(
+                f"Failed to parse response: {str(e)}",
                 provider=self.provider_name,
-                status_code=e.response.status_code,
             ) from e
 
         except Exception as e:
@@ -231,43 +219,153 @@ class OpenAIProvider(LLMProvider):
                 provider=self.provider_name,
             ) from e
 
-    def _parse_response(self, data: dict) -> CompletionResponse:
-        """Parse OpenAI API response into CompletionResponse."""
+    async def stream_chat_completion(
+        self,
+        messages: List[Message],
+        model: Optional[str] = None,
+        temperature: float = 0.3,
+        max_tokens: int = 4096,
+        response_format: Optional[ResponseFormat] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[CompletionChunk]:
+        """
+        Stream a chat completion from the OpenAI API using server-sent events.
+
+        Chunks are yielded as they arrive. Streamed requests are not retried,
+        since the caller may already have consumed part of the output.
+
+        Args:
+            messages: List of chat messages
+            model: Model to use (defaults to configured model)
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            response_format: Response format specification
+            **kwargs: Additional parameters
+
+        Yields:
+            CompletionChunk deltas; the last chunk carries token usage
+        """
+        model = model or self._default_model
+        payload = build_chat_payload(
+            messages, model, temperature, max_tokens, response_format, kwargs, stream=True
+        )
+
+        logger.debug(
+            "OpenAI stream request",
+            model=model,
+            message_count=len(messages),
+            temperature=temperature,
+        )
+
         try:
-            choices = []
-            for choice_data in data.get("choices", []):
-                message_data = choice_data.get("message", {})
-                choices.append(
-                    CompletionChoice(
-                        index=choice_data.get("index", 0),
-                        message=Message(
-                            role=MessageRole(message_data.get("role", "assistant")),
-                            content=message_data.get("content", ""),
-                        ),
-                        finish_reason=choice_data.get("finish_reason", "stop"),
-                    )
-                )
+            async with self.client.stream(
+                "POST",
+                "/chat/completions",
+                content=orjson.dumps(payload),
+            ) as response:
+                if response.status_code >= 400:
+                    await response.aread()
+                self._check_status(response)
+
+                async for data in iter_sse_data(response.aiter_lines()):
+                    for chunk in parse_stream_chunk(data, self._default_model, self.provider_name):
+                        if chunk.finish_reason == "content_filter":
+                            raise LLMContentFilterError(
+                                "Content was filtered",
+                                provider=self.provider_name,
+                            )
+                        yield chunk
+
+        except httpx.TimeoutException as e:
+            logger.warning("OpenAI stream timeout", model=model)
+            raise LLMTimeoutError(
+                f"Request timed out after {self.timeout}s",
+                provider=self.provider_name,
+            ) from e
+
+        except Exception as e:
+            if isinstance(e, LLMProviderError):
+                raise
+            logger.exception("OpenAI unexpected stream error", error=str(e))
+            raise LLMProviderError(
+                f"Unexpected error: {str(e)}",
+                provider=self.provider_name,
+            ) from e
 
-            usage_data = data.get("usage", {})
-            usage = CompletionUsage(
-                prompt_tokens=usage_data.get("prompt_tokens", 0),
-                completion_tokens=usage_data.get("completion_tokens", 0),
-                total_tokens=usage_data.get("total_tokens", 0),
+    def _check_status(self, response: httpx.Response) -> None:
+        """Raise the matching provider error for a failed response."""
+        if response.status_code == 401:
+            raise LLMAuthenticationError(
+                "Invalid API key",
+                provider=self.provider_name,
+                status_code=401,
             )
 
-            return CompletionResponse(
-                id=data.get("id", ""),
-                model=data.get("model", self._default_model),
-                choices=choices,
-                usage=usage,
-                created=data.get("created", int(time.time())),
+        if response.status_code == 429:
+            retry_after = response.headers.get("Retry-After")
+            raise LLMRateLimitError(
+                "Rate limit exceeded",
+                provider=self.provider_name,
+                status_code=429,
+                retry_after=(int(retry_after) if retry_after and retry_after.isdigit() else None),
             )
 
-        except (KeyError, TypeError, ValueError) as e:
-            raise LLMInvalidResponseError(
-                f"Failed to parse response: {str(e)}",
+        if response.status_code in UNAVAILABLE_STATUS_CODES:
+            raise LLMUnavailableError(
+                f"Server unavailable: {response.status_code}",
                 provider=self.provider_name,
-            ) from e
+                status_code=response.status_code,
+            )
+
+        if response.status_code >= 500:
+            raise LLMProviderError(
+                f"Server error: {response.status_code}",
+                provider=self.provider_name,
+                status_code=response.status_code,
+            )
+
+        if response.status_code >= 400:
+            logger.error(
+                "OpenAI HTTP error",
+                status_code=response.status_code,
+                detail=response.text,
+            )
+            raise LLMProviderError(
+                f"HTTP error: {response.status_code}",
+                provider=self.provider_name,
+                status_code=response.status_code,
+            )
+
+    def _parse_response(self, data: dict) -> CompletionResponse:
+        """Parse OpenAI API response into CompletionResponse."""
+        choices = []
+        for choice_data in data.get("choices", []):
+            message_data = choice_data.get("message", {})
+            choices.append(
+                CompletionChoice(
+                    index=choice_data.get("index", 0),
+                    message=Message(
+                        role=_ROLE_CACHE.get(message_data.get("role"), MessageRole.ASSISTANT),
+                        content=message_data.get("content", ""),
+                    ),
+                    finish_reason=choice_data.get("finish_reason", "stop"),
+                )
+            )
+
+        usage_data = data.get("usage", {})
+        usage = CompletionUsage(
+            prompt_tokens=usage_data.get("prompt_tokens", 0),
+            completion_tokens=usage_data.get("completion_tokens", 0),
+            total_tokens=usage_data.get("total_tokens", 0),
+        )
+
+        return CompletionResponse(
+            id=data.get("id", ""),
+            model=data.get("model", self._default_model),
+            choices=choices,
+            usage=usage,
+            created=data.get("created", int(time.time())),
+        )
 
     async def health_check(self) -> bool:
         """Check if OpenAI API is accessible."""
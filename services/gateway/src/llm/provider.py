@@ -4,12 +4,26 @@ TRJM Gateway - LLM Provider Abstract Interface
 Base class for all LLM providers
 """
 
+import asyncio
+import random
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union
-
-from pydantic import BaseModel
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+
+import orjson
 
 
 # =============================================================================
@@ -25,16 +39,24 @@ class MessageRole(str, Enum):
     ASSISTANT = "assistant"
 
 
-@dataclass
+@dataclass(slots=True)
 class Message:
     """Chat message structure."""
 
     role: MessageRole
     content: str
+    _dict: Optional[Dict[str, str]] = field(default=None, init=False, repr=False, compare=False)
 
     def to_dict(self) -> Dict[str, str]:
-        """Convert to dictionary for API calls."""
-        return {"role": self.role.value, "content": self.content}
+        """
+        Convert to dictionary for API calls.
+
+        Built once and reused across retries; messages are not mutated after
+        being sent.
+        """
+        if self._dict is None:
+            self._dict = {"role": self.role.value, "content": self.content}
+        return self._dict
 
 
 # =============================================================================
@@ -42,7 +64,7 @@ class Message:
 # =============================================================================
 
 
-@dataclass
+@dataclass(slots=True)
 class CompletionChoice:
     """Single completion choice."""
 
@@ -51,7 +73,7 @@ class CompletionChoice:
     finish_reason: str
 
 
-@dataclass
+@dataclass(slots=True)
 class CompletionUsage:
     """Token usage information."""
 
@@ -60,7 +82,7 @@ class CompletionUsage:
     total_tokens: int
 
 
-@dataclass
+@dataclass(slots=True)
 class CompletionResponse:
     """LLM completion response."""
 
@@ -85,6 +107,18 @@ class CompletionResponse:
         return ""
 
 
+@dataclass(slots=True)
+class CompletionChunk:
+    """Incremental piece of a streamed completion."""
+
+    id: str
+    model: str
+    index: int
+    content: str
+    finish_reason: Optional[str] = None
+    usage: Optional[CompletionUsage] = None
+
+
 # =============================================================================
 # Response Format
 # =============================================================================
@@ -95,17 +129,35 @@ class ResponseFormatType(str, Enum):
 
     TEXT = "text"
     JSON_OBJECT = "json_object"
+    JSON_SCHEMA = "json_schema"
 
 
-@dataclass
+@dataclass(slots=True)
 class ResponseFormat:
-    """Response format specification."""
+    """
+    Response format specification.
 
-    type: ResponseFormatType = ResponseFormatType.TEXT
+    For JSON_SCHEMA, `schema` is the JSON Schema sent with the request and
+    `name` identifies it. It is sent without `strict`, so vLLM enforces it
+    via guided decoding but OpenAI uses it as guidance only.
+    """
 
-    def to_dict(self) -> Dict[str, str]:
-        """Convert to dictionary for API calls."""
-        return {"type": self.type.value}
+    type: ResponseFormatType = ResponseFormatType.TEXT
+    schema: Optional[Dict[str, Any]] = None
+    name: str = "response"
+    _dict: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for API calls (built once, like Message.to_dict)."""
+        if self._dict is None:
+            if self.type == ResponseFormatType.JSON_SCHEMA:
+                self._dict = {
+                    "type": self.type.value,
+                    "json_schema": {"name": self.name, "schema": self.schema or {}},
+                }
+            else:
+                self._dict = {"type": self.type.value}
+        return self._dict
 
 
 # =============================================================================
@@ -150,6 +202,55 @@ class LLMProvider(ABC):
         """
         pass
 
+    async def stream_chat_completion(
+        self,
+        messages: List[Message],
+        model: Optional[str] = None,
+        temperature: float = 0.3,
+        max_tokens: int = 4096,
+        response_format: Optional[ResponseFormat] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[CompletionChunk]:
+        """
+        Generate a chat completion as a stream of chunks.
+
+        Providers with native streaming override this. The default
+        implementation yields the full completion as one chunk per choice,
+        followed by a usage chunk.
+
+        Args:
+            messages: List of chat messages
+            model: Model identifier (uses default if not specified)
+            temperature: Sampling temperature (0.0 - 2.0)
+            max_tokens: Maximum tokens to generate
+            response_format: Optional response format specification
+            **kwargs: Additional provider-specific parameters
+
+        Yields:
+            CompletionChunk deltas; the last chunk carries token usage
+
+        Raises:
+            LLMProviderError: If the request fails
+        """
+        response = await self.chat_completion(
+            messages, model, temperature, max_tokens, response_format, **kwargs
+        )
+        for choice in response.choices:
+            yield CompletionChunk(
+                id=response.id,
+                model=response.model,
+                index=choice.index,
+                content=choice.message.content,
+                finish_reason=choice.finish_reason,
+            )
+        yield CompletionChunk(
+            id=response.id,
+            model=response.model,
+            index=0,
+            content="",
+            usage=response.usage,
+        )
+
     @abstractmethod
     async def health_check(self) -> bool:
         """
@@ -160,6 +261,18 @@ class LLMProvider(ABC):
         """
         pass
 
+    async def close(self) -> None:  # noqa: B027 - optional hook, not every provider holds resources
+        """Release provider resources such as HTTP clients (no-op by default)."""
+
+    def uncached(self) -> "LLMProvider":
+        """
+        Get a provider that always makes a fresh upstream call.
+
+        Used to re-ask after an unusable response, which a caching wrapper
+        would otherwise serve again. Providers without a cache return self.
+        """
+        return self
+
     @property
     @abstractmethod
     def provider_name(self) -> str:
@@ -212,6 +325,16 @@ class LLMTimeoutError(LLMProviderError):
     pass
 
 
+class LLMUnavailableError(LLMProviderError):
+    """Connection failed or the server is temporarily unavailable."""
+
+    pass
+
+
+# Gateway/overload statuses worth retrying
+UNAVAILABLE_STATUS_CODES = frozenset({502, 503, 504})
+
+
 class LLMContentFilterError(LLMProviderError):
     """Content was filtered by the provider."""
 
@@ -222,3 +345,169 @@ class LLMInvalidResponseError(LLMProviderError):
     """Invalid response from the provider."""
 
     pass
+
+
+# =============================================================================
+# Retry Helper
+# =============================================================================
+
+RETRY_BASE_DELAY_SECONDS = 2.0
+RETRY_MAX_DELAY_SECONDS = 30.0
+
+_T = TypeVar("_T")
+
+
+async def retry_with_backoff(
+    call: Callable[[], Awaitable[_T]],
+    retry_on: Tuple[Type[LLMProviderError], ...],
+    max_attempts: int,
+) -> _T:
+    """
+    Run a provider call, retrying transient failures with full-jitter backoff.
+
+    Waits `Retry-After` (capped at RETRY_MAX_DELAY_SECONDS) when the provider
+    sent one, otherwise a random delay in [0, min(max, base * 2**attempt)] so
+    concurrent callers spread out.
+
+    Args:
+        call: Zero-argument coroutine factory for one attempt
+        retry_on: Exception types that are retried
+        max_attempts: Total attempts including the first
+
+    Returns:
+        Result of the first successful attempt
+    """
+    for attempt in range(max_attempts):
+        try:
+            return await call()
+        except retry_on as e:
+            if attempt + 1 >= max_attempts:
+                raise
+            if e.retry_after:
+                delay = min(e.retry_after, RETRY_MAX_DELAY_SECONDS)
+            else:
+                # Full jitter; not security sensitive
+                delay = random.uniform(  # noqa: S311
+                    0, min(RETRY_MAX_DELAY_SECONDS, RETRY_BASE_DELAY_SECONDS * 2**attempt)
+                )
+            await asyncio.sleep(delay)
+    raise ValueError("max_attempts must be at least 1")
+
+
+# =============================================================================
+# OpenAI-Compatible Wire Format
+# =============================================================================
+
+
+def build_chat_payload(
+    messages: List[Message],
+    model: str,
+    temperature: float,
+    max_tokens: int,
+    response_format: Optional[ResponseFormat],
+    extra: Dict[str, Any],
+    stream: bool = False,
+) -> Dict[str, Any]:
+    """
+    Build an OpenAI-compatible Chat Completions request body.
+
+    Args:
+        messages: List of chat messages
+        model: Model to use
+        temperature: Sampling temperature
+        max_tokens: Maximum tokens to generate
+        response_format: Response format specification
+        extra: Additional request parameters, merged in last
+        stream: Request server-sent events with a final usage frame
+
+    Returns:
+        Request body ready for serialization
+    """
+    payload: Dict[str, Any] = {
+        "model": model,
+        "messages": [msg.to_dict() for msg in messages],
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+    }
+    if stream:
+        payload["stream"] = True
+        payload["stream_options"] = {"include_usage": True}
+
+    # Common case: no response format and no extra parameters
+    if not response_format and not extra:
+        return payload
+
+    if response_format:
+        payload["response_format"] = response_format.to_dict()
+    if extra:
+        payload.update(extra)
+
+    return payload
+
+
+async def iter_sse_data(lines: AsyncIterator[str]) -> AsyncIterator[str]:
+    """Yield the data of each server-sent event line until the `[DONE]` marker."""
+    async for line in lines:
+        if not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if data == "[DONE]":
+            return
+        yield data
+
+
+def parse_stream_chunk(data: str, default_model: str, provider: str) -> List[CompletionChunk]:
+    """
+    Parse one OpenAI-compatible stream frame into completion chunks.
+
+    Args:
+        data: JSON data of one server-sent event
+        default_model: Model reported when the frame names none
+        provider: Provider name for raised errors
+
+    Returns:
+        One chunk per choice, plus a usage chunk for the final frame
+
+    Raises:
+        LLMInvalidResponseError: If the frame is malformed
+    """
+    try:
+        frame = orjson.loads(data)
+        chunk_id = frame.get("id", "")
+        chunk_model = frame.get("model", default_model)
+
+        chunks = [
+            CompletionChunk(
+                id=chunk_id,
+                model=chunk_model,
+                index=choice_data.get("index", 0),
+                content=(choice_data.get("delta") or {}).get("content") or "",
+                finish_reason=choice_data.get("finish_reason"),
+            )
+            for choice_data in frame.get("choices", [])
+        ]
+
+        # Usage arrives on a final frame with no choices
+        usage_data = frame.get("usage")
+        if usage_data:
+            chunks.append(
+                CompletionChunk(
+                    id=chunk_id,
+                    model=chunk_model,
+                    index=0,
+                    content="",
+                    usage=CompletionUsage(
+                        prompt_tokens=usage_data.get("prompt_tokens", 0),
+                        completion_tokens=usage_data.get("completion_tokens", 0),
+                        total_tokens=usage_data.get("total_tokens", 0),
+                    ),
+                )
+            )
+
+        return chunks
+
+    except (KeyError, TypeError, ValueError, AttributeError) as e:
+        raise LLMInvalidResponseError(
+            f"Failed to parse stream chunk: {str(e)}",
+            provider=provider,
+        ) from e
@@ -9,7 +9,7 @@ from typing import AsyncGenerator
 
 from fastapi import FastAPI, Request, status
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 
 from .api.middleware.auth import setup_auth_middleware
 from .api.middleware.cors import setup_cors_middleware
@@ -19,6 +19,10 @@ from .api.routes import admin, auth, files, glossary, history, translation
 from .core.config import settings
 from .core.logging import logger
 from .db.session import check_db_health, close_db, init_db
+from .llm.factory import LLMProviderFactory
+from .services.auth.jwt import close_audit_buffer
+from .services.auth.ldap import close_ldap_service
+from .services.translation.batcher import close_batcher
 
 
 # =============================================================================
@@ -48,10 +52,20 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
         logger.error("Failed to initialize database", error=str(e))
         raise
 
+    # Build the provider (and its pooled HTTP client) before the first request
+    try:
+        LLMProviderFactory.get_provider()
+    except Exception as e:
+        logger.error("Failed to initialize LLM provider", error=str(e))
+
     yield
 
     # Shutdown
     logger.info("Shutting down TRJM Gateway")
+    await close_batcher()
+    await LLMProviderFactory.close()
+    await close_ldap_service()
+    await close_audit_buffer()
     await close_db()
     logger.info("Database connection closed")
 
@@ -75,6 +89,7 @@ def create_application() -> FastAPI:
         docs_url="/docs" if settings.dev_mode else None,
         redoc_url="/redoc" if settings.dev_mode else None,
         openapi_url="/openapi.json" if settings.dev_mode else None,
+        default_response_class=ORJSONResponse,
         lifespan=lifespan,
     )
 
@@ -213,4 +228,6 @@ if __name__ == "__main__":
         port=8000,
         reload=settings.dev_mode,
         log_level=settings.log_level.lower(),
+        loop="uvloop",
+        http="httptools",
     )
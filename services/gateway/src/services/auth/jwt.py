@@ -4,17 +4,22 @@ TRJM Gateway - JWT Token Service
 Token management and user session handling
 """
 
+import asyncio
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
-from sqlalchemy import select
+from sqlalchemy import event, inspect, or_, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import Session, joinedload, make_transient_to_detached, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from ...core.config import settings
 from ...core.logging import logger
 from ...core.security import TokenData, TokenResponse, create_access_token, verify_token
 from ...db.models import AuditAction, AuditLog, Feature, Role, RoleFeature, User
+from ...db.session import bulk_insert, get_db_context
 from .ldap import LDAPUser
 
 
@@ -26,6 +31,12 @@ from .ldap import LDAPUser
 class UserService:
     """Service for user management operations."""
 
+    # LDAP group (lowercase) -> role name, in priority order
+    GROUP_ROLES = (
+        ("admins", "Administrator"),
+        ("translators", "Translator"),
+    )
+
     def __init__(self, db: AsyncSession):
         self.db = db
 
@@ -40,11 +51,9 @@ class UserService:
             User if found, None otherwise
         """
         result = await self.db.execute(
-            select(User)
-            .options(selectinload(User.role).selectinload(Role.features))
-            .where(User.username == username)
+            select(User).options(joinedload(User.role)).where(User.username == username)
         )
-        return result.scalar_one_or_none()
+        return await self._attach_role_features(result.scalar_one_or_none())
 
     async def get_user_by_id(self, user_id: str) -> Optional[User]:
         """
@@ -57,11 +66,36 @@ class UserService:
             User if found, None otherwise
         """
         result = await self.db.execute(
-            select(User)
-            .options(selectinload(User.role).selectinload(Role.features))
-            .where(User.id == user_id)
+            select(User).options(joinedload(User.role)).where(User.id == user_id)
         )
-        return result.scalar_one_or_none()
+        return await self._attach_role_features(result.scalar_one_or_none())
+
+    async def _attach_role_features(self, user: Optional[User]) -> Optional[User]:
+        """
+        Attach the enabled feature names of the user's role.
+
+        Role features are near-static, so they come from the role feature
+        cache instead of loading Role.features with every user lookup.
+        """
+        if user is None:
+            return None
+
+        role = user.role
+        if "features" in role.__dict__:
+            return user
+
+        features = _get_cached_role_features(role.id)
+        if features is None:
+            result = await self.db.execute(
+                select(RoleFeature.feature_name).where(
+                    RoleFeature.role_id == role.id, RoleFeature.enabled == True
+                )
+            )
+            features = tuple(result.scalars())
+            _set_cached_role_features(role.id, features)
+
+        role._enabled_feature_names = features
+        return user
 
     async def get_default_role(self) -> Optional[Role]:
         """
@@ -70,10 +104,16 @@ class UserService:
         Returns:
             Default Role if exists, None otherwise
         """
+        cached = _get_cached_role("default")
+        if cached is not None:
+            return cached
+
         result = await self.db.execute(
             select(Role).options(selectinload(Role.features)).where(Role.is_default == True)
         )
-        return result.scalar_one_or_none()
+        role = result.scalar_one_or_none()
+        _set_cached_role("default", role)
+        return role
 
     async def get_role_by_name(self, name: str) -> Optional[Role]:
         """
@@ -85,10 +125,17 @@ class UserService:
         Returns:
             Role if found, None otherwise
         """
+        key = f"name:{name}"
+        cached = _get_cached_role(key)
+        if cached is not None:
+            return cached
+
         result = await self.db.execute(
             select(Role).options(selectinload(Role.features)).where(Role.name == name)
         )
-        return result.scalar_one_or_none()
+        role = result.scalar_one_or_none()
+        _set_cached_role(key, role)
+        return role
 
     async def create_or_update_user(self, ldap_user: LDAPUser) -> User:
         """
@@ -100,6 +147,8 @@ class UserService:
         Returns:
             Created or updated User
         """
+        now = datetime.now(timezone.utc)
+
         # Check if user exists
         user = await self.get_user_by_username(ldap_user.username)
 
@@ -107,43 +156,72 @@ class UserService:
             # Update existing user
             user.email = ldap_user.email or user.email
             user.display_name = ldap_user.display_name or user.display_name
-            user.last_login = datetime.now(timezone.utc)
+            user.last_login = now
             logger.info("Updated existing user", username=ldap_user.username)
         else:
-            # Get default role
-            default_role = await self.get_default_role()
-            if not default_role:
-                logger.error("No default role found")
-                raise ValueError("No default role configured")
-
             # Determine role based on LDAP groups
-            role = default_role
-            if ldap_user.groups:
-                # Map LDAP groups to roles
-                if "admins" in [g.lower() for g in ldap_user.groups]:
-                    admin_role = await self.get_role_by_name("Administrator")
-                    if admin_role:
-                        role = admin_role
-                elif "translators" in [g.lower() for g in ldap_user.groups]:
-                    translator_role = await self.get_role_by_name("Translator")
-                    if translator_role:
-                        role = translator_role
-
-            # Create new user
+            role = await self._resolve_role_for_groups(ldap_user.groups)
+
+            # Create new user; the role may be rebuilt from the role cache, so
+            # attach a session-local copy without a SELECT and carry over its
+            # enabled feature names, which merge() does not copy
             user = User(
                 username=ldap_user.username,
                 email=ldap_user.email,
                 display_name=ldap_user.display_name,
                 role_id=role.id,
-                last_login=datetime.now(timezone.utc),
+                last_login=now,
             )
+            user.role = await self.db.merge(role, load=False)
+            user.role._enabled_feature_names = role._enabled_feature_names
             self.db.add(user)
             logger.info("Created new user", username=ldap_user.username, role=role.name)
 
         await self.db.flush()
 
-        # Reload with relationships
-        return await self.get_user_by_username(ldap_user.username)
+        # Role and features are already loaded on both paths
+        return user
+
+    async def _resolve_role_for_groups(self, groups: List[str]) -> Role:
+        """
+        Pick the role for a new user from their LDAP groups.
+
+        The first mapped group the user belongs to wins; otherwise the
+        default role is used. Roles missing from the role cache are loaded
+        together in one query.
+
+        Raises:
+            ValueError: If no default role is configured
+        """
+        groups_lc = frozenset(g.lower() for g in groups or ())
+        role_names = [name for group, name in self.GROUP_ROLES if group in groups_lc]
+
+        # Candidates in priority order: mapped roles, then the default
+        keys = [f"name:{name}" for name in role_names] + ["default"]
+        roles = {key: _get_cached_role(key) for key in keys}
+
+        if any(role is None for role in roles.values()):
+            result = await self.db.execute(
+                select(Role)
+                .options(selectinload(Role.features))
+                .where(or_(Role.is_default == True, Role.name.in_(role_names)))
+            )
+            for role in result.scalars():
+                if role.is_default:
+                    roles["default"] = role
+                    _set_cached_role("default", role)
+                key = f"name:{role.name}"
+                if key in roles:
+                    roles[key] = role
+                    _set_cached_role(key, role)
+
+        for key in keys:
+            candidate = roles[key]
+            if candidate is not None:
+                return candidate
+
+        logger.error("No default role found")
+        raise ValueError("No default role configured")
 
     async def update_last_login(self, user: User) -> None:
         """Update user's last login timestamp."""
@@ -151,6 +229,181 @@ class UserService:
         await self.db.flush()
 
 
+# =============================================================================
+# Authenticated User Cache
+# =============================================================================
+
+USER_CACHE_TTL_SECONDS = 10
+USER_CACHE_MAX_SIZE = 10_000
+
+
+@dataclass(frozen=True, slots=True)
+class _RoleSnapshot:
+    """Immutable column values of a role plus its enabled feature names."""
+
+    columns: Tuple[Tuple[str, Any], ...]
+    features: Tuple[str, ...]
+
+    @classmethod
+    def of(cls, role: Role) -> "_RoleSnapshot":
+        """Capture a role whose features are loaded or attached."""
+        return cls(
+            columns=tuple((key, getattr(role, key)) for key in _ROLE_COLUMNS),
+            features=tuple(role.get_enabled_features()),
+        )
+
+    def build(self) -> Role:
+        """Rebuild a detached Role, private to the caller."""
+        role = Role(**dict(self.columns))
+        role._enabled_feature_names = self.features
+        make_transient_to_detached(role)
+        return role
+
+
+@dataclass(frozen=True, slots=True)
+class _UserSnapshot:
+    """Immutable column values of a user plus a snapshot of its role."""
+
+    user: Tuple[Tuple[str, Any], ...]
+    role: _RoleSnapshot
+
+    @classmethod
+    def of(cls, user: User) -> "_UserSnapshot":
+        """Capture a loaded user and its role."""
+        return cls(
+            user=tuple((key, getattr(user, key)) for key in _USER_COLUMNS),
+            role=_RoleSnapshot.of(user.role),
+        )
+
+    def build(self) -> User:
+        """Rebuild a detached User with its role, private to the caller."""
+        user = User(**dict(self.user))
+        make_transient_to_detached(user)
+        set_committed_value(user, "role", self.role.build())
+        return user
+
+
+_USER_COLUMNS = tuple(attr.key for attr in inspect(User).column_attrs)
+_ROLE_COLUMNS = tuple(attr.key for attr in inspect(Role).column_attrs)
+
+# user_id -> (expires_at monotonic, snapshot of the user with role and features)
+_user_cache: Dict[str, Tuple[float, _UserSnapshot]] = {}
+
+# Session.info key holding cache invalidations to run once the transaction commits
+_PENDING_INVALIDATIONS_KEY = "pending_cache_invalidations"
+
+
+def invalidate_user_cache(user_id: Optional[str] = None) -> None:
+    """
+    Drop cached users after a user or role mutation.
+
+    Args:
+        user_id: User to drop, or None to clear every entry (role changes)
+    """
+    if user_id is None:
+        _user_cache.clear()
+    else:
+        _user_cache.pop(user_id, None)
+
+
+def invalidate_after_commit(db: AsyncSession, *invalidations: Callable[[], None]) -> None:
+    """
+    Run cache invalidations once the current transaction has committed.
+
+    Invalidating before the commit lets a concurrent request reload the old
+    rows and cache them again for a full TTL.
+
+    Args:
+        db: Session whose transaction makes the change
+        invalidations: Callables such as invalidate_role_cache
+    """
+    db.info.setdefault(_PENDING_INVALIDATIONS_KEY, []).extend(invalidations)
+
+
+async def get_cached_user(db: AsyncSession, user_id: str) -> Optional[User]:
+    """
+    Get a user by ID, reusing a recent lookup for the same user.
+
+    The cache holds an immutable snapshot and every hit gets its own
+    detached User, so requests never share ORM state. Invalidation is per
+    worker: other workers may serve a deactivated user for up to
+    USER_CACHE_TTL_SECONDS, and an old role or feature set for up to twice
+    that, since a snapshot can be taken from a feature list cached for
+    ROLE_FEATURES_CACHE_TTL_SECONDS.
+    """
+    now = time.monotonic()
+    cached = _user_cache.get(user_id)
+    if cached is not None and cached[0] > now:
+        return cached[1].build()
+
+    user = await UserService(db).get_user_by_id(user_id)
+    if user is not None:
+        if len(_user_cache) >= USER_CACHE_MAX_SIZE:
+            _user_cache.clear()
+        _user_cache[user_id] = (now + USER_CACHE_TTL_SECONDS, _UserSnapshot.of(user))
+    else:
+        _user_cache.pop(user_id, None)
+    return user
+
+
+# =============================================================================
+# Role Lookup Cache
+# =============================================================================
+
+ROLE_CACHE_TTL_SECONDS = 300
+
+# Feature lists gate every request, so they expire as fast as cached users;
+# a revoked feature must not outlive the user cache on workers that missed
+# the invalidation
+ROLE_FEATURES_CACHE_TTL_SECONDS = USER_CACHE_TTL_SECONDS
+
+# "default" | "name:<role name>" -> (expires_at monotonic, snapshot of the role)
+_role_cache: Dict[str, Tuple[float, _RoleSnapshot]] = {}
+
+# role_id -> (expires_at monotonic, enabled feature names)
+_role_features_cache: Dict[str, Tuple[float, Tuple[str, ...]]] = {}
+
+
+def invalidate_role_cache() -> None:
+    """Drop cached role lookups after a role is created, updated or deleted."""
+    _role_cache.clear()
+    _role_features_cache.clear()
+
+
+def _get_cached_role(key: str) -> Optional[Role]:
+    """
+    Get a live cached role.
+
+    Every hit gets its own detached Role with its enabled feature names
+    attached, so callers may merge it into their session.
+    """
+    cached = _role_cache.get(key)
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1].build()
+    return None
+
+
+def _set_cached_role(key: str, role: Optional[Role]) -> None:
+    """Cache a role lookup; misses are not cached."""
+    if role is not None:
+        _role_cache[key] = (time.monotonic() + ROLE_CACHE_TTL_SECONDS, _RoleSnapshot.of(role))
+    else:
+        _role_cache.pop(key, None)
+
+
+def _get_cached_role_features(role_id: str) -> Optional[Tuple[str, ...]]:
+    """Get the live cached enabled feature names for a role."""
+    cached = _role_features_cache.get(role_id)
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+    return None
+
+
+def _set_cached_role_features(role_id: str, features: Tuple[str, ...]) -> None:
+    """Cache the enabled feature names for a role."""
+    _role_features_cache[role_id] = (time.monotonic() + ROLE_FEATURES_CACHE_TTL_SECONDS, features)
+
+
 # =============================================================================
 # Token Service
 # =============================================================================
@@ -208,7 +461,7 @@ class TokenService:
         if not token_data:
             return None
 
-        return await self.user_service.get_user_by_id(token_data.sub)
+        return await get_cached_user(self.db, token_data.sub)
 
 
 # =============================================================================
@@ -217,7 +470,13 @@ class TokenService:
 
 
 class AuditService:
-    """Service for audit logging."""
+    """
+    Service for audit logging.
+
+    Entries are staged on the session and handed to the audit buffer only
+    when the request transaction commits, so they keep the transactional
+    semantics of a direct insert but are written in batches.
+    """
 
     def __init__(self, db: AsyncSession):
         self.db = db
@@ -232,7 +491,8 @@ class AuditService:
         ip_address: Optional[str] = None,
         user_agent: Optional[str] = None,
         correlation_id: Optional[str] = None,
-    ) -> AuditLog:
+        synchronous: bool = False,
+    ) -> None:
         """
         Create an audit log entry.
 
@@ -245,24 +505,26 @@ class AuditService:
             ip_address: Client IP address
             user_agent: Client user agent
             correlation_id: Request correlation ID
-
-        Returns:
-            Created AuditLog
+            synchronous: Insert the row in the current transaction instead of
+                the batched buffer, for entries that must not be lost
         """
-        audit_log = AuditLog(
-            user_id=user_id,
-            action=action.value,
-            resource=resource,
-            resource_id=resource_id,
-            details=details,
-            ip_address=ip_address,
-            user_agent=user_agent,
-            correlation_id=correlation_id,
-        )
-        self.db.add(audit_log)
-        await self.db.flush()
+        row = {
+            "user_id": user_id,
+            "action": action.value,
+            "resource": resource,
+            "resource_id": resource_id,
+            "details": details,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            "correlation_id": correlation_id,
+        }
+        if synchronous:
+            self.db.add(AuditLog(**row))
+        else:
+            self.db.info.setdefault(_PENDING_AUDIT_KEY, []).append(row)
 
-        logger.info(
+        # The audit row is the record; this line only helps when debugging
+        logger.debug(
             "Audit log created",
             action=action.value,
             user_id=user_id,
@@ -270,4 +532,187 @@ class AuditService:
             correlation_id=correlation_id,
         )
 
-        return audit_log
+
+# =============================================================================
+# Audit Log Buffer
+# =============================================================================
+
+# Session.info key holding audit rows staged by the current transaction
+_PENDING_AUDIT_KEY = "pending_audit_logs"
+
+# Queued after the last row to stop the writer once everything before it is written
+_STOP = object()
+
+AUDIT_FLUSH_RETRY_DELAY_SECONDS = 0.5
+
+
+class AuditLogBuffer:
+    """
+    Background writer that batches committed audit rows.
+
+    Rows are flushed with one bulk INSERT per batch, either when the batch
+    is full or when the flush interval elapses after the first row. Failed
+    batches are retried; rows that overflow the bounded queue are written
+    directly instead of waiting for the writer.
+    """
+
+    def __init__(
+        self,
+        max_batch_size: Optional[int] = None,
+        flush_interval_ms: Optional[int] = None,
+    ):
+        """
+        Initialize the buffer.
+
+        Args:
+            max_batch_size: Max rows per insert (defaults to settings)
+            flush_interval_ms: Max wait before flushing (defaults to settings)
+        """
+        self.max_batch_size = max_batch_size or settings.audit_batch_max_size
+        self.flush_interval = (flush_interval_ms or settings.audit_flush_interval_ms) / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        # Direct writes for rows that did not fit in the queue
+        self._overflow: Set[asyncio.Task] = set()
+
+    def put_many(self, rows: List[Dict[str, Any]]) -> None:
+        """Queue committed audit rows for writing."""
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=settings.audit_queue_max_size)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(self._queue))
+
+        for i, row in enumerate(rows):
+            try:
+                self._queue.put_nowait(row)
+            except asyncio.QueueFull:
+                # Called from a sync commit hook, so we can't wait for space
+                overflow = rows[i:]
+                logger.warning("Audit log queue full, writing directly", rows=len(overflow))
+                for start in range(0, len(overflow), self.max_batch_size):
+                    task = asyncio.create_task(
+                        self._flush(overflow[start : start + self.max_batch_size])
+                    )
+                    self._overflow.add(task)
+                    task.add_done_callback(self._overflow.discard)
+                break
+
+    async def _run(self, queue: asyncio.Queue) -> None:
+        """Collect rows from the queue and write them in batches until stopped."""
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            row = await queue.get()
+            if row is _STOP:
+                return
+            batch = [row]
+
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    row = await asyncio.wait_for(queue.get(), remaining)
+                except TimeoutError:
+                    break
+                if row is _STOP:
+                    stopping = True
+                    break
+                batch.append(row)
+
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[Dict[str, Any]]) -> None:
+        """Write one batch, retrying failures; errors are logged, never raised to callers."""
+        attempts = max(1, settings.audit_flush_max_attempts)
+        for attempt in range(attempts):
+            try:
+                async with get_db_context() as db:
+                    # Audit rows are best-effort; don't wait on the WAL flush
+                    await db.execute(text("SET LOCAL synchronous_commit = off"))
+                    await bulk_insert(db, AuditLog, batch)
+                return
+            except Exception as e:
+                if attempt + 1 == attempts:
+                    logger.error(
+                        "Failed to write audit logs, dropping batch",
+                        batch_size=len(batch),
+                        attempts=attempts,
+                        error=str(e),
+                    )
+                    return
+                logger.warning(
+                    "Failed to write audit logs, retrying",
+                    batch_size=len(batch),
+                    attempt=attempt + 1,
+                    error=str(e),
+                )
+                await asyncio.sleep(AUDIT_FLUSH_RETRY_DELAY_SECONDS * 2**attempt)
+
+    async def close(self) -> None:
+        """Stop the writer after it has written everything already queued."""
+        if self._queue is not None and self._task is not None and not self._task.done():
+            # The sentinel lands behind every queued row, so the writer drains them first
+            await self._queue.put(_STOP)
+            await self._task
+        self._task = None
+
+        # Rows queued after the writer stopped, e.g. by a commit during shutdown
+        if self._queue is not None:
+            remaining = []
+            while not self._queue.empty():
+                row = self._queue.get_nowait()
+                if row is not _STOP:
+                    remaining.append(row)
+            for start in range(0, len(remaining), self.max_batch_size):
+                await self._flush(remaining[start : start + self.max_batch_size])
+
+        if self._overflow:
+            await asyncio.gather(*self._overflow)
+
+
+_audit_buffer: Optional[AuditLogBuffer] = None
+
+
+def get_audit_buffer() -> AuditLogBuffer:
+    """Get or create the audit buffer singleton."""
+    global _audit_buffer
+    if _audit_buffer is None:
+        _audit_buffer = AuditLogBuffer()
+    return _audit_buffer
+
+
+async def close_audit_buffer() -> None:
+    """Flush and stop the audit buffer singleton if running."""
+    global _audit_buffer
+    if _audit_buffer is not None:
+        await _audit_buffer.close()
+        _audit_buffer = None
+
+
+@event.listens_for(Session, "after_commit")
+def _enqueue_committed_audit_logs(session: Session) -> None:
+    """Hand audit rows to the buffer once their transaction has committed."""
+    rows = session.info.pop(_PENDING_AUDIT_KEY, None)
+    if rows:
+        get_audit_buffer().put_many(rows)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_audit_logs(session: Session) -> None:
+    """Drop audit rows staged by a transaction that rolled back."""
+    session.info.pop(_PENDING_AUDIT_KEY, None)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_committed_invalidations(session: Session) -> None:
+    """Drop cache entries made stale by a transaction that has committed."""
+    for invalidate in session.info.pop(_PENDING_INVALIDATIONS_KEY, ()):
+        invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_invalidations(session: Session) -> None:
+    """Drop invalidations staged by a transaction that rolled back."""
+    session.info.pop(_PENDING_INVALIDATIONS_KEY, None)
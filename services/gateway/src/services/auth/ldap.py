@@ -4,9 +4,13 @@ TRJM Gateway - LDAP Authentication Service
 LDAP bind authentication with mock provider for development
 """
 
+import asyncio
+import hmac
+import re
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import Optional
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, TypeVar
 
 from ...core.config import settings
 from ...core.logging import logger
@@ -17,18 +21,14 @@ from ...core.logging import logger
 # =============================================================================
 
 
-@dataclass
+@dataclass(slots=True)
 class LDAPUser:
     """User data from LDAP authentication."""
 
     username: str
     email: Optional[str] = None
     display_name: Optional[str] = None
-    groups: list[str] = None
-
-    def __post_init__(self):
-        if self.groups is None:
-            self.groups = []
+    groups: list[str] = field(default_factory=list)
 
 
 # =============================================================================
@@ -66,6 +66,9 @@ class LDAPProvider(ABC):
         """
         pass
 
+    async def close(self) -> None:  # noqa: B027 - optional hook, most providers hold nothing
+        """Release provider resources (no-op by default)."""
+
 
 # =============================================================================
 # Mock LDAP Provider (Development)
@@ -80,7 +83,7 @@ class MockLDAPProvider(LDAPProvider):
     """
 
     # Predefined mock users
-    MOCK_USERS = {
+    MOCK_USERS: Dict[str, Dict[str, Any]] = {
         "admin": {
             "password": "admin123",
             "email": "admin@trjm.local",
@@ -105,18 +108,20 @@ class MockLDAPProvider(LDAPProvider):
         """Authenticate against mock user database."""
         logger.debug("Mock LDAP authentication attempt", username=username)
 
-        user_data = self.MOCK_USERS.get(username.lower())
+        username_lc = username.lower()
+        user_data = self.MOCK_USERS.get(username_lc)
         if user_data is None:
             logger.debug("Mock LDAP: user not found", username=username)
             return None
 
-        if user_data["password"] != password:
+        # Constant-time compare so response timing does not leak the password
+        if not hmac.compare_digest(user_data["password"].encode(), password.encode()):
             logger.debug("Mock LDAP: invalid password", username=username)
             return None
 
         logger.info("Mock LDAP: authentication successful", username=username)
         return LDAPUser(
-            username=username.lower(),
+            username=username_lc,
             email=user_data["email"],
             display_name=user_data["display_name"],
             groups=user_data["groups"],
@@ -124,18 +129,75 @@ class MockLDAPProvider(LDAPProvider):
 
     async def get_user_info(self, username: str) -> Optional[LDAPUser]:
         """Get user info from mock database."""
-        user_data = self.MOCK_USERS.get(username.lower())
+        username_lc = username.lower()
+        user_data = self.MOCK_USERS.get(username_lc)
         if user_data is None:
             return None
 
         return LDAPUser(
-            username=username.lower(),
+            username=username_lc,
             email=user_data["email"],
             display_name=user_data["display_name"],
             groups=user_data["groups"],
         )
 
 
+# =============================================================================
+# LDAP Connection Pool
+# =============================================================================
+
+_T = TypeVar("_T")
+
+
+class LDAPConnectionPool:
+    """
+    Bounded pool of reusable LDAP connections.
+
+    Connections are created on demand (up to `size`) and returned to the
+    pool after use, so the TCP and TLS handshakes are paid once per
+    connection instead of once per request. A connection whose operation
+    raised is discarded rather than reused.
+    """
+
+    def __init__(self, factory: Callable[[], Any], size: int):
+        """
+        Initialize the pool.
+
+        Args:
+            factory: Blocking callable that opens a new connection
+            size: Max connections open at once
+        """
+        self._factory = factory
+        self._semaphore = asyncio.Semaphore(size)
+        self._idle: List[Any] = []
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[Any]:
+        """Check out a connection, opening one if none is idle."""
+        async with self._semaphore:
+            conn = self._idle.pop() if self._idle else await asyncio.to_thread(self._factory)
+            try:
+                yield conn
+            except BaseException:
+                await asyncio.to_thread(_unbind_quietly, conn)
+                raise
+            self._idle.append(conn)
+
+    async def close(self) -> None:
+        """Unbind all idle connections."""
+        idle, self._idle = self._idle, []
+        for conn in idle:
+            await asyncio.to_thread(_unbind_quietly, conn)
+
+
+def _unbind_quietly(conn: Any) -> None:
+    """Unbind a connection; errors from an already-dead socket are only logged."""
+    try:
+        conn.unbind_s()
+    except Exception as e:
+        logger.debug("LDAP unbind failed", error=str(e))
+
+
 # =============================================================================
 # Real LDAP Provider
 # =============================================================================
@@ -145,9 +207,17 @@ class RealLDAPProvider(LDAPProvider):
     """
     Real LDAP provider using python-ldap.
 
-    Supports LDAPS and StartTLS with CA certificate validation.
+    Supports LDAPS and StartTLS with CA certificate validation. Connections
+    are pooled, and the blocking python-ldap calls run in worker threads so
+    they never stall the event loop.
     """
 
+    # Attributes read for every user lookup
+    USER_ATTRIBUTES = ["mail", "displayName", "cn", "memberOf"]
+
+    # CN of a group DN, matched on the raw attribute bytes
+    _GROUP_CN_RE = re.compile(rb"cn=([^,]+)", re.IGNORECASE)
+
     def __init__(self):
         """Initialize LDAP connection settings."""
         self.ldap_url = settings.ldap_url
@@ -156,8 +226,13 @@ class RealLDAPProvider(LDAPProvider):
         self.bind_password = settings.ldap_bind_password
         self.user_dn_template = settings.ldap_user_dn_template
         self.search_filter = settings.ldap_search_filter
+        # Templates split on the placeholder once; the escaped username is
+        # joined back in per call
+        self._user_dn_parts = (self.user_dn_template or "").split("{username}")
+        self._search_filter_parts = (self.search_filter or "").split("{username}")
         self.use_starttls = settings.ldap_starttls
         self.ca_cert_path = settings.ldap_ca_cert_path
+        self._pool = LDAPConnectionPool(self._get_connection, settings.ldap_pool_size)
 
     def _get_connection(self):
         """Create and configure LDAP connection."""
@@ -189,6 +264,24 @@ class RealLDAPProvider(LDAPProvider):
             logger.error("Failed to create LDAP connection", error=str(e))
             raise
 
+    async def _run(self, operation: Callable[[Any], _T]) -> _T:
+        """
+        Run a blocking operation on a pooled connection in a worker thread.
+
+        Retried once on SERVER_DOWN, which is how an idle connection the
+        server has since dropped shows up.
+        """
+        import ldap
+
+        try:
+            async with self._pool.acquire() as conn:
+                return await asyncio.to_thread(operation, conn)
+        except ldap.SERVER_DOWN:
+            logger.debug("LDAP connection lost, retrying with a new one")
+
+        async with self._pool.acquire() as conn:
+            return await asyncio.to_thread(operation, conn)
+
     async def authenticate(self, username: str, password: str) -> Optional[LDAPUser]:
         """
         Authenticate user using LDAP bind.
@@ -196,69 +289,36 @@ class RealLDAPProvider(LDAPProvider):
         Uses simple bind with the user's DN constructed from the template.
         """
         try:
-            import ldap
+            return await self._run(lambda conn: self._authenticate_sync(conn, username, password))
+        except Exception as e:
+            logger.error("LDAP authentication error", username=username, error=str(e))
+            return None
 
-            conn = self._get_connection()
+    def _authenticate_sync(self, conn: Any, username: str, password: str) -> Optional[LDAPUser]:
+        """Bind as the user and read their attributes (blocking)."""
+        import ldap
+        from ldap.dn import escape_dn_chars
 
-            # Construct user DN
-            user_dn = self.user_dn_template.format(username=username)
+        # Construct user DN, escaping DN metacharacters (RFC 4514)
+        user_dn = escape_dn_chars(username).join(self._user_dn_parts)
 
-            # Attempt bind with user credentials
-            try:
-                conn.simple_bind_s(user_dn, password)
-                logger.info("LDAP authentication successful", username=username)
-            except ldap.INVALID_CREDENTIALS:
-                logger.debug("LDAP: invalid credentials", username=username)
-                return None
-            except ldap.NO_SUCH_OBJECT:
-                logger.debug("LDAP: user not found", username=username)
-                return None
-
-            # Search for user attributes
-            search_filter = self.search_filter.format(username=username)
-            result = conn.search_s(
-                self.base_dn,
-                ldap.SCOPE_SUBTREE,
-                search_filter,
-                ["mail", "displayName", "cn", "memberOf"],
-            )
+        # Attempt bind with user credentials
+        try:
+            conn.simple_bind_s(user_dn, password)
+            logger.info("LDAP authentication successful", username=username)
+        except ldap.INVALID_CREDENTIALS:
+            logger.debug("LDAP: invalid credentials", username=username)
+            return None
+        except ldap.NO_SUCH_OBJECT:
+            logger.debug("LDAP: user not found", username=username)
+            return None
 
-            if not result:
-                return LDAPUser(username=username)
-
-            dn, attrs = result[0]
-
-            # Extract user info
-            email = None
-            if "mail" in attrs:
-                email = attrs["mail"][0].decode("utf-8")
-
-            display_name = None
-            if "displayName" in attrs:
-                display_name = attrs["displayName"][0].decode("utf-8")
-            elif "cn" in attrs:
-                display_name = attrs["cn"][0].decode("utf-8")
-
-            groups = []
-            if "memberOf" in attrs:
-                for group_dn in attrs["memberOf"]:
-                    # Extract CN from group DN
-                    group_cn = group_dn.decode("utf-8").split(",")[0]
-                    if group_cn.startswith("CN=") or group_cn.startswith("cn="):
-                        groups.append(group_cn[3:])
-
-            conn.unbind_s()
-
-            return LDAPUser(
-                username=username,
-                email=email,
-                display_name=display_name,
-                groups=groups,
-            )
+        # Search for user attributes
+        attrs = self._search_user(conn, username)
+        if attrs is None:
+            return LDAPUser(username=username)
 
-        except Exception as e:
-            logger.error("LDAP authentication error", username=username, error=str(e))
-            return None
+        return self._build_user(username, attrs)
 
     async def get_user_info(self, username: str) -> Optional[LDAPUser]:
         """
@@ -267,51 +327,87 @@ class RealLDAPProvider(LDAPProvider):
         Uses bind DN and password to search for user.
         """
         try:
-            import ldap
+            return await self._run(lambda conn: self._get_user_info_sync(conn, username))
+        except Exception as e:
+            logger.error("LDAP user info lookup error", username=username, error=str(e))
+            return None
 
-            conn = self._get_connection()
+    def _get_user_info_sync(self, conn: Any, username: str) -> Optional[LDAPUser]:
+        """Search for a user with the service account (blocking)."""
+        # Pooled connections may still be bound as the last user; rebind as
+        # the service account, or anonymously if none is configured
+        if self.bind_dn and self.bind_password:
+            conn.simple_bind_s(self.bind_dn, self.bind_password)
+        else:
+            conn.simple_bind_s("", "")
+
+        # Search for user
+        attrs = self._search_user(conn, username)
+        if attrs is None:
+            return None
+
+        return self._build_user(username, attrs)
+
+    def _search_user(self, conn: Any, username: str) -> Optional[dict]:
+        """
+        Get the attributes of the entry matching the user filter (blocking).
 
-            # Bind with service account if configured
-            if self.bind_dn and self.bind_password:
-                conn.simple_bind_s(self.bind_dn, self.bind_password)
+        The search asks the server to stop after one entry. If the filter is
+        ambiguous the server refuses with SIZELIMIT_EXCEEDED, and a full
+        search is used so the first entry still wins as before.
+        """
+        import ldap
+        from ldap.filter import escape_filter_chars
 
-            # Search for user
-            search_filter = self.search_filter.format(username=username)
+        # Escape filter metacharacters (RFC 4515) so usernames can't widen the search
+        search_filter = escape_filter_chars(username).join(self._search_filter_parts)
+        try:
+            result = conn.search_ext_s(
+                self.base_dn,
+                ldap.SCOPE_SUBTREE,
+                search_filter,
+                self.USER_ATTRIBUTES,
+                sizelimit=1,
+            )
+        except ldap.SIZELIMIT_EXCEEDED:
             result = conn.search_s(
                 self.base_dn,
                 ldap.SCOPE_SUBTREE,
                 search_filter,
-                ["mail", "displayName", "cn", "memberOf"],
+                self.USER_ATTRIBUTES,
             )
 
-            if not result:
-                return None
-
-            dn, attrs = result[0]
+        if not result:
+            return None
 
-            email = attrs.get("mail", [b""])[0].decode("utf-8") or None
-            display_name = (
-                attrs.get("displayName", attrs.get("cn", [b""]))[0].decode("utf-8") or None
-            )
+        # Each result is a (dn, attrs) pair
+        attrs: dict = result[0][1]
+        return attrs
 
-            groups = []
-            for group_dn in attrs.get("memberOf", []):
-                group_cn = group_dn.decode("utf-8").split(",")[0]
-                if group_cn.startswith("CN=") or group_cn.startswith("cn="):
-                    groups.append(group_cn[3:])
+    @classmethod
+    def _build_user(cls, username: str, attrs: dict) -> LDAPUser:
+        """Build an LDAPUser from search result attributes."""
+        email = attrs.get("mail", [b""])[0].decode("utf-8") or None
+        display_name = attrs.get("displayName", attrs.get("cn", [b""]))[0].decode("utf-8") or None
 
-            conn.unbind_s()
+        # Only the CN of each group DN is decoded
+        match_cn = cls._GROUP_CN_RE.match
+        groups = [
+            m.group(1).decode("utf-8")
+            for group_dn in attrs.get("memberOf", ())
+            if (m := match_cn(group_dn))
+        ]
 
-            return LDAPUser(
-                username=username,
-                email=email,
-                display_name=display_name,
-                groups=groups,
-            )
+        return LDAPUser(
+            username=username,
+            email=email,
+            display_name=display_name,
+            groups=groups,
+        )
 
-        except Exception as e:
-            logger.error("LDAP user info lookup error", username=username, error=str(e))
-            return None
+    async def close(self) -> None:
+        """Close pooled connections."""
+        await self._pool.close()
 
 
 # =============================================================================
@@ -344,3 +440,11 @@ def get_ldap_service() -> LDAPProvider:
     if _ldap_provider is None:
         _ldap_provider = get_ldap_provider()
     return _ldap_provider
+
+
+async def close_ldap_service() -> None:
+    """Close the LDAP provider singleton if created."""
+    global _ldap_provider
+    if _ldap_provider is not None:
+        await _ldap_provider.close()
+        _ldap_provider = None
@@ -4,6 +4,7 @@ TRJM Gateway - DOCX File Parser
 Parser for Microsoft Word documents
 """
 
+import asyncio
 import io
 from typing import List
 
@@ -25,22 +26,34 @@ class DocxParser(FileParser):
         """
         Parse DOCX file.
 
-        Extracts paragraphs while preserving structure hints.
+        Extracts paragraphs while preserving structure hints. The XML parsing
+        is synchronous, so it runs in a worker thread to keep the event loop free.
         """
+        return await asyncio.to_thread(self._parse_sync, content, filename)
+
+    def _parse_sync(self, content: bytes, filename: str) -> ParsedDocument:
+        """Blocking body of parse()."""
         doc = Document(io.BytesIO(content))
 
         paragraphs = []
-        full_text_parts = []
+        paragraph_count = 0
 
+        # doc.paragraphs and doc.tables build fresh proxy lists on every access,
+        # so walk the body once and count as we go
         for i, para in enumerate(doc.paragraphs):
+            paragraph_count += 1
             text = para.text.strip()
             if text:
                 # Capture paragraph style for later reconstruction
                 style_name = para.style.name if para.style else "Normal"
 
-                # Check for formatting
-                has_bold = any(run.bold for run in para.runs)
-                has_italic = any(run.italic for run in para.runs)
+                # Check for formatting in one pass over the runs
+                has_bold = has_italic = False
+                for run in para.runs:
+                    has_bold = has_bold or bool(run.bold)
+                    has_italic = has_italic or bool(run.italic)
+                    if has_bold and has_italic:
+                        break
 
                 paragraphs.append(
                     Paragraph(
@@ -54,7 +67,8 @@ class DocxParser(FileParser):
                         },
                     )
                 )
-                full_text_parts.append(text)
+
+        table_count = len(doc.tables)
 
         # Extract document metadata
         core_props = doc.core_properties
@@ -63,8 +77,8 @@ class DocxParser(FileParser):
             "author": core_props.author,
             "created": str(core_props.created) if core_props.created else None,
             "modified": str(core_props.modified) if core_props.modified else None,
-            "paragraph_count": len(doc.paragraphs),
-            "table_count": len(doc.tables),
+            "paragraph_count": paragraph_count,
+            "table_count": table_count,
             "section_count": len(doc.sections),
         }
 
@@ -75,15 +89,14 @@ class DocxParser(FileParser):
             "DOCX parsed",
             filename=filename,
             paragraphs=len(paragraphs),
-            tables=len(doc.tables),
+            tables=table_count,
         )
 
         return ParsedDocument(
-            content="\n\n".join(full_text_parts),
             paragraphs=paragraphs,
             metadata=metadata,
             format_hints={
-                "has_tables": len(doc.tables) > 0,
+                "has_tables": table_count > 0,
                 "has_images": False,  # Not checking for images currently
             },
             file_type="docx",
@@ -101,6 +114,14 @@ class DocxParser(FileParser):
 
         Creates a new document preserving basic structure.
         """
+        return await asyncio.to_thread(self._generate_sync, original, translated_paragraphs)
+
+    def _generate_sync(
+        self,
+        original: ParsedDocument,
+        translated_paragraphs: List[Paragraph],
+    ) -> bytes:
+        """Blocking body of generate()."""
         doc = Document()
 
         # Set document properties
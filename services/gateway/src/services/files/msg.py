@@ -4,6 +4,7 @@ TRJM Gateway - MSG File Parser
 Parser for Microsoft Outlook email files
 """
 
+import asyncio
 import io
 from dataclasses import dataclass
 from typing import List, Optional
@@ -14,7 +15,7 @@ from ...core.logging import logger
 from .parser import FileParser, Paragraph, ParsedDocument, ParserRegistry
 
 
-@dataclass
+@dataclass(slots=True)
 class EmailContent:
     """Structured email content."""
 
@@ -43,90 +44,73 @@ class MsgParser(FileParser):
         """
         Parse MSG file.
 
-        Extracts subject, headers, and body.
+        Extracts subject, headers, and body. OLE parsing is synchronous,
+        so it runs in a worker thread to keep the event loop free.
         """
-        # Parse MSG file
-        msg = extract_msg.Message(io.BytesIO(content))
+        return await asyncio.to_thread(self._parse_sync, content, filename)
 
+    def _parse_sync(self, content: bytes, filename: str) -> ParsedDocument:
+        """Blocking body of parse()."""
+        # Parse MSG file. Every field is read up front so the OLE streams
+        # are read in one go and the message is closed before any other work
+        msg = extract_msg.Message(io.BytesIO(content))
         try:
-            # Extract email data
             subject = msg.subject or ""
             sender = msg.sender or ""
             recipients = msg.to or ""
             date = msg.date or ""
             body = msg.body or ""
 
-            # Get attachment info (names only, not content)
+            # Attachment names only, not content
             attachment_names = [att.longFilename or att.shortFilename for att in msg.attachments]
-            has_attachments = len(attachment_names) > 0
-
-            # Build paragraphs for translation
-            paragraphs = []
-            para_index = 0
-
-            # Subject as first paragraph
-            if subject:
-                paragraphs.append(
-                    Paragraph(
-                        text=subject,
-                        index=para_index,
-                        metadata={"type": "subject"},
-                    )
-                )
-                para_index += 1
-
-            # Body paragraphs
-            if body:
-                body_paras = body.split("\n\n")
-                for para_text in body_paras:
-                    stripped = para_text.strip()
-                    if stripped:
-                        paragraphs.append(
-                            Paragraph(
-                                text=stripped,
-                                index=para_index,
-                                metadata={"type": "body"},
-                            )
-                        )
-                        para_index += 1
-
-            # Build full content for translation
-            full_content = f"Subject: {subject}\n\n{body}"
-
-            metadata = {
-                "subject": subject,
-                "sender": sender,
-                "recipients": recipients,
-                "date": date,
-                "has_attachments": has_attachments,
-                "attachment_names": attachment_names,
-                "attachment_count": len(attachment_names),
-            }
-
-            logger.debug(
-                "MSG parsed",
-                filename=filename,
-                subject=subject[:50] if subject else None,
-                body_length=len(body),
-                attachments=len(attachment_names),
-            )
-
-            return ParsedDocument(
-                content=full_content,
-                paragraphs=paragraphs,
-                metadata=metadata,
-                format_hints={
-                    "is_email": True,
-                    "has_attachments": has_attachments,
-                },
-                file_type="msg",
-                file_name=filename,
-                file_size=len(content),
-            )
-
         finally:
             msg.close()
 
+        has_attachments = len(attachment_names) > 0
+
+        # Build paragraphs for translation, subject first
+        paragraphs = []
+        if subject:
+            paragraphs.append(Paragraph(text=subject, index=0, metadata={"type": "subject"}))
+
+        # Body paragraphs
+        body_texts = filter(None, (part.strip() for part in body.split("\n\n")))
+        paragraphs.extend(
+            Paragraph(text=text, index=i, metadata={"type": "body"})
+            for i, text in enumerate(body_texts, start=len(paragraphs))
+        )
+        body_length = len(body)
+
+        metadata = {
+            "subject": subject,
+            "sender": sender,
+            "recipients": recipients,
+            "date": date,
+            "has_attachments": has_attachments,
+            "attachment_names": attachment_names,
+            "attachment_count": len(attachment_names),
+        }
+
+        logger.debug(
+            "MSG parsed",
+            filename=filename,
+            subject=subject[:50] if subject else None,
+            body_length=body_length,
+            attachments=len(attachment_names),
+        )
+
+        return ParsedDocument(
+            paragraphs=paragraphs,
+            metadata=metadata,
+            format_hints={
+                "is_email": True,
+                "has_attachments": has_attachments,
+            },
+            file_type="msg",
+            file_name=filename,
+            file_size=len(content),
+        )
+
     async def generate(
         self,
         original: ParsedDocument,
@@ -138,6 +122,14 @@ class MsgParser(FileParser):
         Since we can't create MSG files easily, we output a DOCX summary
         with the translated email content.
         """
+        return await asyncio.to_thread(self._generate_sync, original, translated_paragraphs)
+
+    def _generate_sync(
+        self,
+        original: ParsedDocument,
+        translated_paragraphs: List[Paragraph],
+    ) -> bytes:
+        """Blocking body of generate()."""
         from docx import Document
 
         doc = Document()
@@ -5,10 +5,12 @@ Base class and utilities for file parsing
 """
 
 import hashlib
+import importlib
 import io
 import mimetypes
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -21,7 +23,7 @@ from ...core.logging import logger
 # =============================================================================
 
 
-@dataclass
+@dataclass(slots=True)
 class Paragraph:
     """Represents a paragraph or text segment."""
 
@@ -30,20 +32,32 @@ class Paragraph:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class ParsedDocument:
-    """Result of parsing a document."""
+    """
+    Result of parsing a document.
+
+    The full text is not stored separately; `content` is joined from the
+    paragraphs on first access.
+    """
 
-    content: str
     paragraphs: List[Paragraph]
     metadata: Dict[str, Any]
     format_hints: Dict[str, Any]
     file_type: str
     file_name: str
     file_size: int
+    _content: Optional[str] = field(default=None, init=False, repr=False)
+
+    @property
+    def content(self) -> str:
+        """Full document text, paragraphs separated by blank lines."""
+        if self._content is None:
+            self._content = "\n\n".join(p.text for p in self.paragraphs)
+        return self._content
 
 
-@dataclass
+@dataclass(slots=True)
 class TranslatedDocument:
     """Result of translating a document."""
 
@@ -73,10 +87,21 @@ MAGIC_BYTES = {
     ".msg": [b"\xd0\xcf\x11\xe0"],  # OLE compound document
 }
 
+# Bytes of a file's header that validate_magic_bytes needs to see
+MAGIC_HEADER_SIZE = 16
+
 
+# Pure, and called by every validator and the parser lookup for the same upload
+@lru_cache(maxsize=1024)
 def get_file_extension(filename: str) -> str:
     """Get file extension in lowercase."""
-    return Path(filename).suffix.lower()
+    # Same rule as Path.suffix, without building a path object per call
+    name = filename.rstrip("/")
+    name = name[name.rfind("/") + 1 :]
+    idx = name.rfind(".")
+    if 0 < idx < len(name) - 1:
+        return name[idx:].lower()
+    return ""
 
 
 def validate_file_extension(filename: str) -> Tuple[bool, str]:
@@ -103,7 +128,12 @@ def validate_mime_type(filename: str, content_type: Optional[str]) -> bool:
 
 
 def validate_magic_bytes(filename: str, content: bytes) -> bool:
-    """Validate file content matches expected magic bytes."""
+    """
+    Validate file content matches expected magic bytes.
+
+    Only the start of the content is inspected, so the first
+    MAGIC_HEADER_SIZE bytes of a file are enough.
+    """
     ext = get_file_extension(filename)
     expected_magic = MAGIC_BYTES.get(ext)
 
@@ -188,6 +218,8 @@ class ParserRegistry:
     """Registry for file parsers."""
 
     _parsers: Dict[str, FileParser] = {}
+    # extension -> parser module (relative to this package), imported on first lookup
+    _lazy_modules: Dict[str, str] = {}
 
     @classmethod
     def register(cls, parser: FileParser) -> None:
@@ -195,13 +227,35 @@ class ParserRegistry:
         cls._parsers[parser.supported_extension] = parser
         logger.debug(f"Registered parser for {parser.supported_extension}")
 
+    @classmethod
+    def register_lazy(cls, extension: str, module: str) -> None:
+        """
+        Register a parser module to import when its extension is first requested.
+
+        The module registers its parser on import, so document libraries are
+        only loaded once a file of that type is actually uploaded.
+        """
+        cls._lazy_modules[extension] = module
+
     @classmethod
     def get_parser(cls, filename: str) -> Optional[FileParser]:
         """Get parser for a file."""
         ext = get_file_extension(filename)
-        return cls._parsers.get(ext)
+        parser = cls._parsers.get(ext)
+        if parser is None and ext in cls._lazy_modules:
+            importlib.import_module(cls._lazy_modules[ext], __package__)
+            del cls._lazy_modules[ext]
+            parser = cls._parsers.get(ext)
+        return parser
 
     @classmethod
     def supported_extensions(cls) -> List[str]:
         """Get list of supported extensions."""
-        return list(cls._parsers.keys())
+        return list(dict.fromkeys([*cls._parsers, *cls._lazy_modules]))
+
+
+# Built-in parsers, imported on first use
+ParserRegistry.register_lazy(".txt", ".txt")
+ParserRegistry.register_lazy(".docx", ".docx")
+ParserRegistry.register_lazy(".pdf", ".pdf")
+ParserRegistry.register_lazy(".msg", ".msg")
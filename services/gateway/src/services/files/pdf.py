@@ -4,15 +4,17 @@ TRJM Gateway - PDF File Parser
 Parser for PDF documents (text-based only)
 """
 
+import asyncio
 import io
+from html import escape
 from typing import List
 
-from PyPDF2 import PdfReader
+import fitz  # PyMuPDF
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.platypus import Paragraph as RLParagraph, SimpleDocTemplate, Spacer
+from reportlab.platypus import Paragraph as RLParagraph, SimpleDocTemplate
 
 from ...core.config import settings
 from ...core.logging import logger
@@ -35,81 +37,88 @@ class PdfParser(FileParser):
         """
         Parse PDF file.
 
-        Extracts text from each page.
+        Extracts text from each page. MuPDF parsing is synchronous, so it
+        runs in a worker thread to keep the event loop free.
         """
-        reader = PdfReader(io.BytesIO(content))
-
-        paragraphs = []
-        full_text_parts = []
-        para_index = 0
-
-        for page_num, page in enumerate(reader.pages):
-            try:
-                text = page.extract_text()
-            except Exception as e:
-                logger.warning(f"Failed to extract text from page {page_num}: {e}")
-                text = ""
-
-            if text:
-                # Split page into paragraphs
-                page_paras = text.split("\n\n")
-                for para_text in page_paras:
-                    stripped = para_text.strip()
-                    if stripped:
-                        paragraphs.append(
-                            Paragraph(
-                                text=stripped,
-                                index=para_index,
-                                metadata={
-                                    "page": page_num + 1,
-                                },
+        return await asyncio.to_thread(self._parse_sync, content, filename)
+
+    def _parse_sync(self, content: bytes, filename: str) -> ParsedDocument:
+        """Blocking body of parse()."""
+        doc = fitz.open(stream=content, filetype="pdf")
+
+        try:
+            paragraphs = []
+            para_index = 0
+
+            for page_num, page in enumerate(doc):
+                try:
+                    text = page.get_text("text")
+                except Exception as e:
+                    logger.warning(f"Failed to extract text from page {page_num}: {e}")
+                    text = ""
+
+                if text:
+                    # Split page into paragraphs
+                    page_paras = text.split("\n\n")
+                    for para_text in page_paras:
+                        stripped = para_text.strip()
+                        if stripped:
+                            paragraphs.append(
+                                Paragraph(
+                                    text=stripped,
+                                    index=para_index,
+                                    metadata={
+                                        "page": page_num + 1,
+                                    },
+                                )
                             )
-                        )
-                        full_text_parts.append(stripped)
-                        para_index += 1
-
-        # Check if we got any text
-        if not paragraphs:
-            logger.warning(
-                "No text extracted from PDF",
-                filename=filename,
-                pages=len(reader.pages),
-            )
-            # Check if OCR might help
-            if settings.ocr_enabled:
-                # OCR stub - not implemented
-                logger.info("OCR is enabled but not implemented")
-
-        metadata = {
-            "page_count": len(reader.pages),
-            "has_text": len(paragraphs) > 0,
-            "encrypted": reader.is_encrypted,
-        }
-
-        # Extract PDF metadata if available
-        if reader.metadata:
-            metadata.update(
-                {
-                    "title": reader.metadata.get("/Title"),
-                    "author": reader.metadata.get("/Author"),
-                    "creator": reader.metadata.get("/Creator"),
-                }
-            )
+                            para_index += 1
+
+            page_count = doc.page_count
+
+            # Check if we got any text
+            if not paragraphs:
+                logger.warning(
+                    "No text extracted from PDF",
+                    filename=filename,
+                    pages=page_count,
+                )
+                # Check if OCR might help
+                if settings.ocr_enabled:
+                    # OCR stub - not implemented
+                    logger.info("OCR is enabled but not implemented")
+
+            metadata = {
+                "page_count": page_count,
+                "has_text": len(paragraphs) > 0,
+                "encrypted": doc.is_encrypted,
+            }
+
+            # Extract PDF metadata if available (PyMuPDF reports missing keys as "")
+            if doc.metadata:
+                metadata.update(
+                    {
+                        "title": doc.metadata.get("title") or None,
+                        "author": doc.metadata.get("author") or None,
+                        "creator": doc.metadata.get("creator") or None,
+                    }
+                )
+        finally:
+            doc.close()
 
         logger.debug(
             "PDF parsed",
             filename=filename,
-            pages=len(reader.pages),
+            pages=page_count,
             paragraphs=len(paragraphs),
         )
 
         return ParsedDocument(
-            content="\n\n".join(full_text_parts),
             paragraphs=paragraphs,
             metadata=metadata,
             format_hints={
                 "is_text_based": len(paragraphs) > 0,
-                "may_need_ocr": len(paragraphs) == 0 and len(reader.pages) > 0,
+                "may_need_ocr": len(paragraphs) == 0 and page_count > 0,
             },
             file_type="pdf",
             file_name=filename,
@@ -127,6 +136,14 @@ class PdfParser(FileParser):
         Creates a simple PDF with the translated text.
         Note: This does not preserve the original layout.
         """
+        return await asyncio.to_thread(self._generate_sync, original, translated_paragraphs)
+
+    def _generate_sync(
+        self,
+        original: ParsedDocument,
+        translated_paragraphs: List[Paragraph],
+    ) -> bytes:
+        """Blocking body of generate()."""
         output = io.BytesIO()
 
         # Create document
@@ -142,7 +159,8 @@ class PdfParser(FileParser):
         # Set up styles
         styles = getSampleStyleSheet()
 
-        # Create RTL-friendly style for Arabic
+        # Create RTL-friendly style for Arabic; spacing between paragraphs
+        # comes from the style rather than a Spacer flowable per paragraph
         rtl_style = ParagraphStyle(
             "RTL",
             parent=styles["Normal"],
@@ -150,36 +168,31 @@ class PdfParser(FileParser):
             leading=18,
             alignment=2,  # Right align for RTL
             wordWrap="RTL",
+            spaceAfter=12,
         )
 
-        # Build content
-        story = []
-
         # Add title
         title = original.metadata.get("title") or original.file_name
         title_style = ParagraphStyle(
             "Title",
             parent=styles["Heading1"],
             fontSize=16,
-            spaceAfter=20,
+            spaceAfter=40,
         )
-        story.append(RLParagraph(f"Translation: {title}", title_style))
-        story.append(Spacer(1, 20))
+        story = [RLParagraph(f"Translation: {escape(title, quote=False)}", title_style)]
 
-        # Add translated paragraphs
-        for para in translated_paragraphs:
-            # Use RTL style for Arabic content
-            text = para.text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-            story.append(RLParagraph(text, rtl_style))
-            story.append(Spacer(1, 12))
+        # Add translated paragraphs (escaped for ReportLab's markup parser)
+        story.extend(
+            RLParagraph(escape(para.text, quote=False), rtl_style) for para in translated_paragraphs
+        )
 
         # Add footer
-        story.append(Spacer(1, 30))
         footer_style = ParagraphStyle(
             "Footer",
             parent=styles["Italic"],
             fontSize=9,
             textColor="gray",
+            spaceBefore=30,
         )
         story.append(
             RLParagraph(
@@ -4,11 +4,17 @@ TRJM Gateway - TXT File Parser
 Parser for plain text files
 """
 
+import codecs
+from typing import List, Tuple
+
 import chardet
 
 from ...core.logging import logger
 from .parser import FileParser, Paragraph, ParsedDocument, ParserRegistry
 
+# Bytes of a file chardet samples before considering the whole file
+DETECT_SAMPLE_SIZE = 64 * 1024
+
 
 class TxtParser(FileParser):
     """Parser for .txt files."""
@@ -24,9 +30,7 @@ class TxtParser(FileParser):
         Handles encoding detection and paragraph splitting.
         """
         # Detect encoding
-        detection = chardet.detect(content)
-        encoding = detection.get("encoding", "utf-8") or "utf-8"
-        confidence = detection.get("confidence", 0)
+        encoding, confidence = self._detect_encoding(content)
 
         logger.debug(
             "TXT encoding detected",
@@ -43,11 +47,9 @@ class TxtParser(FileParser):
             text = content.decode("utf-8", errors="replace")
             encoding = "utf-8"
 
-        # Split into paragraphs (double newline or single newline)
-        raw_paragraphs = text.split("\n\n")
-        if len(raw_paragraphs) == 1:
-            # Try single newline if no double newlines
-            raw_paragraphs = text.split("\n")
+        # Split into paragraphs on double newlines, or on single newlines if
+        # there are none; choosing up front avoids splitting the text twice
+        raw_paragraphs = text.split("\n\n" if "\n\n" in text else "\n")
 
         paragraphs = []
         for i, para_text in enumerate(raw_paragraphs):
@@ -62,7 +64,6 @@ class TxtParser(FileParser):
                 )
 
         return ParsedDocument(
-            content=text,
             paragraphs=paragraphs,
             metadata={
                 "encoding": encoding,
@@ -77,6 +78,32 @@ class TxtParser(FileParser):
             file_size=len(content),
         )
 
+    @staticmethod
+    def _detect_encoding(content: bytes) -> Tuple[str, float]:
+        """
+        Detect the text encoding.
+
+        A UTF-8 BOM or ASCII-only content short-circuits detection. Otherwise
+        chardet looks at the first DETECT_SAMPLE_SIZE bytes, and only falls
+        back to the whole file when the sample is inconclusive.
+
+        Returns:
+            Tuple of (encoding, confidence)
+        """
+        if content.startswith(codecs.BOM_UTF8):
+            return "utf-8-sig", 1.0
+
+        # Same answer chardet gives for pure ASCII, from a single C-level scan
+        if content.isascii():
+            return "ascii", 1.0
+
+        detection = chardet.detect(content[:DETECT_SAMPLE_SIZE])
+        if len(content) > DETECT_SAMPLE_SIZE and (detection.get("confidence") or 0) < 0.5:
+            detection = chardet.detect(content)
+
+        encoding = detection.get("encoding", "utf-8") or "utf-8"
+        return encoding, detection.get("confidence", 0)
+
     async def generate(
         self,
         original: ParsedDocument,
@@ -88,14 +115,26 @@ class TxtParser(FileParser):
         Preserves paragraph structure.
         """
         separator = original.format_hints.get("paragraph_separator", "\n\n")
-        text = separator.join(p.text for p in translated_paragraphs)
 
-        # Use original encoding if detected, otherwise UTF-8
+        # Use original encoding if detected, otherwise UTF-8. Paragraphs are
+        # encoded one by one so the whole text never exists as a joined str.
         encoding = original.metadata.get("encoding", "utf-8")
         try:
-            return text.encode(encoding)
+            return self._encode_paragraphs(translated_paragraphs, separator, encoding)
         except (UnicodeEncodeError, LookupError):
-            return text.encode("utf-8")
+            return self._encode_paragraphs(translated_paragraphs, separator, "utf-8")
+
+    @staticmethod
+    def _encode_paragraphs(paragraphs: List[Paragraph], separator: str, encoding: str) -> bytes:
+        """Encode separator-joined paragraphs (one encoder, so a BOM is written once)."""
+        encode = codecs.getincrementalencoder(encoding)().encode
+        parts = []
+        for i, para in enumerate(paragraphs):
+            if i:
+                parts.append(encode(separator))
+            parts.append(encode(para.text))
+        parts.append(encode("", final=True))
+        return b"".join(parts)
 
 
 # Register parser
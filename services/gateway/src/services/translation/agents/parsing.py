@@ -0,0 +1,199 @@
+"""
+TRJM Gateway - Agent Response Parsing
+======================================
+Helpers for decoding structured LLM responses
+"""
+
+import asyncio
+import re
+from typing import Any, List, Optional, Tuple, Type, TypeVar
+
+import orjson
+from pydantic import BaseModel, ValidationError, ValidatorFunctionWrapHandler
+
+from ....core.config import settings
+from ....core.logging import logger
+from ....llm.provider import (
+    CompletionResponse,
+    LLMProvider,
+    Message,
+    ResponseFormat,
+    ResponseFormatType,
+)
+
+# Markdown code fence some models wrap JSON in despite response_format
+_CODE_FENCE_RE = re.compile(r"^\s*```[a-zA-Z]*[ \t]*\n?(.*?)\n?[ \t]*```\s*$", re.DOTALL)
+
+JSONDecodeError = orjson.JSONDecodeError
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# Backoff between calls whose response could not be parsed: 0.5s, 1s, 2s, ...
+PARSE_RETRY_BASE_DELAY_SECONDS = 0.5
+
+# Smallest output budget requested from the LLM
+MIN_OUTPUT_TOKENS = 512
+
+# Largest budget a retry after a truncated response grows to
+MAX_RETRY_OUTPUT_TOKENS = 16384
+
+
+def loads_json(content: str) -> Any:
+    """
+    Parse a JSON response from an LLM.
+
+    Args:
+        content: Raw response content, optionally wrapped in a ```json fence
+
+    Returns:
+        Decoded JSON value
+
+    Raises:
+        JSONDecodeError: If the content is not valid JSON
+    """
+    try:
+        return orjson.loads(content)
+    except orjson.JSONDecodeError:
+        match = _CODE_FENCE_RE.match(content)
+        if match is None:
+            raise
+        return orjson.loads(match.group(1))
+
+
+def estimate_output_tokens(text_length: int, overhead: int, ratio: float, cap: int) -> int:
+    """
+    Output token budget for a response to about `text_length` characters of input.
+
+    Input tokens are approximated as `text_length // 3`, an upper bound for
+    English/Arabic text. The budget is clamped to [MIN_OUTPUT_TOKENS, cap].
+
+    Args:
+        text_length: Characters of input the response scales with
+        overhead: Fixed tokens for the JSON structure and notes
+        ratio: Output tokens per input token
+        cap: Maximum budget
+    """
+    return max(MIN_OUTPUT_TOKENS, min(cap, overhead + int(text_length // 3 * ratio)))
+
+
+def parse_json_model(content: str, model: Type[ModelT]) -> ModelT:
+    """
+    Validate a JSON response from an LLM straight into a pydantic model.
+
+    Args:
+        content: Raw response content, optionally wrapped in a ```json fence
+        model: Model describing the expected payload
+
+    Returns:
+        Validated model instance
+
+    Raises:
+        ValidationError: If the content is not valid JSON or does not match the model
+    """
+    try:
+        return model.model_validate_json(content)
+    except ValidationError:
+        match = _CODE_FENCE_RE.match(content)
+        if match is None:
+            raise
+        return model.model_validate_json(match.group(1))
+
+
+def drop_invalid_items(value: Any, handler: ValidatorFunctionWrapHandler) -> List[Any]:
+    """
+    Validate a list field item by item, dropping the items that fail.
+
+    Use as a `mode="wrap"` field validator on payload lists (issues, special
+    elements) so one malformed item does not discard the whole response.
+    """
+    if not isinstance(value, list):
+        return []
+
+    items: List[Any] = []
+    for item in value:
+        try:
+            items.extend(handler([item]))
+        except ValidationError as e:
+            logger.debug("Dropping invalid payload item", error=str(e))
+    return items
+
+
+def response_format_for(model: Type[BaseModel], name: str) -> ResponseFormat:
+    """
+    Build the response format an agent requests for its payload model.
+
+    Sends the model's JSON Schema when structured output is enabled, plain
+    JSON mode otherwise. The schema is not sent in strict mode: vLLM enforces
+    it through guided decoding, while OpenAI treats it as guidance only.
+    """
+    if settings.llm_structured_output:
+        return ResponseFormat(
+            type=ResponseFormatType.JSON_SCHEMA,
+            schema=model.model_json_schema(),
+            name=name,
+        )
+    return ResponseFormat(type=ResponseFormatType.JSON_OBJECT)
+
+
+async def complete_json_model(
+    llm: LLMProvider,
+    model: Type[ModelT],
+    messages: List[Message],
+    temperature: float,
+    max_tokens: int,
+    response_format: ResponseFormat,
+    agent: str,
+    max_attempts: Optional[int] = None,
+) -> Tuple[Optional[ModelT], CompletionResponse]:
+    """
+    Call the LLM and validate its response, re-asking when it cannot be parsed.
+
+    Only unparseable responses are retried; provider errors (quota, auth, rate
+    limits after the provider's own retries) propagate immediately. A response
+    cut off at the token limit is retried with double the budget (up to
+    MAX_RETRY_OUTPUT_TOKENS) instead of re-asking the same question. Retries
+    bypass any response cache, which would return the same unusable response.
+
+    Args:
+        llm: LLM provider
+        model: Model describing the expected payload
+        messages: Chat messages
+        temperature: Sampling temperature
+        max_tokens: Maximum tokens to generate
+        response_format: Response format to request
+        agent: Agent name for logging
+        max_attempts: Total calls including the first (defaults to settings)
+
+    Returns:
+        Tuple of (payload, or None if every attempt failed; last response)
+    """
+    attempts = max_attempts or settings.llm_parse_max_attempts
+
+    for attempt in range(attempts):
+        if attempt == 1:
+            llm = llm.uncached()
+        response = await llm.chat_completion(
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            response_format=response_format,
+        )
+        try:
+            return parse_json_model(response.content, model), response
+        except ValidationError as e:
+            truncated = response.finish_reason == "length"
+            logger.warning(
+                f"{agent} agent: Unparseable response",
+                attempt=attempt + 1,
+                max_attempts=attempts,
+                truncated=truncated,
+                error=str(e),
+            )
+        if attempt + 1 < attempts:
+            if truncated and max_tokens < MAX_RETRY_OUTPUT_TOKENS:
+                # Same prompt, same budget would be cut off again; no backoff needed
+                max_tokens = min(max_tokens * 2, MAX_RETRY_OUTPUT_TOKENS)
+            else:
+                await asyncio.sleep(PARSE_RETRY_BASE_DELAY_SECONDS * 2**attempt)
+
+    return None, response
@@ -4,11 +4,9 @@ TRJM Gateway - Post-Processor Agent
 Applies final typography, RTL fixes, and formatting corrections
 """
 
-import json
 import re
-from typing import Optional
-
-import yaml
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from ....core.logging import logger
 from ....llm.provider import (
@@ -19,6 +17,8 @@ from ....llm.provider import (
     ResponseFormatType,
 )
 from ..schemas import ChangeRecord, LanguageCode, PostProcessorInput, PostProcessorOutput
+from .parsing import JSONDecodeError, loads_json
+from .templates import load_prompts_file
 
 
 # Arabic punctuation mappings
@@ -27,6 +27,83 @@ ARABIC_PUNCTUATION = {
     ";": "؛",
     "?": "؟",
 }
+_AR_PUNCT_TABLE = str.maketrans(ARABIC_PUNCTUATION)
+
+# Arabic post-processing patterns, compiled once
+_RE_SPACE_BEFORE_AR_PUNCT = re.compile(r"\s+([،؛؟])")
+_RE_SPACE_AFTER_AR_PUNCT = re.compile(r"([،؛؟])(?!\s|$)")
+_RE_DOUBLE_SPACE = re.compile(r" {2,}")
+_RE_NUM_BEFORE_AR = re.compile(r"(\d+)(?=\s*[\u0600-\u06FF])")
+_RE_DQUOTE = re.compile(r'"([^"]+)"')
+_RE_SQUOTE = re.compile(r"'([^']+)'")
+
+
+def _protected_intervals(text: str, tokens: Sequence[str]) -> List[Tuple[int, int]]:
+    """
+    Find every occurrence of the protected tokens in text.
+
+    Returns:
+        Sorted, merged (start, end) spans covering the occurrences
+    """
+    spans = []
+    for token in tokens:
+        if not token:
+            continue
+        pos = text.find(token)
+        while pos != -1:
+            spans.append((pos, pos + len(token)))
+            pos = text.find(token, pos + 1)
+    spans.sort()
+
+    merged: List[Tuple[int, int]] = []
+    for start, end in spans:
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _overlaps_protected(
+    start: int, end: int, intervals: List[Tuple[int, int]], starts: List[int]
+) -> bool:
+    """Check whether [start, end) overlaps a protected span (starts: span start offsets)."""
+    # Spans are disjoint and sorted, so only the last one starting before `end` can overlap
+    i = bisect_left(starts, end)
+    return i > 0 and intervals[i - 1][1] > start
+
+
+# Default prompts, used when no prompts file is given
+DEFAULT_PROMPTS = {
+    "system_prompt": """You are a text post-processing specialist for Arabic and multilingual content.
+Apply final formatting corrections without changing the meaning.
+
+TASKS:
+1. Replace Western punctuation with Arabic equivalents (comma → ،, semicolon → ؛, question mark → ؟)
+2. Fix RTL formatting and add LTR/RTL markers where needed
+3. Remove extra spaces and fix spacing around punctuation
+4. Use proper Arabic quotation marks: « » or " "
+5. Preserve protected tokens exactly as-is
+
+DO NOT:
+- Change the meaning of any text
+- Modify protected tokens
+- Add or remove content
+- Translate anything
+
+Respond with JSON: {processed_text, changes_made, rtl_markers_added, formatting_preserved}""",
+    "user_prompt_template": """Apply post-processing to the following {target_language} text:
+
+---
+{translation}
+---
+
+PROTECTED TOKENS (keep exactly as-is):
+{protected_tokens}
+
+Apply typography, punctuation, and RTL formatting corrections.""",
+}
 
 
 class PostProcessorAgent:
@@ -53,43 +130,14 @@ class PostProcessorAgent:
         self.prompts = self._load_prompts(prompts_path)
 
     def _load_prompts(self, path: Optional[str]) -> dict:
-        """Load prompt templates from YAML."""
+        """Load prompt templates from YAML (parsed once per path)."""
         if path:
             try:
-                with open(path, "r", encoding="utf-8") as f:
-                    return yaml.safe_load(f)
+                return load_prompts_file(path)
             except Exception as e:
                 logger.warning(f"Failed to load prompts from {path}: {e}")
 
-        return {
-            "system_prompt": """You are a text post-processing specialist for Arabic and multilingual content.
-Apply final formatting corrections without changing the meaning.
-
-TASKS:
-1. Replace Western punctuation with Arabic equivalents (comma → ،, semicolon → ؛, question mark → ؟)
-2. Fix RTL formatting and add LTR/RTL markers where needed
-3. Remove extra spaces and fix spacing around punctuation
-4. Use proper Arabic quotation marks: « » or " "
-5. Preserve protected tokens exactly as-is
-
-DO NOT:
-- Change the meaning of any text
-- Modify protected tokens
-- Add or remove content
-- Translate anything
-
-Respond with JSON: {processed_text, changes_made, rtl_markers_added, formatting_preserved}""",
-            "user_prompt_template": """Apply post-processing to the following {target_language} text:
-
----
-{translation}
----
-
-PROTECTED TOKENS (keep exactly as-is):
-{protected_tokens}
-
-Apply typography, punctuation, and RTL formatting corrections.""",
-        }
+        return DEFAULT_PROMPTS
 
     async def process(self, input_data: PostProcessorInput) -> PostProcessorOutput:
         """
@@ -111,8 +159,9 @@ Apply typography, punctuation, and RTL formatting corrections.""",
         if input_data.target_language == LanguageCode.ARABIC:
             return self._process_arabic(input_data)
 
-        # For other languages, minimal processing
-        return PostProcessorOutput(
+        # For other languages, pass the text through; the fields are known
+        # valid, so skip model validation
+        return PostProcessorOutput.model_construct(
             processed_text=input_data.translation,
             changes_made=[],
             rtl_markers_added=0,
@@ -122,57 +171,45 @@ Apply typography, punctuation, and RTL formatting corrections.""",
     def _process_arabic(self, input_data: PostProcessorInput) -> PostProcessorOutput:
         """Apply Arabic-specific post-processing rules."""
         text = input_data.translation
-        changes = []
         rtl_markers_added = 0
 
-        # Create a map of protected token positions
-        protected_positions = set()
-        for token in input_data.protected_tokens:
-            start = 0
-            while True:
-                pos = text.find(token, start)
-                if pos == -1:
-                    break
-                for i in range(pos, pos + len(token)):
-                    protected_positions.add(i)
-                start = pos + 1
-
-        # Replace punctuation (avoiding protected tokens)
-        processed_chars = []
-        for i, char in enumerate(text):
-            if i in protected_positions:
-                processed_chars.append(char)
-            elif char in ARABIC_PUNCTUATION:
-                replacement = ARABIC_PUNCTUATION[char]
-                processed_chars.append(replacement)
-                # Track change
-                existing_change = next(
-                    (c for c in changes if c.type == "punctuation" and c.original == char),
-                    None,
-                )
-                if existing_change:
-                    existing_change.count += 1
-                else:
-                    changes.append(
-                        ChangeRecord(
-                            type="punctuation",
-                            original=char,
-                            replacement=replacement,
-                            count=1,
-                        )
-                    )
-            else:
-                processed_chars.append(char)
-
-        text = "".join(processed_chars)
+        # Spans of protected tokens, searched by start offset
+        protected = _protected_intervals(text, input_data.protected_tokens)
+        protected_starts = [start for start, _ in protected]
+
+        # Replace punctuation in the text between protected spans, counting
+        # each mark in order of first appearance
+        pieces = []
+        counts: Dict[str, int] = {}
+        pos = 0
+        for start, end in [*protected, (len(text), len(text))]:
+            segment = text[pos:start]
+            if segment:
+                found = sorted((segment.find(c), c) for c in ARABIC_PUNCTUATION if c in segment)
+                for _, char in found:
+                    counts[char] = counts.get(char, 0) + segment.count(char)
+                pieces.append(segment.translate(_AR_PUNCT_TABLE))
+            pieces.append(text[start:end])
+            pos = end
+        text = "".join(pieces)
+
+        changes = [
+            ChangeRecord(
+                type="punctuation",
+                original=char,
+                replacement=ARABIC_PUNCTUATION[char],
+                count=count,
+            )
+            for char, count in counts.items()
+        ]
 
         # Fix spacing around Arabic punctuation (no space before, space after)
-        text = re.sub(r"\s+([،؛؟])", r"\1", text)  # Remove space before
-        text = re.sub(r"([،؛؟])(?!\s|$)", r"\1 ", text)  # Add space after if missing
+        text = _RE_SPACE_BEFORE_AR_PUNCT.sub(r"\1", text)  # Remove space before
+        text = _RE_SPACE_AFTER_AR_PUNCT.sub(r"\1 ", text)  # Add space after if missing
 
         # Fix double spaces
         original_text = text
-        text = re.sub(r" {2,}", " ", text)
+        text = _RE_DOUBLE_SPACE.sub(" ", text)
         if text != original_text:
             changes.append(
                 ChangeRecord(
@@ -188,18 +225,13 @@ Apply typography, punctuation, and RTL formatting corrections.""",
         def add_rtl_marker(match):
             nonlocal rtl_markers_added
             # Check if this is within a protected token
-            start = match.start()
-            if any(start + i in protected_positions for i in range(len(match.group()))):
+            if _overlaps_protected(match.start(), match.end(), protected, protected_starts):
                 return match.group()
             rtl_markers_added += 1
             return match.group() + "\u200f"  # RLM
 
         # Add markers after standalone numbers followed by Arabic text
-        text = re.sub(
-            r"(\d+)(?=\s*[\u0600-\u06FF])",
-            add_rtl_marker,
-            text,
-        )
+        text = _RE_NUM_BEFORE_AR.sub(add_rtl_marker, text)
 
         # Replace straight quotes with Arabic guillemets for quoted text
         # Match text between quotes
@@ -210,8 +242,11 @@ Apply typography, punctuation, and RTL formatting corrections.""",
         # Only if not in protected tokens
         if not any('"' in token or "'" in token for token in input_data.protected_tokens):
             original_text = text
-            text = re.sub(r'"([^"]+)"', replace_quotes, text)
-            text = re.sub(r"'([^']+)'", replace_quotes, text)
+            # A substring test is a C-level scan; skip the regex when there is nothing to match
+            if '"' in text:
+                text = _RE_DQUOTE.sub(replace_quotes, text)
+            if "'" in text:
+                text = _RE_SQUOTE.sub(replace_quotes, text)
             if text != original_text:
                 changes.append(
                     ChangeRecord(
@@ -268,7 +303,7 @@ Apply typography, punctuation, and RTL formatting corrections.""",
         )
 
         try:
-            data = json.loads(response.content)
+            data = loads_json(response.content)
             changes = [
                 ChangeRecord(**c) for c in data.get("changes_made", []) if isinstance(c, dict)
             ]
@@ -278,6 +313,6 @@ Apply typography, punctuation, and RTL formatting corrections.""",
                 rtl_markers_added=data.get("rtl_markers_added", 0),
                 formatting_preserved=data.get("formatting_preserved", True),
             )
-        except json.JSONDecodeError:
+        except JSONDecodeError:
             logger.warning("Post-processor: LLM response not valid JSON, using rule-based")
             return await self.process(input_data)
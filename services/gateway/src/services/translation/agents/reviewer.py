@@ -4,19 +4,19 @@ TRJM Gateway - Reviewer/QA Agent
 Validates translation quality and provides corrections
 """
 
-import json
-from typing import Optional
-
-import yaml
+import asyncio
+from typing import Any, List, Optional
+
+from pydantic import (
+    BaseModel,
+    Field,
+    ValidationInfo,
+    ValidatorFunctionWrapHandler,
+    field_validator,
+)
 
 from ....core.logging import logger
-from ....llm.provider import (
-    LLMProvider,
-    Message,
-    MessageRole,
-    ResponseFormat,
-    ResponseFormatType,
-)
+from ....llm.provider import LLMProvider, Message, MessageRole
 from ..schemas import (
     IssueCategory,
     IssueSeverity,
@@ -25,46 +25,61 @@ from ..schemas import (
     ReviewerOutput,
     RiskySpan,
 )
+from .parsing import (
+    complete_json_model,
+    drop_invalid_items,
+    estimate_output_tokens,
+    response_format_for,
+)
+from .templates import PromptTemplate, bullet_list, load_prompts_file, prompt_build_is_heavy
 
 
-class ReviewerAgent:
-    """
-    Reviewer/QA agent for validating translations.
+class _ReviewerLLMPayload(BaseModel):
+    """JSON payload the reviewer model returns; missing fields take safe defaults."""
 
-    Responsibilities:
-    - Validate meaning preservation
-    - Check for omissions and additions
-    - Verify numbers, dates, currencies
-    - Ensure glossary compliance
-    - Check protected token preservation
-    - Validate Arabic punctuation and RTL
-    - Detect leftover source language
-    - Calculate confidence score
-    """
+    confidence_score: float = Field(default=0.8, ge=0, le=1)
+    issues: List[QAIssue] = Field(default_factory=list)
+    corrected_translation: Optional[str] = None
+    glossary_compliance: bool = True
+    protected_tokens_intact: bool = True
+    risky_spans: List[RiskySpan] = Field(default_factory=list)
+    reviewer_notes: Optional[str] = None
 
-    def __init__(self, llm_provider: LLMProvider, prompts_path: Optional[str] = None):
-        """
-        Initialize the reviewer agent.
+    @field_validator("issues", "risky_spans", mode="wrap")
+    @classmethod
+    def _drop_invalid_items(
+        cls, value: Any, handler: ValidatorFunctionWrapHandler, info: ValidationInfo
+    ) -> List[Any]:
+        """Skip malformed issues and spans instead of failing the whole review."""
+        return drop_invalid_items(value, handler)
 
-        Args:
-            llm_provider: LLM provider instance
-            prompts_path: Path to prompts YAML file
-        """
-        self.llm = llm_provider
-        self.prompts = self._load_prompts(prompts_path)
 
-    def _load_prompts(self, path: Optional[str]) -> dict:
-        """Load prompt templates from YAML."""
-        if path:
-            try:
-                with open(path, "r", encoding="utf-8") as f:
-                    return yaml.safe_load(f)
-            except Exception as e:
-                logger.warning(f"Failed to load prompts from {path}: {e}")
+_RESPONSE_FORMAT = response_format_for(_ReviewerLLMPayload, "translation_review")
+
+
+class _QuickCheckLLMPayload(BaseModel):
+    """JSON payload of a verify-only review."""
+
+    confidence_score: float = Field(ge=0, le=1)
+    glossary_compliance: bool = True
+    protected_tokens_intact: bool = True
+
+
+_QUICK_CHECK_RESPONSE_FORMAT = response_format_for(_QuickCheckLLMPayload, "translation_check")
 
-        # Default prompts
-        return {
-            "system_prompt": """You are a senior translation quality assurance specialist.
+QUICK_CHECK_SYSTEM_PROMPT = """You are a senior translation quality assurance specialist.
+Assess the translation below for meaning preservation, omissions, additions, numbers,
+glossary compliance and protected tokens. Do not list issues or rewrite anything.
+
+Respond with JSON containing only:
+1. confidence_score (0.0-1.0; 0.90+ means no issues found)
+2. glossary_compliance (boolean)
+3. protected_tokens_intact (boolean)"""
+
+
+# Default prompts, used when no prompts file is given
+DEFAULT_PROMPTS = {
+    "system_prompt": """You are a senior translation quality assurance specialist.
 Your task is to review translations and identify issues.
 
 REVIEW CRITERIA:
@@ -104,7 +119,7 @@ Respond with JSON containing:
 5. protected_tokens_intact (boolean)
 6. risky_spans (segments needing human review)
 7. reviewer_notes""",
-            "user_prompt_template": """Review the following translation:
+    "user_prompt_template": """Review the following translation:
 
 SOURCE TEXT ({source_language}):
 ---
@@ -125,7 +140,52 @@ GLOSSARY TERMS (should be used):
 STYLE: {style_preset}
 
 Provide your review as a JSON object.""",
-        }
+}
+
+
+class ReviewerAgent:
+    """
+    Reviewer/QA agent for validating translations.
+
+    Responsibilities:
+    - Validate meaning preservation
+    - Check for omissions and additions
+    - Verify numbers, dates, currencies
+    - Ensure glossary compliance
+    - Check protected token preservation
+    - Validate Arabic punctuation and RTL
+    - Detect leftover source language
+    - Calculate confidence score
+    """
+
+    def __init__(self, llm_provider: LLMProvider, prompts_path: Optional[str] = None):
+        """
+        Initialize the reviewer agent.
+
+        Args:
+            llm_provider: LLM provider instance
+            prompts_path: Path to prompts YAML file
+        """
+        self.llm = llm_provider
+        self.prompts = self._load_prompts(prompts_path)
+        # Reused across calls so the system prefix is identical for prompt caching
+        self._system_message = Message(
+            role=MessageRole.SYSTEM, content=self.prompts["system_prompt"]
+        )
+        self._user_prompt_template = PromptTemplate(self.prompts["user_prompt_template"])
+        self._quick_check_message = Message(
+            role=MessageRole.SYSTEM, content=QUICK_CHECK_SYSTEM_PROMPT
+        )
+
+    def _load_prompts(self, path: Optional[str]) -> dict:
+        """Load prompt templates from YAML (parsed once per path)."""
+        if path:
+            try:
+                return load_prompts_file(path)
+            except Exception as e:
+                logger.warning(f"Failed to load prompts from {path}: {e}")
+
+        return DEFAULT_PROMPTS
 
     async def review(self, input_data: ReviewerInput) -> ReviewerOutput:
         """
@@ -143,52 +203,34 @@ Provide your review as a JSON object.""",
             translation_length=len(input_data.translation),
         )
 
-        # Format protected tokens
-        protected_tokens_str = (
-            "\n".join(f"- {token}" for token in input_data.protected_tokens)
-            if input_data.protected_tokens
-            else "None"
-        )
-
-        # Format glossary entries
-        glossary_str = (
-            "\n".join(
-                f"- {entry.source} → {entry.target}" for entry in input_data.glossary_entries
-            )
-            if input_data.glossary_entries
-            else "None"
-        )
-
-        # Build user prompt
-        user_prompt = self.prompts["user_prompt_template"].format(
-            source_language=input_data.source_language.value,
-            target_language=input_data.target_language.value,
-            source_text=input_data.source_text,
-            translation=input_data.translation,
-            protected_tokens=protected_tokens_str,
-            glossary_entries=glossary_str,
-            style_preset=input_data.style_preset.value,
-        )
+        # Build user prompt, off the event loop when it is large
+        if prompt_build_is_heavy(
+            len(input_data.source_text) + len(input_data.translation),
+            len(input_data.glossary_entries),
+            input_data.prompt_context,
+        ):
+            user_prompt = await asyncio.to_thread(self._build_user_prompt, input_data)
+        else:
+            user_prompt = self._build_user_prompt(input_data)
 
         messages = [
-            Message(role=MessageRole.SYSTEM, content=self.prompts["system_prompt"]),
+            self._system_message,
             Message(role=MessageRole.USER, content=user_prompt),
         ]
 
-        # Call LLM
-        response = await self.llm.chat_completion(
+        # Call LLM, re-asking if the response cannot be parsed
+        payload, _ = await complete_json_model(
+            self.llm,
+            _ReviewerLLMPayload,
             messages=messages,
             temperature=0.2,
-            max_tokens=4096,
-            response_format=ResponseFormat(type=ResponseFormatType.JSON_OBJECT),
+            # Room for the issue list plus a full corrected translation
+            max_tokens=estimate_output_tokens(len(input_data.translation), 400, 1.5, 4096),
+            response_format=_RESPONSE_FORMAT,
+            agent="Reviewer",
         )
-
-        # Parse response
-        try:
-            data = json.loads(response.content)
-            return self._parse_output(data, input_data.translation)
-        except json.JSONDecodeError as e:
-            logger.error("Reviewer agent: Failed to parse JSON response", error=str(e))
+        if payload is None:
+            logger.error("Reviewer agent: Failed to parse JSON response")
             # Return default review with original translation
             return ReviewerOutput(
                 confidence_score=0.7,
@@ -205,49 +247,84 @@ Provide your review as a JSON object.""",
                 reviewer_notes="Warning: Automated review failed",
             )
 
-    def _parse_output(self, data: dict, original_translation: str) -> ReviewerOutput:
-        """Parse LLM response into ReviewerOutput."""
-        # Parse issues
-        issues = []
-        for issue in data.get("issues", []):
-            if isinstance(issue, dict):
-                try:
-                    issues.append(
-                        QAIssue(
-                            category=IssueCategory(issue.get("category", "grammar")),
-                            severity=IssueSeverity(issue.get("severity", "minor")),
-                            description=issue.get("description", ""),
-                            source_segment=issue.get("source_segment"),
-                            translation_segment=issue.get("translation_segment"),
-                            suggested_fix=issue.get("suggested_fix"),
-                        )
-                    )
-                except (ValueError, KeyError):
-                    continue
-
-        # Parse risky spans
-        risky_spans = []
-        for span in data.get("risky_spans", []):
-            if isinstance(span, dict):
-                risky_spans.append(
-                    RiskySpan(
-                        text=span.get("text", ""),
-                        reason=span.get("reason", ""),
-                        risk_level=span.get("risk_level", "medium"),
-                    )
-                )
-
-        # Get corrected translation or use original
-        corrected = data.get("corrected_translation", original_translation)
-        if not corrected:
-            corrected = original_translation
-
-        return ReviewerOutput(
-            confidence_score=float(data.get("confidence_score", 0.8)),
-            issues=issues,
-            corrected_translation=corrected,
-            glossary_compliance=data.get("glossary_compliance", True),
-            protected_tokens_intact=data.get("protected_tokens_intact", True),
-            risky_spans=risky_spans,
-            reviewer_notes=data.get("reviewer_notes"),
+        # Keep the original translation when no correction is offered
+        return ReviewerOutput.model_construct(
+            confidence_score=payload.confidence_score,
+            issues=payload.issues,
+            corrected_translation=payload.corrected_translation or input_data.translation,
+            glossary_compliance=payload.glossary_compliance,
+            protected_tokens_intact=payload.protected_tokens_intact,
+            risky_spans=payload.risky_spans,
+            reviewer_notes=payload.reviewer_notes,
+        )
+
+    async def quick_check(self, input_data: ReviewerInput) -> Optional[ReviewerOutput]:
+        """
+        Verify a translation without asking for issues or corrections.
+
+        Much cheaper to generate than a full review, so it can be raced against
+        one and used instead when it reports high confidence.
+
+        Args:
+            input_data: Reviewer input with source text and translation
+
+        Returns:
+            ReviewerOutput with the unchanged translation, or None if the
+            response could not be parsed
+        """
+        if prompt_build_is_heavy(
+            len(input_data.source_text) + len(input_data.translation),
+            len(input_data.glossary_entries),
+            input_data.prompt_context,
+        ):
+            user_prompt = await asyncio.to_thread(self._build_user_prompt, input_data)
+        else:
+            user_prompt = self._build_user_prompt(input_data)
+
+        payload, _ = await complete_json_model(
+            self.llm,
+            _QuickCheckLLMPayload,
+            messages=[
+                self._quick_check_message,
+                Message(role=MessageRole.USER, content=user_prompt),
+            ],
+            temperature=0.2,
+            max_tokens=128,
+            response_format=_QUICK_CHECK_RESPONSE_FORMAT,
+            agent="Reviewer",
+            max_attempts=1,
+        )
+        if payload is None:
+            return None
+
+        return ReviewerOutput.model_construct(
+            confidence_score=payload.confidence_score,
+            issues=[],
+            corrected_translation=input_data.translation,
+            glossary_compliance=payload.glossary_compliance,
+            protected_tokens_intact=payload.protected_tokens_intact,
+            risky_spans=[],
+            reviewer_notes="Verified by quick check",
+        )
+
+    def _build_user_prompt(self, input_data: ReviewerInput) -> str:
+        """Render the user prompt for one review."""
+        # Format protected tokens and glossary entries (shared with the translator if given)
+        if input_data.prompt_context is not None:
+            protected_tokens_str = input_data.prompt_context.protected_tokens_str
+            glossary_str = input_data.prompt_context.glossary_str
+        else:
+            protected_tokens_str = bullet_list(input_data.protected_tokens)
+            glossary_str = bullet_list(
+                [f"{entry.source} → {entry.target}" for entry in input_data.glossary_entries]
+            )
+
+        return self._user_prompt_template.render(
+            source_language=input_data.source_language.value,
+            target_language=input_data.target_language.value,
+            source_text=input_data.source_text,
+            translation=input_data.translation,
+            protected_tokens=protected_tokens_str,
+            glossary_entries=glossary_str,
+            style_preset=input_data.style_preset.value,
         )
@@ -4,19 +4,21 @@ TRJM Gateway - Router Agent
 Analyzes input text to determine language, content type, and translation strategy
 """
 
-import json
-from typing import Optional
+import re
+from collections import OrderedDict
+from typing import Any, List, Optional, Tuple
 
-import yaml
+from pydantic import (
+    BaseModel,
+    Field,
+    ValidationInfo,
+    ValidatorFunctionWrapHandler,
+    field_validator,
+)
 
+from ....core.config import settings
 from ....core.logging import logger
-from ....llm.provider import (
-    LLMProvider,
-    Message,
-    MessageRole,
-    ResponseFormat,
-    ResponseFormatType,
-)
+from ....llm.provider import LLMProvider, Message, MessageRole
 from ..schemas import (
     ContentType,
     FormalityLevel,
@@ -27,42 +29,86 @@ from ..schemas import (
     SpecialElementType,
     StylePreset,
 )
+from .parsing import (
+    complete_json_model,
+    drop_invalid_items,
+    estimate_output_tokens,
+    response_format_for,
+)
+from .templates import PromptTemplate, load_prompts_file
 
+# Router analysis cache key: (analyzed text, target language, style hint)
+_AnalysisKey = Tuple[str, LanguageCode, Optional[StylePreset]]
 
-class RouterAgent:
-    """
-    Router agent for analyzing input text.
 
-    Responsibilities:
-    - Detect source language
-    - Detect content type (email, legal, technical, etc.)
-    - Identify special elements that need protection
-    - Recommend translation style and strategy
-    """
+class _RouterLLMPayload(BaseModel):
+    """JSON payload the router model returns; missing fields take safe defaults."""
 
-    def __init__(self, llm_provider: LLMProvider, prompts_path: Optional[str] = None):
-        """
-        Initialize the router agent.
+    source_language: LanguageCode = LanguageCode.ENGLISH
+    source_language_confidence: float = Field(default=0.9, ge=0, le=1)
+    content_type: ContentType = ContentType.GENERAL
+    formality_level: FormalityLevel = FormalityLevel.NEUTRAL
+    special_elements: List[SpecialElement] = Field(default_factory=list)
+    recommended_style: StylePreset = StylePreset.NEUTRAL
+    complexity_score: float = Field(default=0.5, ge=0, le=1)
+    notes: Optional[str] = None
 
-        Args:
-            llm_provider: LLM provider instance
-            prompts_path: Path to prompts YAML file
-        """
-        self.llm = llm_provider
-        self.prompts = self._load_prompts(prompts_path)
+    @field_validator("special_elements", mode="wrap")
+    @classmethod
+    def _drop_invalid_items(
+        cls, value: Any, handler: ValidatorFunctionWrapHandler, info: ValidationInfo
+    ) -> List[Any]:
+        """Skip malformed special elements instead of failing the whole analysis."""
+        return drop_invalid_items(value, handler)
 
-    def _load_prompts(self, path: Optional[str]) -> dict:
-        """Load prompt templates from YAML."""
-        if path:
-            try:
-                with open(path, "r", encoding="utf-8") as f:
-                    return yaml.safe_load(f)
-            except Exception as e:
-                logger.warning(f"Failed to load prompts from {path}: {e}")
 
-        # Default prompts
-        return {
-            "system_prompt": """You are a language analysis and routing agent for an enterprise translation system.
+_RESPONSE_FORMAT = response_format_for(_RouterLLMPayload, "router_analysis")
+
+# =============================================================================
+# Heuristic Pre-Routing
+# =============================================================================
+
+# Router input budget. UTF-8 bytes are the token proxy: BPE vocabularies average
+# roughly 4 bytes per token for English and Arabic alike, whereas characters
+# under-count Arabic (2 bytes each) relative to English.
+ROUTER_MAX_INPUT_TOKENS = 1500
+_BYTES_PER_TOKEN = 4
+
+# Minimum detection confidence for answering without the LLM
+HEURISTIC_MIN_CONFIDENCE = 0.95
+
+# Regex-detectable special elements, in the order they are claimed
+_SPECIAL_ELEMENT_PATTERNS = [
+    (
+        SpecialElementType.BRACKETED,
+        re.compile(r"\[DO NOT TRANSLATE\][^\[]*\[/DO NOT TRANSLATE\]"),
+    ),
+    (SpecialElementType.URL, re.compile(r"https?://[^\s]+")),
+    (SpecialElementType.EMAIL, re.compile(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}")),
+    (SpecialElementType.PLACEHOLDER, re.compile(r"\{\{[^}]+\}\}|\{[^}]+\}|%[sd]")),
+    (SpecialElementType.HTML, re.compile(r"<[^>]+>")),
+    (SpecialElementType.DATE, re.compile(r"\b\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2})?)?\b")),
+    (
+        SpecialElementType.CURRENCY,
+        re.compile(r"[$€£]\s?\d[\d,.]*|\b\d[\d,.]*\s?(?:USD|EUR|GBP|SAR|AED)\b"),
+    ),
+]
+
+_RE_ARABIC_LETTER = re.compile(r"[\u0600-\u06FF\u0750-\u077F]")
+_RE_LETTER = re.compile(r"[^\W\d_]")
+_RE_WORD = re.compile(r"\w+")
+
+# Common function words that mark short Latin-script text as not English
+_NON_ENGLISH_WORDS = frozenset(
+    "le la les des du et est une pour avec vous nous".split()  # French
+    + "der die das und ist nicht mit ein eine sie ich".split()  # German
+    + "el los las y es una para con por que del".split()  # Spanish
+)
+
+
+# Default prompts, used when no prompts file is given
+DEFAULT_PROMPTS = {
+    "system_prompt": """You are a language analysis and routing agent for an enterprise translation system.
 Your task is to analyze the input text and provide structured analysis.
 
 You must respond with a valid JSON object containing:
@@ -89,7 +135,7 @@ Special elements to detect:
 - Technical terms (type: technical_term)
 
 For each special element, specify: type, value, protect (boolean)""",
-            "user_prompt_template": """Analyze the following text for translation routing:
+    "user_prompt_template": """Analyze the following text for translation routing:
 
 ---
 {input_text}
@@ -99,7 +145,54 @@ Target language: {target_language}
 {style_hint}
 
 Respond with a JSON object following the schema exactly.""",
-        }
+}
+
+
+class RouterAgent:
+    """
+    Router agent for analyzing input text.
+
+    Responsibilities:
+    - Detect source language
+    - Detect content type (email, legal, technical, etc.)
+    - Identify special elements that need protection
+    - Recommend translation style and strategy
+    """
+
+    def __init__(
+        self,
+        llm_provider: LLMProvider,
+        prompts_path: Optional[str] = None,
+        classification_llm_provider: Optional[LLMProvider] = None,
+    ):
+        """
+        Initialize the router agent.
+
+        Args:
+            llm_provider: LLM provider instance
+            prompts_path: Path to prompts YAML file
+            classification_llm_provider: Cheaper provider for the analysis call
+                (falls back to llm_provider)
+        """
+        self.llm = classification_llm_provider or llm_provider
+        self.prompts = self._load_prompts(prompts_path)
+        # Reused across calls so the system prefix is identical for prompt caching
+        self._system_message = Message(
+            role=MessageRole.SYSTEM, content=self.prompts["system_prompt"]
+        )
+        self._user_prompt_template = PromptTemplate(self.prompts["user_prompt_template"])
+        # LLM analyses of recent inputs, least recently used first
+        self._analysis_cache: "OrderedDict[_AnalysisKey, RouterOutput]" = OrderedDict()
+
+    def _load_prompts(self, path: Optional[str]) -> dict:
+        """Load prompt templates from YAML (parsed once per path)."""
+        if path:
+            try:
+                return load_prompts_file(path)
+            except Exception as e:
+                logger.warning(f"Failed to load prompts from {path}: {e}")
+
+        return DEFAULT_PROMPTS
 
     async def analyze(self, input_data: RouterInput) -> RouterOutput:
         """
@@ -117,89 +210,128 @@ Respond with a JSON object following the schema exactly.""",
             target_language=input_data.target_language.value,
         )
 
+        # Short, unambiguous inputs don't need the LLM
+        heuristic_output = self._heuristic_route(input_data)
+        if heuristic_output is not None:
+            logger.debug(
+                "Router agent: heuristic analysis used",
+                source_language=heuristic_output.source_language.value,
+            )
+            return heuristic_output
+
         # Build messages
         style_hint = ""
         if input_data.style_hint:
             style_hint = f"Style preference: {input_data.style_hint.value}"
 
-        user_prompt = self.prompts["user_prompt_template"].format(
-            input_text=input_data.text[:5000],  # Limit for analysis
+        input_text = self._truncate_for_analysis(input_data.text)
+        cache_key = (input_text, input_data.target_language, input_data.style_hint)
+        cached = self._analysis_cache.get(cache_key)
+        if cached is not None:
+            self._analysis_cache.move_to_end(cache_key)
+            logger.debug("Router agent: cached analysis used")
+            return cached
+
+        user_prompt = self._user_prompt_template.render(
+            input_text=input_text,
             target_language=input_data.target_language.value,
             style_hint=style_hint,
         )
 
         messages = [
-            Message(role=MessageRole.SYSTEM, content=self.prompts["system_prompt"]),
+            self._system_message,
             Message(role=MessageRole.USER, content=user_prompt),
         ]
 
-        # Call LLM
-        response = await self.llm.chat_completion(
+        # Call LLM, re-asking if the response cannot be parsed
+        payload, _ = await complete_json_model(
+            self.llm,
+            _RouterLLMPayload,
             messages=messages,
             temperature=0.1,
-            max_tokens=1024,
-            response_format=ResponseFormat(type=ResponseFormatType.JSON_OBJECT),
+            max_tokens=estimate_output_tokens(len(input_text), 300, 0.25, 1024),
+            response_format=_RESPONSE_FORMAT,
+            agent="Router",
         )
-
-        # Parse response
-        try:
-            data = json.loads(response.content)
-            return self._parse_output(data)
-        except json.JSONDecodeError as e:
-            logger.error("Router agent: Failed to parse JSON response", error=str(e))
+        if payload is None:
+            logger.error("Router agent: Failed to parse JSON response")
             # Return default analysis
             return self._get_default_output(input_data)
 
-    def _parse_output(self, data: dict) -> RouterOutput:
-        """Parse LLM response into RouterOutput."""
-        # Parse special elements
-        special_elements = []
-        for elem in data.get("special_elements", []):
-            try:
-                special_elements.append(
-                    SpecialElement(
-                        type=SpecialElementType(elem.get("type", "entity")),
-                        value=elem.get("value", ""),
-                        protect=elem.get("protect", True),
-                    )
+        output = RouterOutput.model_construct(**dict(payload))
+        if settings.router_cache_max_entries > 0:
+            self._analysis_cache[cache_key] = output
+            if len(self._analysis_cache) > settings.router_cache_max_entries:
+                self._analysis_cache.popitem(last=False)
+        return output
+
+    @staticmethod
+    def _truncate_for_analysis(text: str) -> str:
+        """Cut text to roughly ROUTER_MAX_INPUT_TOKENS; routing only needs a sample."""
+        max_bytes = ROUTER_MAX_INPUT_TOKENS * _BYTES_PER_TOKEN
+        if len(text) <= max_bytes // 4:
+            # Even at 4 bytes per character this is within budget
+            return text
+        encoded = text[:max_bytes].encode("utf-8")
+        if len(encoded) <= max_bytes:
+            return text[:max_bytes]
+        return encoded[:max_bytes].decode("utf-8", errors="ignore")
+
+    def _heuristic_route(self, input_data: RouterInput) -> Optional[RouterOutput]:
+        """
+        Analyze short inputs without the LLM when the result is unambiguous.
+
+        Special elements are found with the same patterns the router prompt
+        describes. The remaining letters decide the language: Arabic script, or
+        plain ASCII text without common French/German/Spanish function words
+        for English. Inputs made only of special elements need no language.
+
+        Returns:
+            RouterOutput, or None to fall through to the LLM
+        """
+        text = input_data.text
+        if len(text) > settings.router_heuristic_max_chars:
+            return None
+
+        # Claim special elements and blank them out of the remaining text
+        special_elements: List[SpecialElement] = []
+        remaining = text
+        for element_type, pattern in _SPECIAL_ELEMENT_PATTERNS:
+            matches = pattern.findall(remaining)
+            if matches:
+                special_elements.extend(
+                    SpecialElement(type=element_type, value=value) for value in matches
                 )
-            except (ValueError, KeyError):
-                continue
-
-        # Map string values to enums safely
-        source_lang = data.get("source_language", "en")
-        try:
-            source_language = LanguageCode(source_lang)
-        except ValueError:
-            source_language = LanguageCode.ENGLISH
-
-        content_type_str = data.get("content_type", "general")
-        try:
-            content_type = ContentType(content_type_str)
-        except ValueError:
-            content_type = ContentType.GENERAL
-
-        formality_str = data.get("formality_level", "neutral")
-        try:
-            formality_level = FormalityLevel(formality_str)
-        except ValueError:
-            formality_level = FormalityLevel.NEUTRAL
-
-        style_str = data.get("recommended_style", "neutral")
-        try:
-            recommended_style = StylePreset(style_str)
-        except ValueError:
-            recommended_style = StylePreset.NEUTRAL
+                remaining = pattern.sub(" ", remaining)
 
-        return RouterOutput(
+        letters = _RE_LETTER.findall(remaining)
+        if not letters:
+            if not special_elements:
+                return None
+            source_language, confidence = LanguageCode.ENGLISH, 1.0
+        else:
+            arabic_ratio = len(_RE_ARABIC_LETTER.findall(remaining)) / len(letters)
+            if arabic_ratio >= HEURISTIC_MIN_CONFIDENCE:
+                source_language, confidence = LanguageCode.ARABIC, arabic_ratio
+            elif remaining.isascii() and _NON_ENGLISH_WORDS.isdisjoint(
+                word.lower() for word in _RE_WORD.findall(remaining)
+            ):
+                source_language, confidence = LanguageCode.ENGLISH, HEURISTIC_MIN_CONFIDENCE
+            else:
+                return None
+
+        words = _RE_WORD.findall(remaining)
+        avg_word_length = sum(map(len, words)) / len(words) if words else 0.0
+
+        return RouterOutput.model_construct(
             source_language=source_language,
-            source_language_confidence=float(data.get("source_language_confidence", 0.9)),
-            content_type=content_type,
-            formality_level=formality_level,
+            source_language_confidence=confidence,
+            content_type=ContentType.GENERAL,
+            formality_level=FormalityLevel.NEUTRAL,
             special_elements=special_elements,
-            recommended_style=recommended_style,
-            complexity_score=float(data.get("complexity_score", 0.5)),
-            notes=data.get("notes"),
+            recommended_style=input_data.style_hint or StylePreset.NEUTRAL,
+            complexity_score=min(1.0, len(words) / 100 + avg_word_length / 20),
+            notes="Heuristic analysis (short input)",
         )
 
     def _get_default_output(self, input_data: RouterInput) -> RouterOutput:
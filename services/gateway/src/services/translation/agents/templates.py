@@ -0,0 +1,129 @@
+"""
+TRJM Gateway - Agent Prompt Templates
+======================================
+Prompt templates parsed once and rendered without str.format
+"""
+
+from functools import lru_cache
+from string import Formatter
+from typing import List, Optional, Sequence, Tuple
+
+import yaml
+
+from ..schemas import GlossaryEntry, PromptContext
+
+# Prompt builds larger than this run in a worker thread; below it the thread
+# hop costs more than formatting inline
+PROMPT_OFFLOAD_GLOSSARY_ENTRIES = 200
+PROMPT_OFFLOAD_TEXT_CHARS = 20_000
+
+# libyaml-backed loader when available
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@lru_cache(maxsize=8)
+def load_prompts_file(path: str) -> dict:
+    """
+    Read an agent prompts YAML file.
+
+    Parsed once per path; the returned dict is shared, so callers must not
+    mutate it.
+    """
+    with open(path, encoding="utf-8") as f:
+        # _YamlLoader is always a SafeLoader variant
+        prompts: dict = yaml.load(f, Loader=_YamlLoader)  # noqa: S506
+    return prompts
+
+
+class PromptTemplate:
+    """
+    Prompt template split into literal chunks and field names up front.
+
+    Only plain `{name}` fields are pre-parsed; templates using format specs,
+    conversions or attribute/index access fall back to `str.format`.
+    """
+
+    __slots__ = ("template", "_parts")
+
+    def __init__(self, template: str):
+        """
+        Parse the template.
+
+        Args:
+            template: `str.format`-style template
+        """
+        self.template = template
+        self._parts: Optional[List[Tuple[str, Optional[str]]]] = []
+
+        for literal, field_name, format_spec, conversion in Formatter().parse(template):
+            if field_name is not None and (
+                format_spec or conversion or not field_name.isidentifier()
+            ):
+                self._parts = None
+                break
+            self._parts.append((literal, field_name))
+
+    def render(self, **values: str) -> str:
+        """
+        Fill in the template.
+
+        Args:
+            **values: Field values; extra keys are ignored like `str.format`
+
+        Returns:
+            Rendered prompt
+
+        Raises:
+            KeyError: If a field in the template has no value
+        """
+        if self._parts is None:
+            return self.template.format(**values)
+
+        chunks = []
+        for literal, field_name in self._parts:
+            chunks.append(literal)
+            if field_name is not None:
+                chunks.append(values[field_name])
+        return "".join(chunks)
+
+
+def prompt_build_is_heavy(
+    text_length: int, glossary_size: int, prompt_context: Optional[PromptContext]
+) -> bool:
+    """Whether building a prompt is worth moving off the event loop."""
+    if text_length > PROMPT_OFFLOAD_TEXT_CHARS:
+        return True
+    # A precomputed context means the glossary is already formatted
+    return prompt_context is None and glossary_size > PROMPT_OFFLOAD_GLOSSARY_ENTRIES
+
+
+def bullet_list(items: Sequence[str], empty: str = "None") -> str:
+    """Render items as a "- " bullet list, or `empty` when there are none."""
+    if not items:
+        return empty
+    return "- " + "\n- ".join(items)
+
+
+@lru_cache(maxsize=64)
+def _glossary_block(pairs: Tuple[Tuple[str, str], ...]) -> str:
+    """Render (source, target) pairs as a sorted bullet list (cached per glossary)."""
+    return bullet_list([f"{source} → {target}" for source, target in sorted(pairs)])
+
+
+def build_prompt_context(
+    protected_tokens: Sequence[str], glossary_entries: Sequence[GlossaryEntry]
+) -> PromptContext:
+    """
+    Format protected tokens and glossary entries for the agent prompts.
+
+    Both lists are sorted so the translator and reviewer prompts of a job (and
+    its retries) contain byte-identical blocks regardless of input order. The
+    glossary block is cached on its content, so requests using the same
+    glossary skip sorting and formatting it.
+    """
+    return PromptContext(
+        protected_tokens_str=bullet_list(sorted(protected_tokens)),
+        glossary_str=_glossary_block(
+            tuple([(entry.source, entry.target) for entry in glossary_entries])
+        ),
+    )
@@ -4,19 +4,15 @@ TRJM Gateway - Translator Agent
 Produces draft translations with glossary and token protection
 """
 
-import json
-from typing import Optional
+import asyncio
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Set, Tuple, Union
 
-import yaml
+from pydantic import BaseModel, Field, ValidationError
 
+from ....core.config import settings
 from ....core.logging import logger
-from ....llm.provider import (
-    LLMProvider,
-    Message,
-    MessageRole,
-    ResponseFormat,
-    ResponseFormatType,
-)
+from ....llm.provider import LLMProvider, Message, MessageRole
 from ..schemas import (
     GlossaryTermApplied,
     ProtectedTokenStatus,
@@ -24,6 +20,13 @@ from ..schemas import (
     TranslatorInput,
     TranslatorOutput,
 )
+from .parsing import (
+    complete_json_model,
+    estimate_output_tokens,
+    parse_json_model,
+    response_format_for,
+)
+from .templates import PromptTemplate, bullet_list, load_prompts_file, prompt_build_is_heavy
 
 
 # Style instruction templates
@@ -41,41 +44,60 @@ Use passive voice where appropriate. Maintain impersonal tone.
 Reference official document conventions.""",
 }
 
+# Batched translation prompt; segments are numbered from 1 and separated by
+# SEGMENT_DELIMITER on its own line
+SEGMENT_DELIMITER = "%%%SEG%%%"
 
-class TranslatorAgent:
-    """
-    Translator agent for producing translations.
+BATCH_USER_PROMPT_TEMPLATE = PromptTemplate(
+    """Translate each numbered segment below from {source_language} to {target_language}.
+Segments are separated by a line containing only {delimiter}. Translate every segment
+independently; do not merge, split or drop segments.
 
-    Responsibilities:
-    - Generate accurate translations
-    - Enforce glossary terms
-    - Preserve protected tokens unchanged
-    - Apply style guidelines
-    """
+PROTECTED TOKENS (DO NOT TRANSLATE - keep exactly as shown):
+{protected_tokens}
 
-    def __init__(self, llm_provider: LLMProvider, prompts_path: Optional[str] = None):
-        """
-        Initialize the translator agent.
+GLOSSARY (USE THESE EXACT TRANSLATIONS):
+{glossary_entries}
 
-        Args:
-            llm_provider: LLM provider instance
-            prompts_path: Path to prompts YAML file
-        """
-        self.llm = llm_provider
-        self.prompts = self._load_prompts(prompts_path)
+SOURCE SEGMENTS:
+---
+{segments}
+---
 
-    def _load_prompts(self, path: Optional[str]) -> dict:
-        """Load prompt templates from YAML."""
-        if path:
-            try:
-                with open(path, "r", encoding="utf-8") as f:
-                    return yaml.safe_load(f)
-            except Exception as e:
-                logger.warning(f"Failed to load prompts from {path}: {e}")
+Respond with a JSON object of the form {{"translations": [{{"idx": <segment number>, "translation": "..."}}]}}
+with exactly one entry per segment. Entries may also include protected_tokens_preserved,
+glossary_terms_applied and translator_notes."""
+)
+
+
+class _TranslatorLLMPayload(BaseModel):
+    """JSON payload the translator model returns for one text."""
+
+    translation: str = ""
+    protected_tokens_preserved: List[ProtectedTokenStatus] = Field(default_factory=list)
+    glossary_terms_applied: List[GlossaryTermApplied] = Field(default_factory=list)
+    translator_notes: Optional[str] = None
 
-        # Default prompts
-        return {
-            "system_prompt": """You are an expert translator specializing in English-Arabic translation.
+
+class _TranslatorBatchEntry(_TranslatorLLMPayload):
+    """One numbered segment of a batched translation."""
+
+    idx: int
+
+
+class _TranslatorBatchLLMPayload(BaseModel):
+    """JSON payload the translator model returns for a batch of segments."""
+
+    translations: List[_TranslatorBatchEntry] = Field(default_factory=list)
+
+
+_RESPONSE_FORMAT = response_format_for(_TranslatorLLMPayload, "translation")
+_BATCH_RESPONSE_FORMAT = response_format_for(_TranslatorBatchLLMPayload, "batch_translation")
+
+
+# Default prompts, used when no prompts file is given
+DEFAULT_PROMPTS = {
+    "system_prompt": """You are an expert translator specializing in English-Arabic translation.
 You produce high-quality, culturally appropriate translations.
 
 CRITICAL RULES:
@@ -96,10 +118,7 @@ Your response must be a valid JSON object with:
 2. protected_tokens_preserved: List of {original, preserved: bool}
 3. glossary_terms_applied: List of {source_term, applied_translation, count}
 4. translator_notes: Any notes about translation decisions""",
-            "user_prompt_template": """Translate the following text from {source_language} to {target_language}.
-
-STYLE: {style_preset}
-{style_instructions}
+    "user_prompt_template": """Translate the following text from {source_language} to {target_language}.
 
 PROTECTED TOKENS (DO NOT TRANSLATE - keep exactly as shown):
 {protected_tokens}
@@ -113,14 +132,67 @@ SOURCE TEXT:
 ---
 
 Provide your translation as a JSON object.""",
+}
+
+
+class TranslatorAgent:
+    """
+    Translator agent for producing translations.
+
+    Responsibilities:
+    - Generate accurate translations
+    - Enforce glossary terms
+    - Preserve protected tokens unchanged
+    - Apply style guidelines
+    """
+
+    def __init__(self, llm_provider: LLMProvider, prompts_path: Optional[str] = None):
+        """
+        Initialize the translator agent.
+
+        Args:
+            llm_provider: LLM provider instance
+            prompts_path: Path to prompts YAML file
+        """
+        self.llm = llm_provider
+        self.prompts = self._load_prompts(prompts_path)
+
+        # One system message per style, built once so every request of a style
+        # starts with byte-identical content that provider prefix caches can
+        # reuse. Kept to a single leading system message, since many chat
+        # templates reject a second one
+        self._system_messages = {
+            style: Message(
+                role=MessageRole.SYSTEM,
+                content=f"{self.prompts['system_prompt']}\n\nSTYLE: {style.value}\n{instructions}",
+            )
+            for style, instructions in STYLE_INSTRUCTIONS.items()
         }
+        self._user_prompt_template = PromptTemplate(self.prompts["user_prompt_template"])
+
+    def _system_message_for(self, style: StylePreset) -> Message:
+        """Get the system message for a style (neutral if it has no instructions)."""
+        return self._system_messages.get(style, self._system_messages[StylePreset.NEUTRAL])
+
+    def _load_prompts(self, path: Optional[str]) -> dict:
+        """Load prompt templates from YAML (parsed once per path)."""
+        if path:
+            try:
+                return load_prompts_file(path)
+            except Exception as e:
+                logger.warning(f"Failed to load prompts from {path}: {e}")
+
+        return DEFAULT_PROMPTS
 
-    async def translate(self, input_data: TranslatorInput) -> TranslatorOutput:
+    async def translate(
+        self, input_data: TranslatorInput, temperature: float = 0.3
+    ) -> TranslatorOutput:
         """
         Generate a translation.
 
         Args:
             input_data: Translator input with text and configuration
+            temperature: Sampling temperature
 
         Returns:
             TranslatorOutput with translation and metadata
@@ -133,91 +205,309 @@ Provide your translation as a JSON object.""",
             style=input_data.style_preset.value,
         )
 
-        # Format protected tokens
-        protected_tokens_str = (
-            "\n".join(f"- {token}" for token in input_data.protected_tokens)
-            if input_data.protected_tokens
-            else "None"
-        )
+        # Build user prompt, off the event loop when it is large
+        if prompt_build_is_heavy(
+            len(input_data.text), len(input_data.glossary_entries), input_data.prompt_context
+        ):
+            user_prompt = await asyncio.to_thread(self._build_user_prompt, input_data)
+        else:
+            user_prompt = self._build_user_prompt(input_data)
 
-        # Format glossary entries
-        glossary_str = (
-            "\n".join(
-                f"- {entry.source} → {entry.target}" for entry in input_data.glossary_entries
-            )
-            if input_data.glossary_entries
-            else "None"
-        )
+        messages = [
+            self._system_message_for(input_data.style_preset),
+            Message(role=MessageRole.USER, content=user_prompt),
+        ]
 
-        # Get style instructions
-        style_instructions = STYLE_INSTRUCTIONS.get(
-            input_data.style_preset, STYLE_INSTRUCTIONS[StylePreset.NEUTRAL]
+        # Call LLM, re-asking if the response cannot be parsed
+        payload, response = await complete_json_model(
+            self.llm,
+            _TranslatorLLMPayload,
+            messages=messages,
+            temperature=temperature,
+            # Arabic output runs longer than the source
+            max_tokens=estimate_output_tokens(len(input_data.text), 200, 1.5, 8192),
+            response_format=_RESPONSE_FORMAT,
+            agent="Translator",
         )
+        if payload is None:
+            logger.error("Translator agent: Failed to parse JSON response")
+            # Try to extract translation from raw response
+            return TranslatorOutput(
+                translation=response.content,
+                translator_notes="Warning: Failed to parse structured response",
+            )
 
-        # Build user prompt
-        user_prompt = self.prompts["user_prompt_template"].format(
+        return TranslatorOutput.model_construct(**dict(payload))
+
+    def _build_user_prompt(self, input_data: TranslatorInput) -> str:
+        """
+        Render the user prompt for one input.
+
+        Style lives in its own system message; the style fields are still passed
+        for custom templates that reference them.
+        """
+        protected_tokens_str, glossary_str = self._format_context(input_data)
+        return self._user_prompt_template.render(
             source_language=input_data.source_language.value,
             target_language=input_data.target_language.value,
             style_preset=input_data.style_preset.value,
-            style_instructions=style_instructions,
+            style_instructions=STYLE_INSTRUCTIONS.get(
+                input_data.style_preset, STYLE_INSTRUCTIONS[StylePreset.NEUTRAL]
+            ),
             protected_tokens=protected_tokens_str,
             glossary_entries=glossary_str,
             input_text=input_data.text,
         )
 
+    async def translate_batch(
+        self, inputs: Sequence[TranslatorInput], temperature: float = 0.3
+    ) -> List[TranslatorOutput]:
+        """
+        Translate several inputs, packing compatible ones into shared LLM calls.
+
+        Inputs with the same languages, style, protected tokens and glossary are
+        sent together as numbered segments, bounded by the configured segment
+        and character limits. Segments missing from a batched response are
+        translated individually.
+
+        Args:
+            inputs: Translator inputs
+            temperature: Sampling temperature
+
+        Returns:
+            List of TranslatorOutput in input order
+        """
+        chunks = self._chunk_inputs(inputs)
+        chunk_outputs = await asyncio.gather(
+            *(self._translate_chunk([inputs[i] for i in chunk], temperature) for chunk in chunks)
+        )
+
+        results: Dict[int, TranslatorOutput] = {}
+        for chunk, outputs in zip(chunks, chunk_outputs, strict=True):
+            results.update(zip(chunk, outputs, strict=True))
+        return [results[i] for i in range(len(inputs))]
+
+    @staticmethod
+    def _chunk_inputs(inputs: Sequence[TranslatorInput]) -> List[List[int]]:
+        """Group input indices into batches that can share one prompt."""
+        groups: Dict[tuple, List[int]] = defaultdict(list)
+        for i, item in enumerate(inputs):
+            key = (
+                item.source_language,
+                item.target_language,
+                item.style_preset,
+                tuple(item.protected_tokens),
+                tuple((entry.source, entry.target) for entry in item.glossary_entries),
+            )
+            groups[key].append(i)
+
+        chunks: List[List[int]] = []
+        for indices in groups.values():
+            chunk: List[int] = []
+            chars = 0
+            for i in indices:
+                size = len(inputs[i].text)
+                if chunk and (
+                    len(chunk) >= settings.translator_batch_max_segments
+                    or chars + size > settings.translator_batch_max_chars
+                ):
+                    chunks.append(chunk)
+                    chunk, chars = [], 0
+                chunk.append(i)
+                chars += size
+            chunks.append(chunk)
+        return chunks
+
+    async def _translate_chunk(
+        self, chunk: List[TranslatorInput], temperature: float
+    ) -> List[TranslatorOutput]:
+        """Translate one batch of compatible inputs in a single LLM call."""
+        if len(chunk) == 1:
+            return [await self.translate(chunk[0], temperature=temperature)]
+
+        first = chunk[0]
+        logger.info(
+            "Translator agent processing batch",
+            segments=len(chunk),
+            text_length=sum(len(item.text) for item in chunk),
+            source=first.source_language.value,
+            target=first.target_language.value,
+            style=first.style_preset.value,
+        )
+
+        protected_tokens_str, glossary_str = self._format_context(first)
+        segments = f"\n{SEGMENT_DELIMITER}\n".join(
+            f"[{idx}]\n{item.text}" for idx, item in enumerate(chunk, start=1)
+        )
+        user_prompt = BATCH_USER_PROMPT_TEMPLATE.render(
+            source_language=first.source_language.value,
+            target_language=first.target_language.value,
+            delimiter=SEGMENT_DELIMITER,
+            protected_tokens=protected_tokens_str,
+            glossary_entries=glossary_str,
+            segments=segments,
+        )
+
         messages = [
-            Message(role=MessageRole.SYSTEM, content=self.prompts["system_prompt"]),
+            self._system_message_for(first.style_preset),
             Message(role=MessageRole.USER, content=user_prompt),
         ]
 
-        # Call LLM
         response = await self.llm.chat_completion(
             messages=messages,
-            temperature=0.3,
-            max_tokens=8192,
-            response_format=ResponseFormat(type=ResponseFormatType.JSON_OBJECT),
+            temperature=temperature,
+            max_tokens=estimate_output_tokens(
+                sum(len(item.text) for item in chunk), 200 + 30 * len(chunk), 1.5, 8192
+            ),
+            response_format=_BATCH_RESPONSE_FORMAT,
         )
 
-        # Parse response
+        # Map numbered entries back to their inputs
+        outputs: Dict[int, TranslatorOutput] = {}
         try:
-            data = json.loads(response.content)
-            return self._parse_output(data)
-        except json.JSONDecodeError as e:
-            logger.error("Translator agent: Failed to parse JSON response", error=str(e))
-            # Try to extract translation from raw response
-            return TranslatorOutput(
-                translation=response.content,
-                translator_notes="Warning: Failed to parse structured response",
+            payload = parse_json_model(response.content, _TranslatorBatchLLMPayload)
+            for entry in payload.translations:
+                if entry.translation and 1 <= entry.idx <= len(chunk):
+                    fields = dict(entry)
+                    del fields["idx"]
+                    outputs[entry.idx - 1] = TranslatorOutput.model_construct(**fields)
+        except ValidationError as e:
+            logger.error("Translator agent: Failed to parse batch JSON response", error=str(e))
+
+        missing = [i for i in range(len(chunk)) if i not in outputs]
+        if missing:
+            logger.warning(
+                "Translator agent: Incomplete batch response, translating segments individually",
+                missing=len(missing),
+                segments=len(chunk),
+            )
+            retried = await asyncio.gather(
+                *(self.translate(chunk[i], temperature=temperature) for i in missing)
             )
+            outputs.update(zip(missing, retried, strict=True))
+
+        return [outputs[i] for i in range(len(chunk))]
+
+    @staticmethod
+    def _format_context(input_data: TranslatorInput) -> Tuple[str, str]:
+        """Format protected tokens and glossary entries for the prompt."""
+        if input_data.prompt_context is not None:
+            context = input_data.prompt_context
+            return context.protected_tokens_str, context.glossary_str
+
+        protected_tokens_str = bullet_list(input_data.protected_tokens)
+        glossary_str = bullet_list(
+            [f"{entry.source} → {entry.target}" for entry in input_data.glossary_entries]
+        )
+        return protected_tokens_str, glossary_str
 
-    def _parse_output(self, data: dict) -> TranslatorOutput:
-        """Parse LLM response into TranslatorOutput."""
-        # Parse protected tokens status
-        protected_tokens = []
-        for token in data.get("protected_tokens_preserved", []):
-            if isinstance(token, dict):
-                protected_tokens.append(
-                    ProtectedTokenStatus(
-                        original=token.get("original", ""),
-                        preserved=token.get("preserved", True),
-                    )
-                )
-
-        # Parse glossary terms applied
-        glossary_terms = []
-        for term in data.get("glossary_terms_applied", []):
-            if isinstance(term, dict):
-                glossary_terms.append(
-                    GlossaryTermApplied(
-                        source_term=term.get("source_term", ""),
-                        applied_translation=term.get("applied_translation", ""),
-                        count=term.get("count", 1),
-                    )
-                )
-
-        return TranslatorOutput(
-            translation=data.get("translation", ""),
-            protected_tokens_preserved=protected_tokens,
-            glossary_terms_applied=glossary_terms,
-            translator_notes=data.get("translator_notes"),
+
+class TranslatorBatchQueue:
+    """
+    Collects concurrent translator calls and flushes them as batches.
+
+    Callers `await enqueue(input)` and get their own result. Pending inputs
+    are flushed through `TranslatorAgent.translate_batch` once the segment or
+    character limit is reached, as many inputs are pending as callers can run
+    at once, every expected caller has enqueued, or the wait window expires.
+    """
+
+    def __init__(
+        self,
+        agent: TranslatorAgent,
+        max_wait_ms: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        expected: Optional[int] = None,
+        temperature: float = 0.3,
+    ):
+        """
+        Initialize the queue.
+
+        Args:
+            agent: Translator agent used to run batches
+            max_wait_ms: Collection window in milliseconds (defaults to settings)
+            max_pending: Callers that can be waiting at once, e.g. the caller's
+                concurrency limit; reaching it flushes immediately
+            expected: Total inputs that will be enqueued; the last one flushes
+                immediately
+            temperature: Sampling temperature for the batches
+        """
+        self.agent = agent
+        self.max_wait = (
+            max_wait_ms if max_wait_ms is not None else settings.translator_batch_wait_ms
+        ) / 1000
+        self.max_pending = min(
+            max_pending or settings.translator_batch_max_segments,
+            settings.translator_batch_max_segments,
         )
+        self.expected = expected
+        self.temperature = temperature
+        self._enqueued = 0
+        self._pending: List[Tuple[TranslatorInput, "asyncio.Future[TranslatorOutput]"]] = []
+        self._pending_chars = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._inflight: Set[asyncio.Task] = set()
+
+    async def enqueue(self, input_data: TranslatorInput) -> TranslatorOutput:
+        """
+        Queue an input and wait for its translation.
+
+        Args:
+            input_data: Translator input
+
+        Returns:
+            TranslatorOutput for this input
+        """
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[TranslatorOutput]" = loop.create_future()
+        self._pending.append((input_data, future))
+        self._pending_chars += len(input_data.text)
+        self._enqueued += 1
+
+        if (
+            len(self._pending) >= self.max_pending
+            or self._pending_chars >= settings.translator_batch_max_chars
+            or (self.expected is not None and self._enqueued >= self.expected)
+        ):
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self.flush)
+
+        return await future
+
+    def flush(self) -> None:
+        """Dispatch everything pending as one batch."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+
+        items, self._pending, self._pending_chars = self._pending, [], 0
+        task = asyncio.create_task(self._dispatch(items))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(
+        self, items: List[Tuple[TranslatorInput, "asyncio.Future[TranslatorOutput]"]]
+    ) -> None:
+        """Run one batch and fan results out to the waiting callers."""
+        results: Sequence[Union[TranslatorOutput, Exception]]
+        try:
+            results = await self.agent.translate_batch(
+                [item for item, _ in items], temperature=self.temperature
+            )
+        except asyncio.CancelledError:
+            for _, future in items:
+                future.cancel()
+            raise
+        except Exception as e:
+            results = [e] * len(items)
+
+        for (_, future), result in zip(items, results, strict=True):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
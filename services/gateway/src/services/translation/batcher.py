@@ -0,0 +1,180 @@
+"""
+TRJM Gateway - Translation Request Batcher
+===========================================
+Coalesces concurrent translate requests into pipeline batch calls
+"""
+
+import asyncio
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+from ...core.config import settings
+from ...core.logging import logger
+from .pipeline import TranslationPipeline, get_pipeline
+from .schemas import GlossaryEntry, TranslationRequest, TranslationResult
+
+# Queue item: (request, glossary entries, waiter future)
+_BatchItem = Tuple[TranslationRequest, List[GlossaryEntry], "asyncio.Future[TranslationResult]"]
+
+
+class TranslateBatcher:
+    """
+    Micro-batching queue in front of the translation pipeline.
+
+    Requests arriving within a short window (or until the batch is full)
+    are grouped by (target_language, style_preset) and dispatched through
+    a single `translate_batch` call. Each caller awaits its own future.
+    """
+
+    def __init__(
+        self,
+        pipeline: Optional[TranslationPipeline] = None,
+        max_batch_size: Optional[int] = None,
+        max_wait_ms: Optional[int] = None,
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            pipeline: Translation pipeline (uses singleton if None)
+            max_batch_size: Max requests per batch (defaults to settings)
+            max_wait_ms: Coalescing window in milliseconds (defaults to settings)
+        """
+        self.pipeline = pipeline or get_pipeline()
+        self.max_batch_size = max_batch_size or settings.translate_batch_max_size
+        self.max_wait = (max_wait_ms or settings.translate_batch_wait_ms) / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._inflight: Set[asyncio.Task] = set()
+
+    async def submit(
+        self,
+        request: TranslationRequest,
+        glossary_entries: Optional[List[GlossaryEntry]] = None,
+    ) -> TranslationResult:
+        """
+        Queue a request and wait for its result.
+
+        Args:
+            request: Translation request
+            glossary_entries: Optional glossary entries to enforce
+
+        Returns:
+            TranslationResult for this request
+        """
+        queue = self._ensure_running()
+        future: "asyncio.Future[TranslationResult]" = asyncio.get_running_loop().create_future()
+        await queue.put((request, glossary_entries or [], future))
+        return await future
+
+    def _ensure_running(self) -> asyncio.Queue:
+        """Start the dispatch loop on first use and return its queue."""
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(self._queue))
+        return self._queue
+
+    async def _run(self, queue: asyncio.Queue) -> None:
+        """Collect batches from the queue and dispatch them."""
+        items: List[_BatchItem] = []
+        try:
+            while True:
+                items = [await queue.get()]
+
+                loop = asyncio.get_running_loop()
+                deadline = loop.time() + self.max_wait
+                while len(items) < self.max_batch_size:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        items.append(await asyncio.wait_for(queue.get(), remaining))
+                    except TimeoutError:
+                        break
+
+                # Group into homogeneous batches
+                groups: Dict[Tuple[str, str], List[_BatchItem]] = defaultdict(list)
+                for item in items:
+                    request = item[0]
+                    groups[(request.target_language.value, request.style_preset.value)].append(item)
+
+                for group in groups.values():
+                    task = asyncio.create_task(self._dispatch(group))
+                    self._inflight.add(task)
+                    task.add_done_callback(self._inflight.discard)
+                items = []
+        except asyncio.CancelledError:
+            # Nothing will dispatch these any more; don't leave their callers hanging
+            for _, _, future in items:
+                future.cancel()
+            self._cancel_queued()
+            raise
+
+    def _cancel_queued(self) -> None:
+        """Cancel the futures of requests still waiting in the queue."""
+        while self._queue is not None and not self._queue.empty():
+            _, _, future = self._queue.get_nowait()
+            future.cancel()
+
+    async def _dispatch(self, group: List[_BatchItem]) -> None:
+        """Run one batch through the pipeline and fan results out."""
+        logger.debug("Dispatching translation batch", batch_size=len(group))
+
+        try:
+            results = await self.pipeline.translate_batch(
+                [request for request, _, _ in group],
+                [entries for _, entries, _ in group],
+                return_exceptions=True,
+            )
+        except asyncio.CancelledError:
+            for _, _, future in group:
+                future.cancel()
+            raise
+        except Exception as e:
+            results = [e] * len(group)
+
+        for (_, _, future), result in zip(group, results, strict=True):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    async def close(self) -> None:
+        """Stop the dispatch loop, cancel queued requests and finish in-flight batches."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        self._cancel_queued()
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+
+
+# =============================================================================
+# Singleton Batcher Instance
+# =============================================================================
+
+_batcher: Optional[TranslateBatcher] = None
+
+
+def get_batcher() -> TranslateBatcher:
+    """Get or create the translate batcher singleton."""
+    global _batcher
+    if _batcher is None:
+        _batcher = TranslateBatcher()
+    return _batcher
+
+
+async def close_batcher() -> None:
+    """Stop the batcher singleton if running."""
+    global _batcher
+    if _batcher is not None:
+        await _batcher.close()
+        _batcher = None
@@ -4,18 +4,37 @@ TRJM Gateway - Translation Pipeline Orchestrator
 Orchestrates the multi-agent translation pipeline
 """
 
+import asyncio
 import re
 import time
-from typing import List, Optional
+from bisect import bisect_right
+from collections import Counter
+from dataclasses import replace
+from functools import cached_property, lru_cache
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+    overload,
+)
 
 from ...core.config import settings
 from ...core.logging import logger
-from ...llm.factory import get_llm_provider
+from ...llm.factory import get_classification_llm_provider, get_llm_provider
 from ...llm.provider import LLMProvider
 from .agents.post_processor import PostProcessorAgent
 from .agents.reviewer import ReviewerAgent
 from .agents.router import RouterAgent
-from .agents.translator import TranslatorAgent
+from .agents.templates import build_prompt_context
+from .agents.translator import TranslatorAgent, TranslatorBatchQueue
 from .schemas import (
     GlossaryEntry,
     IssueCategory,
@@ -26,6 +45,7 @@ from .schemas import (
     QAIssue,
     QAReport,
     ReviewerInput,
+    ReviewerOutput,
     RouterInput,
     StylePreset,
     TranslationRequest,
@@ -33,26 +53,35 @@ from .schemas import (
     TranslatorInput,
 )
 
+# Confidence level mapping: scores at or above each threshold get the next label
+_CONFIDENCE_THRESHOLDS = (0.25, 0.50, 0.75, 0.90)
+_CONFIDENCE_LEVELS = ("unacceptable", "poor", "acceptable", "good", "excellent")
+
 
-# Confidence level mapping
 def get_confidence_level(score: float) -> str:
     """Map confidence score to level string."""
-    if score >= 0.90:
-        return "excellent"
-    elif score >= 0.75:
-        return "good"
-    elif score >= 0.50:
-        return "acceptable"
-    elif score >= 0.25:
-        return "poor"
-    else:
-        return "unacceptable"
-
-
-# Default protected token patterns
+    return _CONFIDENCE_LEVELS[bisect_right(_CONFIDENCE_THRESHOLDS, score)]
+
+
+T = TypeVar("T")
+
+# Translator temperatures of parallel retry attempts: 0.4, 0.5, ...
+RETRY_BASE_TEMPERATURE = 0.3
+RETRY_TEMPERATURE_STEP = 0.1
+
+
+async def _timed(awaitable: Awaitable[T]) -> Tuple[T, int]:
+    """Await and return the result with its wall-clock time in milliseconds."""
+    start = time.perf_counter_ns()
+    result = await awaitable
+    return result, (time.perf_counter_ns() - start) // 1_000_000
+
+
+# Default protected token patterns, tried in order at each position, so longer
+# forms come before their prefixes
 DEFAULT_PROTECTED_PATTERNS = [
-    r"\{[^}]+\}",  # {placeholders}
     r"\{\{[^}]+\}\}",  # {{placeholders}}
+    r"\{[^}]+\}",  # {placeholders}
     r"%[sd]",  # %s, %d format strings
     r"https?://[^\s]+",  # URLs
     r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}",  # Emails
@@ -62,6 +91,33 @@ DEFAULT_PROTECTED_PATTERNS = [
 ]
 
 
+def _compile_alternation(patterns: Sequence[str]) -> "re.Pattern[str]":
+    """
+    Compile patterns into one alternation, so the text is scanned once.
+
+    Invalid patterns are logged and left out here rather than failing every
+    request; with none left the result matches nothing.
+    """
+    alternatives = []
+    for pattern in patterns:
+        try:
+            re.compile(pattern)
+        except re.error as e:
+            logger.error("Invalid default protected pattern", pattern=pattern, error=str(e))
+            continue
+        alternatives.append(f"(?:{pattern})")
+    return re.compile("|".join(alternatives) if alternatives else "(?!)")
+
+
+_DEFAULT_PROTECTED_RE = _compile_alternation(DEFAULT_PROTECTED_PATTERNS)
+
+
+@lru_cache(maxsize=256)
+def _compile_custom_pattern(pattern: str) -> "re.Pattern[str]":
+    """Compile a request's custom protected pattern (cached across requests)."""
+    return re.compile(pattern)
+
+
 class TranslationPipeline:
     """
     Orchestrates the translation pipeline.
@@ -80,6 +136,7 @@ class TranslationPipeline:
         llm_provider: Optional[LLMProvider] = None,
         confidence_threshold: float = 0.75,
         max_retries: int = 2,
+        classification_llm_provider: Optional[LLMProvider] = None,
     ):
         """
         Initialize the translation pipeline.
@@ -88,29 +145,50 @@ class TranslationPipeline:
             llm_provider: LLM provider instance (uses factory if None)
             confidence_threshold: Minimum confidence to accept translation
             max_retries: Maximum retry attempts for low-confidence translations
+            classification_llm_provider: Provider for the Router agent (uses the
+                factory's classification provider if both providers are None,
+                llm_provider otherwise)
         """
+        if classification_llm_provider is None and llm_provider is None:
+            classification_llm_provider = get_classification_llm_provider()
         self.llm = llm_provider or get_llm_provider()
+        self.classification_llm = classification_llm_provider or self.llm
         self.confidence_threshold = confidence_threshold
         self.max_retries = max_retries
 
-        # Initialize agents
-        self.router = RouterAgent(self.llm)
-        self.translator = TranslatorAgent(self.llm)
-        self.reviewer = ReviewerAgent(self.llm)
-        self.post_processor = PostProcessorAgent()  # Rule-based by default
-
         logger.info(
             "Translation pipeline initialized",
             provider=self.llm.provider_name,
             model=self.llm.default_model,
+            router_model=self.classification_llm.default_model,
             confidence_threshold=confidence_threshold,
             max_retries=max_retries,
         )
 
+    # Agents are built on first use, so a pipeline that only runs some of them
+    # never loads the others' prompts
+
+    @cached_property
+    def router(self) -> RouterAgent:
+        return RouterAgent(self.llm, classification_llm_provider=self.classification_llm)
+
+    @cached_property
+    def translator(self) -> TranslatorAgent:
+        return TranslatorAgent(self.llm)
+
+    @cached_property
+    def reviewer(self) -> ReviewerAgent:
+        return ReviewerAgent(self.llm)
+
+    @cached_property
+    def post_processor(self) -> PostProcessorAgent:
+        return PostProcessorAgent()  # Rule-based by default
+
     async def translate(
         self,
         request: TranslationRequest,
         glossary_entries: Optional[List[GlossaryEntry]] = None,
+        translator_queue: Optional[TranslatorBatchQueue] = None,
     ) -> TranslationResult:
         """
         Execute the full translation pipeline.
@@ -118,11 +196,48 @@ class TranslationPipeline:
         Args:
             request: Translation request
             glossary_entries: Optional glossary entries to enforce
+            translator_queue: Optional queue that packs the draft translation
+                together with those of concurrent requests
 
         Returns:
             TranslationResult with translation and QA report
+
+        Raises:
+            RuntimeError: If the stream ended without a result
+        """
+        # Run the stream to the end so the generator finishes on its own
+        result: Optional[TranslationResult] = None
+        async for stage, payload in self.translate_stream(
+            request, glossary_entries, translator_queue
+        ):
+            if stage == "result":
+                result = payload
+        if result is None:
+            raise RuntimeError("Translation pipeline finished without a result")
+        return result
+
+    async def translate_stream(
+        self,
+        request: TranslationRequest,
+        glossary_entries: Optional[List[GlossaryEntry]] = None,
+        translator_queue: Optional[TranslatorBatchQueue] = None,
+    ) -> AsyncIterator[Tuple[str, Any]]:
         """
-        start_time = time.time()
+        Execute the full translation pipeline, yielding each stage's output.
+
+        Yields (stage, payload) as stages complete: ("router", RouterOutput),
+        ("translator_draft", TranslatorOutput), ("reviewer", ReviewerOutput)
+        for the accepted review after any retries, ("post_processor",
+        PostProcessorOutput) and finally ("result", TranslationResult). The
+        pipeline waits while the caller handles each stage.
+
+        Args:
+            request: Translation request
+            glossary_entries: Optional glossary entries to enforce
+            translator_queue: Optional queue that packs the draft translation
+                together with those of concurrent requests
+        """
+        start_time = time.perf_counter_ns()
         agent_timings = {}
         total_tokens = 0
         retries = 0
@@ -138,14 +253,22 @@ class TranslationPipeline:
         )
 
         # Step 1: Router Agent - Analyze input
-        router_start = time.time()
+        router_start = time.perf_counter_ns()
         router_input = RouterInput(
             text=request.text,
             target_language=request.target_language,
             style_hint=request.style_preset,
         )
-        router_output = await self.router.analyze(router_input)
-        agent_timings["router_ms"] = int((time.time() - router_start) * 1000)
+        router_task = asyncio.create_task(self.router.analyze(router_input))
+
+        # Let the router send its request, then scan the text for protected
+        # tokens while it is in flight
+        await asyncio.sleep(0)
+        pattern_tokens = self._extract_pattern_tokens(request.text, request.protected_patterns)
+
+        router_output = await router_task
+        agent_timings["router_ms"] = (time.perf_counter_ns() - router_start) // 1_000_000
+        yield "router", router_output
 
         # Determine source language
         source_language = (
@@ -154,13 +277,14 @@ class TranslationPipeline:
             else request.source_language
         )
 
-        # Extract protected tokens from text
-        protected_tokens = self._extract_protected_tokens(
-            request.text,
-            request.protected_patterns,
-            router_output.special_elements,
+        # Add the protected elements the router found
+        protected_tokens = self._merge_special_elements(
+            pattern_tokens, router_output.special_elements
         )
 
+        # Prompt blocks shared by every translator/reviewer call of this job
+        prompt_context = build_prompt_context(protected_tokens, glossary_entries)
+
         # Determine style (use router recommendation if no explicit preference)
         style = request.style_preset or router_output.recommended_style
 
@@ -173,7 +297,7 @@ class TranslationPipeline:
         )
 
         # Step 2: Translator Agent - Generate translation
-        translator_start = time.time()
+        translator_start = time.perf_counter_ns()
         translator_input = TranslatorInput(
             text=request.text,
             source_language=source_language,
@@ -181,12 +305,17 @@ class TranslationPipeline:
             style_preset=style,
             protected_tokens=protected_tokens,
             glossary_entries=glossary_entries,
+            prompt_context=prompt_context,
         )
-        translator_output = await self.translator.translate(translator_input)
-        agent_timings["translator_ms"] = int((time.time() - translator_start) * 1000)
-
-        # Step 3: Reviewer Agent - QA validation
-        reviewer_start = time.time()
+        if translator_queue is not None:
+            translator_output = await translator_queue.enqueue(translator_input)
+        else:
+            translator_output = await self.translator.translate(translator_input)
+        agent_timings["translator_ms"] = (time.perf_counter_ns() - translator_start) // 1_000_000
+        yield "translator_draft", translator_output
+
+        # Step 3: Reviewer Agent - QA validation, with the post-processor run on
+        # the draft alongside it; its output is kept if the draft is not changed
         reviewer_input = ReviewerInput(
             source_text=request.text,
             translation=translator_output.translation,
@@ -195,68 +324,100 @@ class TranslationPipeline:
             style_preset=style,
             protected_tokens=protected_tokens,
             glossary_entries=glossary_entries,
+            prompt_context=prompt_context,
         )
-        reviewer_output = await self.reviewer.review(reviewer_input)
-        agent_timings["reviewer_ms"] = int((time.time() - reviewer_start) * 1000)
-
-        # Step 4: Retry if confidence is low
-        current_translation = reviewer_output.corrected_translation
-        current_confidence = reviewer_output.confidence_score
-        current_issues = reviewer_output.issues
+        speculative_post_processor_input = PostProcessorInput(
+            translation=translator_output.translation,
+            target_language=request.target_language,
+            protected_tokens=protected_tokens,
+        )
+        (reviewer_output, reviewer_ms), (speculative_post_processor_output, post_processor_ms) = (
+            await asyncio.gather(
+                _timed(self._review(reviewer_input)),
+                _timed(self.post_processor.process(speculative_post_processor_input)),
+            )
+        )
+        agent_timings["reviewer_ms"] = reviewer_ms
 
-        while current_confidence < self.confidence_threshold and retries < self.max_retries:
-            retries += 1
+        # Step 4: Retry if confidence is low; reviewer_output tracks the best review
+        if reviewer_output.confidence_score < self.confidence_threshold and self.max_retries > 0:
             logger.info(
                 "Retrying translation due to low confidence",
-                confidence=current_confidence,
-                retry_number=retries,
+                confidence=reviewer_output.confidence_score,
+                attempts=self.max_retries,
             )
 
-            # Re-translate with stricter constraints
-            retry_translator_input = TranslatorInput(
-                text=request.text,
-                source_language=source_language,
-                target_language=request.target_language,
-                style_preset=style,
-                protected_tokens=protected_tokens,
-                glossary_entries=glossary_entries,
+            # Re-translate and re-review every attempt at once, each at its own
+            # temperature so identical in-flight requests are not coalesced
+            attempts = [
+                asyncio.create_task(
+                    self._retranslate_and_review(
+                        translator_input,
+                        reviewer_input,
+                        temperature=RETRY_BASE_TEMPERATURE + RETRY_TEMPERATURE_STEP * (attempt + 1),
+                    )
+                )
+                for attempt in range(self.max_retries)
+            ]
+
+            # Stop waiting once an attempt clears the threshold; the remaining
+            # ones are cancelled and awaited so none outlives the request
+            try:
+                for next_review in asyncio.as_completed(attempts):
+                    if (await next_review).confidence_score >= self.confidence_threshold:
+                        break
+            finally:
+                pending = [attempt_task for attempt_task in attempts if not attempt_task.done()]
+                for attempt_task in pending:
+                    attempt_task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+
+            # Attempts that finished alongside the accepted one count too
+            retry_reviews: List[ReviewerOutput] = [
+                attempt_task.result()
+                for attempt_task in attempts
+                if not attempt_task.cancelled() and attempt_task.exception() is None
+            ]
+            retries = len(retry_reviews)
+            if retries < self.max_retries:
+                logger.info(
+                    "Retry attempt accepted, cancelling the rest",
+                    confidence=max(r.confidence_score for r in retry_reviews),
+                    cancelled=self.max_retries - retries,
+                )
+
+            # Use the best result; the first review wins ties
+            reviewer_output = max(
+                [reviewer_output, *retry_reviews], key=lambda r: r.confidence_score
             )
-            retry_output = await self.translator.translate(retry_translator_input)
 
-            # Re-review
-            retry_reviewer_input = ReviewerInput(
-                source_text=request.text,
-                translation=retry_output.translation,
-                source_language=source_language,
+        final_translation = reviewer_output.corrected_translation
+        confidence = reviewer_output.confidence_score
+        issues = reviewer_output.issues
+        yield "reviewer", reviewer_output
+
+        # Step 5: Post-Processor - Apply final formatting (already done if the
+        # draft was kept as is)
+        if final_translation == translator_output.translation:
+            post_processor_output = speculative_post_processor_output
+        else:
+            post_processor_input = PostProcessorInput(
+                translation=final_translation,
                 target_language=request.target_language,
-                style_preset=style,
                 protected_tokens=protected_tokens,
-                glossary_entries=glossary_entries,
             )
-            retry_review = await self.reviewer.review(retry_reviewer_input)
-
-            # Use the better result
-            if retry_review.confidence_score > current_confidence:
-                current_translation = retry_review.corrected_translation
-                current_confidence = retry_review.confidence_score
-                current_issues = retry_review.issues
-                reviewer_output = retry_review
-
-        # Step 5: Post-Processor - Apply final formatting
-        post_processor_start = time.time()
-        post_processor_input = PostProcessorInput(
-            translation=current_translation,
-            target_language=request.target_language,
-            protected_tokens=protected_tokens,
-        )
-        post_processor_output = await self.post_processor.process(post_processor_input)
-        agent_timings["post_processor_ms"] = int((time.time() - post_processor_start) * 1000)
+            post_processor_output, post_processor_ms = await _timed(
+                self.post_processor.process(post_processor_input)
+            )
+        agent_timings["post_processor_ms"] = post_processor_ms
+        yield "post_processor", post_processor_output
 
         # Build QA report
+        severity_counts = Counter(issue.severity for issue in issues)
         qa_report = QAReport(
-            confidence_score=current_confidence,
-            confidence_level=get_confidence_level(current_confidence),
-            issues=current_issues,
+            confidence_score=confidence,
+            confidence_level=get_confidence_level(confidence),
+            issues=issues,
             glossary_compliance=reviewer_output.glossary_compliance,
             protected_tokens_intact=reviewer_output.protected_tokens_intact,
             risky_spans=reviewer_output.risky_spans,
@@ -267,24 +428,16 @@ class TranslationPipeline:
                 "length_ratio": len(post_processor_output.processed_text) / len(request.text)
                 if request.text
                 else 0,
-                "total_issues": len(current_issues),
-                "critical_issues": sum(
-                    1 for i in current_issues if i.severity == IssueSeverity.CRITICAL
-                ),
-                "major_issues": sum(
-                    1 for i in current_issues if i.severity == IssueSeverity.MAJOR
-                ),
-                "minor_issues": sum(
-                    1 for i in current_issues if i.severity == IssueSeverity.MINOR
-                ),
-                "suggestions": sum(
-                    1 for i in current_issues if i.severity == IssueSeverity.SUGGESTION
-                ),
+                "total_issues": len(issues),
+                "critical_issues": severity_counts[IssueSeverity.CRITICAL],
+                "major_issues": severity_counts[IssueSeverity.MAJOR],
+                "minor_issues": severity_counts[IssueSeverity.MINOR],
+                "suggestions": severity_counts[IssueSeverity.SUGGESTION],
             },
         )
 
         # Build metadata
-        processing_time_ms = int((time.time() - start_time) * 1000)
+        processing_time_ms = (time.perf_counter_ns() - start_time) // 1_000_000
         metadata = PipelineMetadata(
             model_used=self.llm.default_model,
             retries=retries,
@@ -295,54 +448,192 @@ class TranslationPipeline:
 
         logger.info(
             "Translation pipeline completed",
-            confidence=current_confidence,
+            confidence=confidence,
             confidence_level=qa_report.confidence_level,
             retries=retries,
             processing_time_ms=processing_time_ms,
-            issues_count=len(current_issues),
+            issues_count=len(issues),
         )
 
-        return TranslationResult(
+        yield "result", TranslationResult(
             translation=post_processor_output.processed_text,
             source_language=source_language,
             target_language=request.target_language,
-            confidence=current_confidence,
+            confidence=confidence,
             qa_report=qa_report,
             retries=retries,
             metadata=metadata,
         )
 
-    def _extract_protected_tokens(
+    @overload
+    async def translate_batch(
         self,
-        text: str,
-        custom_patterns: List[str],
-        special_elements,
-    ) -> List[str]:
-        """Extract all tokens that should be protected from translation."""
-        protected = set()
+        requests: Sequence[TranslationRequest],
+        glossary_entries: Optional[Sequence[Optional[List[GlossaryEntry]]]] = ...,
+        return_exceptions: Literal[False] = ...,
+        concurrency: Optional[int] = ...,
+        same_document: bool = ...,
+    ) -> List[TranslationResult]: ...
+
+    @overload
+    async def translate_batch(
+        self,
+        requests: Sequence[TranslationRequest],
+        glossary_entries: Optional[Sequence[Optional[List[GlossaryEntry]]]] = ...,
+        *,
+        return_exceptions: Literal[True],
+        concurrency: Optional[int] = ...,
+        same_document: bool = ...,
+    ) -> List[Union[TranslationResult, BaseException]]: ...
+
+    async def translate_batch(
+        self,
+        requests: Sequence[TranslationRequest],
+        glossary_entries: Optional[Sequence[Optional[List[GlossaryEntry]]]] = None,
+        return_exceptions: bool = False,
+        concurrency: Optional[int] = None,
+        same_document: bool = False,
+    ) -> Sequence[Union[TranslationResult, BaseException]]:
+        """
+        Execute the pipeline for several requests concurrently.
 
-        # Extract from special elements
-        for element in special_elements:
-            if element.protect:
-                protected.add(element.value)
+        Args:
+            requests: Translation requests
+            glossary_entries: Optional per-request glossary entries (same order as requests)
+            return_exceptions: Return exceptions in place of results instead of
+                raising; otherwise the first failure cancels the other requests
+            concurrency: Max requests translated at once (defaults to settings)
+            same_document: The requests are paragraphs of one document, so their
+                drafts may share translator calls. Never set this for requests
+                from different callers: one prompt would carry all their texts.
 
+        Returns:
+            List of TranslationResult in request order; with return_exceptions,
+            failed requests hold their exception instead
+        """
+        glossaries = glossary_entries or [None] * len(requests)
+
+        logger.debug("Translation batch started", batch_size=len(requests))
+
+        limit = concurrency or settings.translate_batch_concurrency
+        semaphore = asyncio.Semaphore(limit)
+
+        # Paragraphs of one document share draft translation calls where
+        # possible; at most `limit` drafts can be waiting, so that many flush
+        # right away
+        translator_queue = (
+            TranslatorBatchQueue(
+                self.translator, max_pending=min(limit, len(requests)), expected=len(requests)
+            )
+            if same_document and settings.translator_batching_enabled and len(requests) > 1
+            else None
+        )
+
+        async def _translate(
+            request: TranslationRequest, entries: Optional[List[GlossaryEntry]]
+        ) -> TranslationResult:
+            async with semaphore:
+                return await self.translate(request, entries, translator_queue)
+
+        tasks = [
+            asyncio.create_task(_translate(request, entries))
+            for request, entries in zip(requests, glossaries, strict=True)
+        ]
+        if return_exceptions:
+            return await asyncio.gather(*tasks, return_exceptions=True)
+
+        # The batch fails as a whole, so stop spending LLM calls on the rest
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    async def _review(self, reviewer_input: ReviewerInput) -> ReviewerOutput:
+        """
+        Review a translation.
+
+        With speculative review enabled, a verify-only check runs alongside the
+        full review; if it finishes first with high confidence and reports the
+        glossary and protected tokens intact, the full review is cancelled and
+        the check's result used instead.
+        """
+        if not settings.speculative_review_enabled:
+            return await self.reviewer.review(reviewer_input)
+
+        full_review = asyncio.create_task(self.reviewer.review(reviewer_input))
+        try:
+            quick = await self.reviewer.quick_check(reviewer_input)
+        except asyncio.CancelledError:
+            full_review.cancel()
+            raise
+        except Exception as e:
+            logger.warning("Speculative review check failed", error=str(e))
+            quick = None
+
+        if (
+            quick is not None
+            and quick.confidence_score >= settings.speculative_review_min_confidence
+            and quick.glossary_compliance
+            and quick.protected_tokens_intact
+            and not full_review.done()
+        ):
+            full_review.cancel()
+            logger.debug("Speculative review accepted", confidence=quick.confidence_score)
+            return quick
+
+        return await full_review
+
+    async def _retranslate_and_review(
+        self,
+        translator_input: TranslatorInput,
+        reviewer_input: ReviewerInput,
+        temperature: float,
+    ) -> ReviewerOutput:
+        """
+        Run one retry attempt: translate again, then review the new translation.
+
+        Args:
+            translator_input: Input of the original translation
+            reviewer_input: Input of the original review
+            temperature: Translator sampling temperature for this attempt
+
+        Returns:
+            Review of the new translation
+        """
+        retry_output = await self.translator.translate(translator_input, temperature=temperature)
+        return await self._review(replace(reviewer_input, translation=retry_output.translation))
+
+    def _extract_pattern_tokens(self, text: str, custom_patterns: List[str]) -> Dict[str, None]:
+        """
+        Extract the tokens matching the default and custom protected patterns.
+
+        Returned as dict keys, deduplicated in order of first match.
+        """
         # Extract using default patterns
-        for pattern in DEFAULT_PROTECTED_PATTERNS:
-            try:
-                matches = re.findall(pattern, text)
-                protected.update(matches)
-            except re.error:
-                continue
+        protected = dict.fromkeys(match.group() for match in _DEFAULT_PROTECTED_RE.finditer(text))
 
         # Extract using custom patterns
         for pattern in custom_patterns:
             try:
-                matches = re.findall(pattern, text)
-                protected.update(matches)
+                matches = _compile_custom_pattern(pattern).findall(text)
+                protected.update(dict.fromkeys(matches))
             except re.error:
                 logger.warning(f"Invalid custom pattern: {pattern}")
                 continue
 
+        return protected
+
+    def _merge_special_elements(
+        self, pattern_tokens: Dict[str, None], special_elements
+    ) -> List[str]:
+        """Combine pattern matches with the special elements the router marked as protected."""
+        protected = dict(pattern_tokens)
+        for element in special_elements:
+            if element.protect:
+                protected.setdefault(element.value, None)
         return list(protected)
 
 
@@ -1,9 +1,11 @@
 """
 TRJM Gateway - Translation Pipeline Schemas
 =============================================
-Pydantic schemas for translation pipeline data
+Pydantic schemas for translation pipeline data; agent inputs, which the
+pipeline builds from already-validated values, are plain dataclasses
 """
 
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from typing import Any, Dict, List, Optional
@@ -129,12 +131,21 @@ class GlossaryEntry(BaseModel):
     context: Optional[str] = None
 
 
+@dataclass(slots=True)
+class PromptContext:
+    """Protected token and glossary blocks formatted once per translation job."""
+
+    protected_tokens_str: str
+    glossary_str: str
+
+
 # =============================================================================
 # Router Agent Schemas
 # =============================================================================
 
 
-class RouterInput(BaseModel):
+@dataclass(slots=True)
+class RouterInput:
     """Input to the router agent."""
 
     text: str
@@ -160,15 +171,17 @@ class RouterOutput(BaseModel):
 # =============================================================================
 
 
-class TranslatorInput(BaseModel):
+@dataclass(slots=True)
+class TranslatorInput:
     """Input to the translator agent."""
 
     text: str
     source_language: LanguageCode
     target_language: LanguageCode
     style_preset: StylePreset
-    protected_tokens: List[str] = Field(default_factory=list)
-    glossary_entries: List[GlossaryEntry] = Field(default_factory=list)
+    protected_tokens: List[str] = field(default_factory=list)
+    glossary_entries: List[GlossaryEntry] = field(default_factory=list)
+    prompt_context: Optional[PromptContext] = None
 
 
 class ProtectedTokenStatus(BaseModel):
@@ -200,7 +213,8 @@ class TranslatorOutput(BaseModel):
 # =============================================================================
 
 
-class ReviewerInput(BaseModel):
+@dataclass(slots=True)
+class ReviewerInput:
     """Input to the reviewer agent."""
 
     source_text: str
@@ -208,8 +222,9 @@ class ReviewerInput(BaseModel):
     source_language: LanguageCode
     target_language: LanguageCode
     style_preset: StylePreset
-    protected_tokens: List[str] = Field(default_factory=list)
-    glossary_entries: List[GlossaryEntry] = Field(default_factory=list)
+    protected_tokens: List[str] = field(default_factory=list)
+    glossary_entries: List[GlossaryEntry] = field(default_factory=list)
+    prompt_context: Optional[PromptContext] = None
 
 
 class QAIssue(BaseModel):
@@ -249,12 +264,13 @@ class ReviewerOutput(BaseModel):
 # =============================================================================
 
 
-class PostProcessorInput(BaseModel):
+@dataclass(slots=True)
+class PostProcessorInput:
     """Input to the post-processor."""
 
     translation: str
     target_language: LanguageCode
-    protected_tokens: List[str] = Field(default_factory=list)
+    protected_tokens: List[str] = field(default_factory=list)
 
 
 class ChangeRecord(BaseModel):